@@ -7,61 +7,88 @@ This package provides modular components for:
 - Services (Database, FileManager, CSVExporter, Calculation modules)
 - UI components (Dialogs, Tabs, Styles) - requires tkinter
 - Utilities (Formatting, Validation)
+
+Public symbols are resolved lazily (PEP 562), so ``import app`` only loads
+this package stub; submodules are imported on first attribute access.
 """
 
+import importlib
+
 __version__ = "4.7.0"
 __author__ = "VICTOR TOMASZ MAJCHERCZYK"
 
-# Export core components (always available)
-from .models import Client, CostItem, Material
-from .services import Database, FileManager
-from .utils.formatting import fmt_money, fmt_money_plain
-from .utils.validation import validate_cost_item, validate_client, validate_nip
+# Symbol name -> (module, attribute) resolved on first access
+_LAZY = {
+    # Core components
+    'Client': ('app.models', 'Client'),
+    'CostItem': ('app.models', 'CostItem'),
+    'Material': ('app.models', 'Material'),
+    'Database': ('app.services', 'Database'),
+    'FileManager': ('app.services', 'FileManager'),
+    'fmt_money': ('app.utils.formatting', 'fmt_money'),
+    'fmt_money_plain': ('app.utils.formatting', 'fmt_money_plain'),
+    'validate_cost_item': ('app.utils.validation', 'validate_cost_item'),
+    'validate_client': ('app.utils.validation', 'validate_client'),
+    'validate_nip': ('app.utils.validation', 'validate_nip'),
+    # Calculation functions
+    'calculate_single_slope_roof': ('app.services', 'calculate_single_slope_roof'),
+    'calculate_gable_roof': ('app.services', 'calculate_gable_roof'),
+    'calculate_hip_roof': ('app.services', 'calculate_hip_roof'),
+    'calculate_guttering': ('app.services', 'calculate_guttering'),
+    'calculate_chimney_flashings': ('app.services', 'calculate_chimney_flashings'),
+    'calculate_chimney_insulation': ('app.services', 'calculate_chimney_insulation'),
+    'calculate_flashings_total': ('app.services', 'calculate_flashings_total'),
+    'calculate_timber_volume': ('app.services', 'calculate_timber_volume'),
+    'calculate_felt_roof': ('app.services', 'calculate_felt_roof'),
+    'compute_item': ('app.services', 'compute_item'),
+    'compute_totals': ('app.services', 'compute_totals'),
+}
+
+__all__ = list(_LAZY)
 
-# Export calculation services
-from .services import (
-    calculate_single_slope_roof,
-    calculate_gable_roof,
-    calculate_hip_roof,
-    calculate_guttering,
-    calculate_chimney_flashings,
-    calculate_chimney_insulation,
-    calculate_flashings_total,
-    calculate_timber_volume,
-    calculate_felt_roof,
-    compute_item,
-    compute_totals,
-)
+# UI components (requires tkinter, optional). Reachable as attributes but
+# kept out of __all__ so that ``from app import *`` works without tkinter.
+_UI_DIALOGS = ('ClientDialog', 'CostItemEditDialog', 'MaterialEditDialog')
+
+
+def _load_ui():
+    """Import the UI dialogs module (and tkinter) on first use."""
+    from .ui import dialogs
+    return dialogs
+
+
+def get_dialog(name: str):
+    """
+    Return a UI dialog class by name, importing tkinter only now.
+    
+    Args:
+        name: One of ClientDialog, CostItemEditDialog, MaterialEditDialog
+        
+    Raises:
+        ImportError: If tkinter or the UI package is not available
+    """
+    if name not in _UI_DIALOGS:
+        raise ValueError(f"Unknown dialog: {name}")
+    return getattr(_load_ui(), name)
+
+
+def __getattr__(name):
+    """Import a public symbol on first access and cache it in the module."""
+    if name in _UI_DIALOGS:
+        try:
+            value = get_dialog(name)
+        except ImportError as e:
+            # tkinter not available, UI components not exported
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r} ({e})") from e
+    else:
+        try:
+            module, attr = _LAZY[name]
+        except KeyError:
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+        value = getattr(importlib.import_module(module), attr)
+    globals()[name] = value
+    return value
 
-__all__ = [
-    'Client',
-    'CostItem',
-    'Material',
-    'Database',
-    'FileManager',
-    'fmt_money',
-    'fmt_money_plain',
-    'validate_cost_item',
-    'validate_client',
-    'validate_nip',
-    # Calculation functions
-    'calculate_single_slope_roof',
-    'calculate_gable_roof',
-    'calculate_hip_roof',
-    'calculate_guttering',
-    'calculate_chimney_flashings',
-    'calculate_chimney_insulation',
-    'calculate_flashings_total',
-    'calculate_timber_volume',
-    'calculate_felt_roof',
-    'compute_item',
-    'compute_totals',
-]
 
-# Export UI components (requires tkinter, optional)
-try:
-    from .ui.dialogs import ClientDialog, CostItemEditDialog, MaterialEditDialog
-    __all__.extend(['ClientDialog', 'CostItemEditDialog', 'MaterialEditDialog'])
-except ImportError:
-    # tkinter not available, UI components not exported
-    pass
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY) + list(_UI_DIALOGS))
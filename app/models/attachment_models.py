@@ -4,12 +4,27 @@ Supports images, PDFs, and drawings.
 """
 
 from typing import Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from datetime import datetime
 import os
 
+from app.utils.formatting import parse_iso_datetime
 
-@dataclass
+# File extensions recognised by Attachment.detect_file_type
+_IMAGE_EXTS = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff'})
+_DRAWING_EXTS = frozenset({'.dwg', '.dxf', '.svg'})
+
+# Lowercase extension -> file type; anything missing is 'other'
+_TYPE_BY_EXT = {
+    **dict.fromkeys(_IMAGE_EXTS, 'image'),
+    '.pdf': 'pdf',
+    **dict.fromkeys(_DRAWING_EXTS, 'drawing'),
+}
+
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+
+@dataclass(slots=True)
 class Attachment:
     """
     Represents an attachment (file) associated with a cost estimate or item.
@@ -27,30 +42,40 @@ class Attachment:
     
     def to_dict(self) -> dict:
         """Convert to dictionary representation."""
-        data = asdict(self)
-        data['created_at'] = self.created_at.isoformat()
-        return data
+        return {
+            'id': self.id,
+            'filename': self.filename,
+            'original_path': self.original_path,
+            'stored_path': self.stored_path,
+            'file_type': self.file_type,
+            'size_bytes': self.size_bytes,
+            'created_at': self.created_at.isoformat(),
+            'description': self.description,
+            'thumbnail_path': self.thumbnail_path,
+            'linked_item_id': self.linked_item_id
+        }
     
     @classmethod
     def from_dict(cls, data: dict) -> 'Attachment':
         """Create Attachment from dictionary."""
-        created_at = data.get('created_at')
+        get = data.get
+        created_at = get('created_at')
         if isinstance(created_at, str):
-            created_at = datetime.fromisoformat(created_at)
+            created_at = parse_iso_datetime(created_at)
         elif created_at is None:
             created_at = datetime.now()
         
         return cls(
-            id=data.get('id', ''),
-            filename=data.get('filename', ''),
-            original_path=data.get('original_path', ''),
-            stored_path=data.get('stored_path', ''),
-            file_type=data.get('file_type', 'other'),
-            size_bytes=int(data.get('size_bytes', 0)),
+            id=get('id', ''),
+            filename=get('filename', ''),
+            original_path=get('original_path', ''),
+            stored_path=get('stored_path', ''),
+            file_type=get('file_type', 'other'),
+            size_bytes=int(get('size_bytes', 0)),
             created_at=created_at,
-            description=data.get('description', ''),
-            thumbnail_path=data.get('thumbnail_path', ''),
-            linked_item_id=data.get('linked_item_id')
+            description=get('description', ''),
+            thumbnail_path=get('thumbnail_path', ''),
+            linked_item_id=get('linked_item_id')
         )
     
     @staticmethod
@@ -64,22 +89,24 @@ class Attachment:
         Returns:
             File type string
         """
-        ext = os.path.splitext(filename)[1].lower()
+        return Attachment.file_type_for_ext(os.path.splitext(filename)[1])
+    
+    @staticmethod
+    def file_type_for_ext(ext: str) -> str:
+        """
+        Map a file extension (as returned by os.path.splitext) to a file type.
         
-        if ext in ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff']:
-            return 'image'
-        elif ext == '.pdf':
-            return 'pdf'
-        elif ext in ['.dwg', '.dxf', '.svg']:
-            return 'drawing'
-        else:
-            return 'other'
+        Args:
+            ext: Extension including the leading dot, any case
+            
+        Returns:
+            File type string
+        """
+        return _TYPE_BY_EXT.get(ext.lower(), 'other')
     
     def get_display_size(self) -> str:
         """Get human-readable file size."""
         size = self.size_bytes
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size < 1024.0:
-                return f"{size:.1f} {unit}"
-            size /= 1024.0
-        return f"{size:.1f} TB"
+        # Each unit step is 2**10, so the unit index comes from the bit length
+        idx = min((int(size).bit_length() - 1) // 10, 4) if size >= 1024 else 0
+        return f"{size / 1024 ** idx:.1f} {_SIZE_UNITS[idx]}"
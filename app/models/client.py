@@ -3,10 +3,10 @@ Client data model for the Ofertownik application.
 """
 
 from typing import Optional, Dict, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Client:
     """
     Represents a client in the roofing cost estimator system.
@@ -19,7 +19,13 @@ class Client:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert client to dictionary representation."""
-        return asdict(self)
+        return {
+            'name': self.name,
+            'address': self.address,
+            'id': self.id,
+            'phone': self.phone,
+            'email': self.email
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Client':
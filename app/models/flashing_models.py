@@ -3,10 +3,12 @@ Models for flashing (obróbki blacharskie) profiles and materials.
 """
 
 from typing import Dict, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 
+from app.utils.formatting import intern_label
 
-@dataclass
+
+@dataclass(slots=True)
 class FlashingProfile:
     """
     Represents a flashing profile with dimensions and pricing.
@@ -22,20 +24,30 @@ class FlashingProfile:
     
     def to_dict(self) -> dict:
         """Convert to dictionary representation."""
-        return asdict(self)
+        return {
+            'id': self.id,
+            'name': self.name,
+            'description': self.description,
+            'development_width': self.development_width,
+            'material_type': self.material_type,
+            'price_per_meter': self.price_per_meter,
+            'unit_conversions': dict(self.unit_conversions),
+            'is_custom': self.is_custom
+        }
     
     @classmethod
     def from_dict(cls, data: dict) -> 'FlashingProfile':
         """Create FlashingProfile from dictionary."""
+        get = data.get
         return cls(
-            id=data.get('id', ''),
-            name=data.get('name', ''),
-            description=data.get('description', ''),
-            development_width=float(data.get('development_width', 0.0)),
-            material_type=data.get('material_type', 'stal'),
-            price_per_meter=float(data.get('price_per_meter', 0.0)),
-            unit_conversions=data.get('unit_conversions', {}),
-            is_custom=bool(data.get('is_custom', False))
+            id=get('id', ''),
+            name=get('name', ''),
+            description=get('description', ''),
+            development_width=float(get('development_width', 0.0)),
+            material_type=intern_label(get('material_type', 'stal')),
+            price_per_meter=float(get('price_per_meter', 0.0)),
+            unit_conversions=get('unit_conversions', {}),
+            is_custom=bool(get('is_custom', False))
         )
     
     def calculate_sheet_length(self, width_mm: float) -> float:
@@ -78,7 +90,7 @@ class FlashingProfile:
         return length_m * conversion
 
 
-@dataclass
+@dataclass(slots=True)
 class FlashingMaterial:
     """
     Represents a material used for flashings.
@@ -96,22 +108,36 @@ class FlashingMaterial:
     
     def to_dict(self) -> dict:
         """Convert to dictionary representation."""
-        return asdict(self)
+        return {
+            'id': self.id,
+            'name': self.name,
+            'material_type': self.material_type,
+            'thickness_mm': self.thickness_mm,
+            'coating': self.coating,
+            'price_per_m2': self.price_per_m2,
+            'price_per_kg': self.price_per_kg,
+            'weight_per_m2': self.weight_per_m2,
+            'color': self.color,
+            'supplier': self.supplier
+        }
     
     @classmethod
     def from_dict(cls, data: dict) -> 'FlashingMaterial':
         """Create FlashingMaterial from dictionary."""
+        get = data.get
+        price_per_kg = get('price_per_kg')
+        weight_per_m2 = get('weight_per_m2')
         return cls(
-            id=data.get('id', ''),
-            name=data.get('name', ''),
-            material_type=data.get('material_type', 'stal'),
-            thickness_mm=float(data.get('thickness_mm', 0.0)),
-            coating=data.get('coating', ''),
-            price_per_m2=float(data.get('price_per_m2', 0.0)),
-            price_per_kg=float(data['price_per_kg']) if data.get('price_per_kg') else None,
-            weight_per_m2=float(data['weight_per_m2']) if data.get('weight_per_m2') else None,
-            color=data.get('color', ''),
-            supplier=data.get('supplier', '')
+            id=get('id', ''),
+            name=get('name', ''),
+            material_type=intern_label(get('material_type', 'stal')),
+            thickness_mm=float(get('thickness_mm', 0.0)),
+            coating=intern_label(get('coating', '')),
+            price_per_m2=float(get('price_per_m2', 0.0)),
+            price_per_kg=float(price_per_kg) if price_per_kg else None,
+            weight_per_m2=float(weight_per_m2) if weight_per_m2 else None,
+            color=intern_label(get('color', '')),
+            supplier=intern_label(get('supplier', ''))
         )
     
     def calculate_price_by_area(self, area_m2: float) -> float:
@@ -3,10 +3,12 @@ Data models for gutter systems and accessories.
 """
 
 from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 
+from app.utils.formatting import intern_label
 
-@dataclass
+
+@dataclass(slots=True)
 class GutterAccessory:
     """
     Represents a single accessory in a gutter system.
@@ -30,23 +32,32 @@ class GutterAccessory:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary representation."""
-        return asdict(self)
+        return {
+            'name': self.name,
+            'unit': self.unit,
+            'price_unit_net': self.price_unit_net,
+            'quantity': self.quantity,
+            'vat_rate': self.vat_rate,
+            'category': self.category,
+            'auto_calculate': self.auto_calculate
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'GutterAccessory':
         """Create GutterAccessory from dictionary."""
+        get = data.get
         return cls(
-            name=data.get('name', ''),
-            unit=data.get('unit', ''),
-            price_unit_net=float(data.get('price_unit_net', 0.0)),
-            quantity=float(data.get('quantity', 0.0)),
-            vat_rate=int(data.get('vat_rate', 8)),
-            category=data.get('category', 'material'),
-            auto_calculate=data.get('auto_calculate', True)
+            name=get('name', ''),
+            unit=intern_label(get('unit', '')),
+            price_unit_net=float(get('price_unit_net', 0.0)),
+            quantity=float(get('quantity', 0.0)),
+            vat_rate=int(get('vat_rate', 8)),
+            category=intern_label(get('category', 'material')),
+            auto_calculate=get('auto_calculate', True)
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class GutterSystem:
     """
     Represents a complete gutter system with all its accessories and prices.
@@ -56,6 +67,13 @@ class GutterSystem:
     description: str = ""
     accessories: List[GutterAccessory] = field(default_factory=list)
     
+    # Name -> accessory index, rebuilt lazily when the accessory list changes
+    _accessory_index: Optional[Dict[str, GutterAccessory]] = field(
+        default=None, init=False, repr=False, compare=False)
+    _indexed_accessories: Optional[List[GutterAccessory]] = field(
+        default=None, init=False, repr=False, compare=False)
+    _indexed_count: int = field(default=0, init=False, repr=False, compare=False)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary representation."""
         return {
@@ -73,17 +91,57 @@ class GutterSystem:
         
         return cls(
             name=data.get('name', ''),
-            system_type=data.get('system_type', ''),
+            system_type=intern_label(data.get('system_type', '')),
             description=data.get('description', ''),
             accessories=accessories
         )
     
+    def clone(self) -> 'GutterSystem':
+        """Return an independent copy (accessories are copied, not shared)."""
+        return GutterSystem(
+            self.name, self.system_type, self.description,
+            [GutterAccessory(a.name, a.unit, a.price_unit_net, a.quantity,
+                             a.vat_rate, a.category, a.auto_calculate)
+             for a in self.accessories]
+        )
+    
+    def __getstate__(self) -> tuple:
+        """Compact state for pickle/deepcopy, without building accessory dicts."""
+        return (self.name, self.system_type, self.description, tuple(
+            (a.name, a.unit, a.price_unit_net, a.quantity, a.vat_rate, a.category, a.auto_calculate)
+            for a in self.accessories
+        ))
+    
+    def __setstate__(self, state: tuple) -> None:
+        """Restore from __getstate__ output; the accessory index is rebuilt lazily."""
+        self.name, self.system_type, self.description, accessories = state
+        self.accessories = [GutterAccessory(*values) for values in accessories]
+        self._accessory_index = None
+        self._indexed_accessories = None
+        self._indexed_count = 0
+    
+    def _build_accessory_index(self) -> Dict[str, GutterAccessory]:
+        """Rebuild the name index (first accessory wins on duplicate names)."""
+        index: Dict[str, GutterAccessory] = {}
+        for acc in self.accessories:
+            index.setdefault(acc.name, acc)
+        self._accessory_index = index
+        self._indexed_accessories = self.accessories
+        self._indexed_count = len(self.accessories)
+        return index
+    
     def get_accessory(self, name: str) -> Optional[GutterAccessory]:
         """Get accessory by name."""
-        for acc in self.accessories:
-            if acc.name == name:
-                return acc
-        return None
+        index = self._accessory_index
+        if (index is None or self._indexed_accessories is not self.accessories
+                or self._indexed_count != len(self.accessories)):
+            index = self._build_accessory_index()
+        
+        acc = index.get(name)
+        if acc is None or acc.name != name:
+            # Accessories may have been renamed or replaced in place
+            acc = self._build_accessory_index().get(name)
+        return acc
     
     def update_accessory_quantity(self, name: str, quantity: float) -> bool:
         """Update quantity for a specific accessory."""
@@ -94,7 +152,7 @@ class GutterSystem:
         return False
 
 
-@dataclass
+@dataclass(slots=True)
 class GutterTemplate:
     """
     Represents a saved template configuration for a gutter system.
@@ -3,15 +3,134 @@ History model for cost estimate versioning.
 Tracks changes to cost estimates with snapshots and metadata.
 """
 
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, asdict, field
+from typing import List, Deque, Dict, Any, Iterable, Iterator, Optional, Sequence, Tuple
+from collections.abc import Sequence as SequenceABC
+from dataclasses import dataclass, field
 from datetime import datetime
 import copy
+from collections import deque
 import hashlib
 import json
+import operator
 
 
-@dataclass
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+def _checksum_field(value: Any) -> bytes:
+    """Encode one checksum field as type tag, byte length and payload."""
+    if isinstance(value, str):
+        tag, data = b's', value.encode('utf-8')
+    elif value is None:
+        tag, data = b'n', b''
+    elif isinstance(value, bool):
+        tag, data = b'b', b'1' if value else b'0'
+    elif isinstance(value, int):
+        tag, data = b'i', repr(value).encode('utf-8')
+    elif isinstance(value, float):
+        tag, data = b'f', repr(value).encode('utf-8')
+    elif isinstance(value, (dict, list)):
+        tag, data = b'j', json.dumps(value, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    else:
+        tag, data = b'r', repr(value).encode('utf-8')
+    return b'%s%d:%s' % (tag, len(data), data)
+
+
+def _clone(value: Any) -> Any:
+    """
+    Copy JSON-like data (dicts, lists and scalars) without deepcopy's memo
+    table and __reduce_ex__ dispatch. Scalars are shared, containers copied;
+    any other object (e.g. a GutterSystem) falls back to copy.deepcopy.
+    """
+    if isinstance(value, dict):
+        return {k: v if isinstance(v, _SCALAR_TYPES) else _clone(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [v if isinstance(v, _SCALAR_TYPES) else _clone(v) for v in value]
+    if isinstance(value, _SCALAR_TYPES):
+        return value
+    return copy.deepcopy(value)
+
+
+class ItemsSnapshot(SequenceABC):
+    """
+    Compact, read-only storage for the items of a history snapshot.
+    
+    Each item is kept as a tuple of values; the key order is stored once
+    per distinct key layout (normally one per snapshot, since all cost items
+    share the same fields). Indexing and iteration rebuild plain dicts, so
+    callers see the same list-of-dicts shape as before.
+    """
+    
+    __slots__ = ('_schemas', '_rows')
+    
+    def __init__(self, items: Iterable[Dict[str, Any]] = ()):
+        schemas: Dict[Tuple[str, ...], int] = {}
+        rows = []
+        for item in items:
+            keys = tuple(item)
+            schema_idx = schemas.setdefault(keys, len(schemas))
+            rows.append((schema_idx,) + tuple(
+                v if isinstance(v, _SCALAR_TYPES) else _clone(v) for v in item.values()
+            ))
+        self._schemas = tuple(schemas)
+        self._rows = rows
+    
+    def _row_to_dict(self, row: Tuple[Any, ...]) -> Dict[str, Any]:
+        keys = self._schemas[row[0]]
+        return {keys[i]: row[i + 1] for i in range(len(keys))}
+    
+    def __len__(self) -> int:
+        return len(self._rows)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row_to_dict(row) for row in self._rows[index]]
+        return self._row_to_dict(self._rows[index])
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        to_dict = self._row_to_dict
+        for row in self._rows:
+            yield to_dict(row)
+    
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (ItemsSnapshot, list)):
+            return list(self) == list(other)
+        return NotImplemented
+    
+    def __repr__(self) -> str:
+        return f"ItemsSnapshot({list(self)!r})"
+    
+    def copy(self) -> List[Dict[str, Any]]:
+        """Return the items as a new list of independent dicts."""
+        return list(self)
+    
+    def project(self, fields: Tuple[str, ...], defaults: Tuple[Any, ...]) -> List[Tuple[Any, ...]]:
+        """
+        Return one tuple of the given fields per item, without building dicts.
+        
+        Args:
+            fields: Field names to extract (at least two)
+            defaults: Value used for each field an item does not have
+        """
+        getters = []
+        for keys in self._schemas:
+            positions = {key: i + 1 for i, key in enumerate(keys)}
+            if all(f in positions for f in fields):
+                getters.append(operator.itemgetter(*(positions[f] for f in fields)))
+            else:
+                getters.append(_missing_fields_getter(
+                    tuple(positions.get(f) for f in fields), defaults))
+        return [getters[row[0]](row) for row in self._rows]
+
+
+def _missing_fields_getter(positions: Tuple[Optional[int], ...], defaults: Tuple[Any, ...]):
+    """Build a row getter for a schema that lacks some of the projected fields."""
+    def getter(row: Tuple[Any, ...]) -> Tuple[Any, ...]:
+        return tuple(row[p] if p is not None else d for p, d in zip(positions, defaults))
+    return getter
+
+
+@dataclass(slots=True)
 class HistoryEntry:
     """
     Represents a single version in cost estimate history.
@@ -21,13 +140,22 @@ class HistoryEntry:
     description: str
     items_count: int
     total_gross: float
-    checksum: str  # MD5 hash of items for change detection
-    items_snapshot: List[Dict[str, Any]]
+    checksum: str  # BLAKE2b (128-bit) hash of items for change detection
+    items_snapshot: Sequence[Dict[str, Any]]  # ItemsSnapshot for entries created by history
     metadata: Dict[str, Any] = field(default_factory=dict)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert history entry to dictionary."""
-        return asdict(self)
+        return {
+            'timestamp': self.timestamp,
+            'version': self.version,
+            'description': self.description,
+            'items_count': self.items_count,
+            'total_gross': self.total_gross,
+            'checksum': self.checksum,
+            'items_snapshot': [dict(item) for item in self.items_snapshot],
+            'metadata': dict(self.metadata)
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'HistoryEntry':
@@ -39,7 +167,7 @@ class HistoryEntry:
             items_count=data.get('items_count', 0),
             total_gross=data.get('total_gross', 0.0),
             checksum=data.get('checksum', ''),
-            items_snapshot=data.get('items_snapshot', []),
+            items_snapshot=ItemsSnapshot(data.get('items_snapshot', [])),
             metadata=data.get('metadata', {})
         )
 
@@ -54,7 +182,8 @@ class CostEstimateHistory:
     
     def __init__(self):
         """Initialize empty history."""
-        self._entries: List[HistoryEntry] = []
+        # Oldest entries fall off the left end; versions keep increasing
+        self._entries: Deque[HistoryEntry] = deque(maxlen=self.MAX_HISTORY_ENTRIES)
         self._current_version = 0
     
     def add_entry(self, description: str, items: List[Dict[str, Any]], 
@@ -86,21 +215,13 @@ class CostEstimateHistory:
             items_count=items_count,
             total_gross=total_gross,
             checksum=checksum,
-            items_snapshot=copy.deepcopy(items),
-            metadata=copy.deepcopy(metadata) if metadata else {}
+            items_snapshot=ItemsSnapshot(items),
+            metadata=_clone(metadata) if metadata else {}
         )
         
-        # Add to history
+        # Add to history (evicts the oldest entry once the limit is reached)
         self._entries.append(entry)
         
-        # Limit history size
-        if len(self._entries) > self.MAX_HISTORY_ENTRIES:
-            self._entries.pop(0)
-            # Renumber versions
-            for i, e in enumerate(self._entries, 1):
-                e.version = i
-            self._current_version = len(self._entries)
-        
         return entry
     
     def get_entry(self, version: int) -> Optional[HistoryEntry]:
@@ -134,7 +255,7 @@ class CostEstimateHistory:
         Returns:
             List of all HistoryEntry objects
         """
-        return self._entries.copy()
+        return list(self._entries)
     
     def compare_versions(self, version1: int, version2: int) -> Dict[str, List[Dict[str, Any]]]:
         """
@@ -153,24 +274,32 @@ class CostEstimateHistory:
         if not entry1 or not entry2:
             return {'added': [], 'removed': [], 'changed': []}
         
-        items1 = {self._item_key(item): item for item in entry1.items_snapshot}
-        items2 = {self._item_key(item): item for item in entry2.items_snapshot}
+        snapshot1 = entry1.items_snapshot
+        snapshot2 = entry2.items_snapshot
+        
+        # (name, unit) -> (compared fields tuple, index into the snapshot)
+        items1 = {}
+        for idx, row in enumerate(self._diff_rows(snapshot1)):
+            items1[row[:2]] = (row[2:], idx)
+        items2 = {}
+        for idx, row in enumerate(self._diff_rows(snapshot2)):
+            items2[row[:2]] = (row[2:], idx)
         
         # Find added items
-        added = [items2[key] for key in items2 if key not in items1]
+        added = [snapshot2[items2[key][1]] for key in items2 if key not in items1]
         
         # Find removed items
-        removed = [items1[key] for key in items1 if key not in items2]
+        removed = [snapshot1[items1[key][1]] for key in items1 if key not in items2]
         
         # Find changed items
         changed = []
-        for key in items1:
-            if key in items2:
-                if self._items_differ(items1[key], items2[key]):
-                    changed.append({
-                        'old': items1[key],
-                        'new': items2[key]
-                    })
+        for key, (fields1, idx1) in items1.items():
+            other = items2.get(key)
+            if other is not None and fields1 != other[0]:
+                changed.append({
+                    'old': snapshot1[idx1],
+                    'new': snapshot2[other[1]]
+                })
         
         return {
             'added': added,
@@ -180,7 +309,7 @@ class CostEstimateHistory:
     
     def clear(self):
         """Clear all history entries."""
-        self._entries = []
+        self._entries.clear()
         self._current_version = 0
     
     def to_dict(self) -> Dict[str, Any]:
@@ -207,38 +336,47 @@ class CostEstimateHistory:
             CostEstimateHistory instance
         """
         history = cls()
-        history._current_version = data.get('current_version', 0)
-        history._entries = [
+        history._entries.extend(
             HistoryEntry.from_dict(entry_data)
             for entry_data in data.get('entries', [])
-        ]
+        )
+        last_version = history._entries[-1].version if history._entries else 0
+        history._current_version = max(data.get('current_version', 0), last_version)
         return history
     
     @staticmethod
     def calculate_checksum(items: List[Dict[str, Any]]) -> str:
         """
-        Calculate MD5 checksum of items for change detection.
+        Calculate BLAKE2b (128-bit) checksum of items for change detection.
         
         Args:
             items: List of cost items
             
         Returns:
-            MD5 hash string
+            32-character hex digest
         """
-        # Create a stable string representation
-        items_str = json.dumps(items, sort_keys=True, ensure_ascii=False)
-        return hashlib.md5(items_str.encode('utf-8')).hexdigest()
+        # Feed canonical per-field fragments instead of building one big
+        # JSON string for the whole list; every key and value is framed as
+        # type tag + byte length + bytes, so no two inputs share an encoding
+        digest = hashlib.blake2b(digest_size=16)
+        update = digest.update
+        for item in items:
+            update(b'd%d:' % len(item))
+            for key in sorted(item):
+                update(_checksum_field(key))
+                update(_checksum_field(item[key]))
+        return digest.hexdigest()
     
-    @staticmethod
-    def _item_key(item: Dict[str, Any]) -> str:
-        """Generate a unique key for an item based on name and unit."""
-        return f"{item.get('name', '')}_{item.get('unit', '')}"
+    # Item identity (with defaults) followed by the fields compared for changes
+    _DIFF_FIELDS = ('name', 'unit', 'quantity', 'price_unit_net', 'vat_rate', 'category')
+    _DIFF_DEFAULTS = ('', '', None, None, None, None)
     
-    @staticmethod
-    def _items_differ(item1: Dict[str, Any], item2: Dict[str, Any]) -> bool:
-        """Check if two items differ in any significant way."""
-        keys_to_compare = ['quantity', 'price_unit_net', 'vat_rate', 'category']
-        for key in keys_to_compare:
-            if item1.get(key) != item2.get(key):
-                return True
-        return False
+    @classmethod
+    def _diff_rows(cls, snapshot: Sequence[Dict[str, Any]]) -> List[Tuple[Any, ...]]:
+        """Project a snapshot onto _DIFF_FIELDS, one tuple per item."""
+        if isinstance(snapshot, ItemsSnapshot):
+            return snapshot.project(cls._DIFF_FIELDS, cls._DIFF_DEFAULTS)
+        return [
+            tuple(item.get(f, d) for f, d in zip(cls._DIFF_FIELDS, cls._DIFF_DEFAULTS))
+            for item in snapshot
+        ]
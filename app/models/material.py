@@ -3,10 +3,12 @@ Material data model for the Ofertownik application.
 """
 
 from typing import Dict, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 
+from app.utils.formatting import intern_label
 
-@dataclass
+
+@dataclass(slots=True)
 class Material:
     """
     Represents a material or service in the database.
@@ -20,16 +22,24 @@ class Material:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert material to dictionary representation."""
-        return asdict(self)
+        return {
+            'name': self.name,
+            'unit': self.unit,
+            'price_net': self.price_net,
+            'vat_rate': self.vat_rate,
+            'category': self.category,
+            'description': self.description
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Material':
         """Create Material instance from dictionary."""
+        get = data.get
         return cls(
-            name=data.get('name', ''),
-            unit=data.get('unit', ''),
-            price_net=float(data.get('price_net', 0.0)),
-            vat_rate=int(data.get('vat_rate', 23)),
-            category=data.get('category', 'material'),
-            description=data.get('description', '')
+            name=get('name', ''),
+            unit=intern_label(get('unit', '')),
+            price_net=float(get('price_net', 0.0)),
+            vat_rate=int(get('vat_rate', 23)),
+            category=intern_label(get('category', 'material')),
+            description=get('description', '')
         )
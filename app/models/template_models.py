@@ -4,11 +4,13 @@ Allows saving and loading cost estimate templates.
 """
 
 from typing import List, Dict, Any
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from datetime import datetime
 
+from app.utils.formatting import parse_iso_datetime
 
-@dataclass
+
+@dataclass(slots=True)
 class CostEstimateTemplate:
     """
     Represents a saved template for a cost estimate.
@@ -25,11 +27,23 @@ class CostEstimateTemplate:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert template to dictionary representation."""
-        data = asdict(self)
-        # Convert datetime objects to ISO format strings
-        data['created_at'] = self.created_at.isoformat()
-        data['updated_at'] = self.updated_at.isoformat()
-        return data
+        return {
+            'id': self.id,
+            'name': self.name,
+            'description': self.description,
+            'created_at': self.created_at.isoformat(),
+            'updated_at': self.updated_at.isoformat(),
+            'items': [dict(item) for item in self.items],
+            'groups': list(self.groups),
+            'metadata': dict(self.metadata)
+        }
+    
+    def clone(self) -> 'CostEstimateTemplate':
+        """Return an independent copy (items, groups and metadata are copied, not shared)."""
+        return CostEstimateTemplate(
+            self.id, self.name, self.description, self.created_at, self.updated_at,
+            [dict(item) for item in self.items], list(self.groups), dict(self.metadata)
+        )
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'CostEstimateTemplate':
@@ -45,13 +59,13 @@ class CostEstimateTemplate:
         # Parse datetime fields
         created_at = data.get('created_at')
         if isinstance(created_at, str):
-            created_at = datetime.fromisoformat(created_at)
+            created_at = parse_iso_datetime(created_at)
         elif created_at is None:
             created_at = datetime.now()
         
         updated_at = data.get('updated_at')
         if isinstance(updated_at, str):
-            updated_at = datetime.fromisoformat(updated_at)
+            updated_at = parse_iso_datetime(updated_at)
         elif updated_at is None:
             updated_at = datetime.now()
         
@@ -3,11 +3,15 @@ Version models for cost estimate history and version control.
 """
 
 from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from datetime import datetime
+import bisect
 
+from app.utils import jsonio
+from app.utils.formatting import parse_iso_datetime
 
-@dataclass
+
+@dataclass(slots=True)
 class Version:
     """
     Represents a single version of a cost estimate.
@@ -22,16 +26,22 @@ class Version:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert version to dictionary representation."""
-        data = asdict(self)
-        data['created_at'] = self.created_at.isoformat()
-        return data
+        return {
+            'id': self.id,
+            'version_number': self.version_number,
+            'created_at': self.created_at.isoformat(),
+            'author': self.author,
+            'description': self.description,
+            'snapshot': dict(self.snapshot),
+            'changes': list(self.changes)
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Version':
         """Create Version instance from dictionary."""
         created_at = data.get('created_at')
         if isinstance(created_at, str):
-            created_at = datetime.fromisoformat(created_at)
+            created_at = parse_iso_datetime(created_at)
         elif created_at is None:
             created_at = datetime.now()
         
@@ -46,7 +56,12 @@ class Version:
         )
 
 
-@dataclass
+def _version_number(version: Version) -> int:
+    """Sort key for versions."""
+    return version.version_number
+
+
+@dataclass(slots=True)
 class VersionHistory:
     """
     Represents the complete version history of a cost estimate.
@@ -54,30 +69,87 @@ class VersionHistory:
     estimate_id: str
     versions: List[Version] = field(default_factory=list)
     
+    # Version number -> position in `versions`, rebuilt when the list is replaced
+    # or resized, or when a looked-up slot no longer holds that number
+    _by_number: Optional[Dict[int, int]] = field(
+        default=None, init=False, repr=False, compare=False)
+    _max_number: int = field(default=0, init=False, repr=False, compare=False)
+    _max_pos: int = field(default=-1, init=False, repr=False, compare=False)
+    _indexed_versions: Optional[List[Version]] = field(
+        default=None, init=False, repr=False, compare=False)
+    _indexed_count: int = field(default=0, init=False, repr=False, compare=False)
+    
+    def _build_index(self) -> Dict[int, int]:
+        """Rebuild the version-number index (first version wins on duplicates)."""
+        index = {}
+        for pos, version in enumerate(self.versions):
+            index.setdefault(version.version_number, pos)
+        self._by_number = index
+        self._max_number = max(index, default=0)
+        self._max_pos = index.get(self._max_number, -1)
+        self._indexed_versions = self.versions
+        self._indexed_count = len(self.versions)
+        return index
+    
+    def _index(self) -> Dict[int, int]:
+        """Return the version-number index, rebuilding it if the list was replaced or resized."""
+        index = self._by_number
+        if (index is None or self._indexed_versions is not self.versions
+                or self._indexed_count != len(self.versions)):
+            index = self._build_index()
+        return index
+    
+    def _latest_pos(self) -> int:
+        """Position of the version with the highest number (-1 when empty)."""
+        self._index()
+        versions = self.versions
+        pos = self._max_pos
+        if pos >= 0 and (versions[pos].version_number != self._max_number
+                         or versions[-1].version_number > self._max_number):
+            # Versions may have been replaced or renumbered in place
+            self._build_index()
+            pos = self._max_pos
+        return pos
+    
     def add_version(self, version: Version) -> None:
         """Add a new version to the history."""
-        self.versions.append(version)
-        # Sort by version number
-        self.versions.sort(key=lambda v: v.version_number)
+        index = self._index()
+        versions = self.versions
+        number = version.version_number
+        # Keep sorted by version number; new versions normally belong at the end
+        if versions and number < versions[-1].version_number:
+            bisect.insort_right(versions, version, key=_version_number)
+            # Positions after the insertion point shifted
+            self._by_number = None
+            return
+        
+        versions.append(version)
+        pos = len(versions) - 1
+        index.setdefault(number, pos)
+        if number > self._max_number or pos == 0:
+            self._max_number = number
+            self._max_pos = pos
+        self._indexed_count = len(versions)
     
     def get_version(self, version_number: int) -> Optional[Version]:
         """Get a specific version by number."""
-        for version in self.versions:
-            if version.version_number == version_number:
-                return version
-        return None
+        pos = self._index().get(version_number)
+        if pos is None or self.versions[pos].version_number != version_number:
+            # Versions may have been replaced or renumbered in place
+            pos = self._build_index().get(version_number)
+            if pos is None:
+                return None
+        return self.versions[pos]
     
     def get_latest_version(self) -> Optional[Version]:
         """Get the most recent version."""
-        if not self.versions:
-            return None
-        return max(self.versions, key=lambda v: v.version_number)
+        pos = self._latest_pos()
+        return self.versions[pos] if pos >= 0 else None
     
     def get_next_version_number(self) -> int:
         """Get the next version number."""
-        if not self.versions:
-            return 1
-        return max(v.version_number for v in self.versions) + 1
+        pos = self._latest_pos()
+        return self.versions[pos].version_number + 1 if pos >= 0 else 1
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary representation."""
@@ -89,8 +161,16 @@ class VersionHistory:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'VersionHistory':
         """Create VersionHistory instance from dictionary."""
-        history = cls(estimate_id=data.get('estimate_id', ''))
-        for version_data in data.get('versions', []):
-            version = Version.from_dict(version_data)
-            history.add_version(version)
-        return history
+        versions = [Version.from_dict(v) for v in data.get('versions', [])]
+        # One stable sort for the whole load (a no-op pass for saved histories)
+        versions.sort(key=_version_number)
+        return cls(estimate_id=data.get('estimate_id', ''), versions=versions)
+    
+    def to_bytes(self) -> bytes:
+        """Serialize the history to JSON bytes (orjson when installed)."""
+        return jsonio.dumps(self.to_dict())
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'VersionHistory':
+        """Create VersionHistory instance from JSON produced by to_bytes."""
+        return cls.from_dict(jsonio.loads(data))
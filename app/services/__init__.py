@@ -16,9 +16,9 @@ from .roof_calculations import (
 from .gutter_calculations import calculate_guttering
 from .chimney_calculations import calculate_chimney_flashings, calculate_chimney_insulation
 from .flashing_calculations import calculate_flashings_total
-from .timber_calculations import calculate_timber_volume
+from .timber_calculations import calculate_timber_volume, calculate_timber_volumes
 from .felt_calculations import calculate_felt_roof
-from .cost_calculations import compute_item, compute_totals
+from .cost_calculations import compute_item, compute_totals, compute_totals_vectorized
 
 __all__ = [
     'Database',
@@ -36,7 +36,9 @@ __all__ = [
     'calculate_chimney_insulation',
     'calculate_flashings_total',
     'calculate_timber_volume',
+    'calculate_timber_volumes',
     'calculate_felt_roof',
     'compute_item',
     'compute_totals',
+    'compute_totals_vectorized',
 ]
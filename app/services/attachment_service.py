@@ -2,9 +2,11 @@
 Service for managing attachments in cost estimates.
 """
 
+import logging
 import os
 import shutil
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
 from datetime import datetime
 
@@ -17,6 +19,38 @@ try:
 except ImportError:
     PIL_AVAILABLE = False
 
+logger = logging.getLogger(__name__)
+
+# Upper bound per os.copy_file_range call (the kernel caps a single call anyway)
+_COPY_CHUNK = 1 << 30
+
+
+def _fast_copy(src: str, dst: str) -> None:
+    """
+    Copy file contents and metadata, like shutil.copy2.
+    
+    Where available (Linux), os.copy_file_range lets the kernel copy the data
+    without passing it through user space, which becomes a reflink on
+    copy-on-write filesystems and a server-side copy on NFS 4.2. If the
+    filesystem refuses it, shutil.copyfile (sendfile-based) is used instead.
+    
+    Args:
+        src: Source file path
+        dst: Destination file path (overwritten)
+    """
+    if hasattr(os, 'copy_file_range'):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+                while os.copy_file_range(in_fd, out_fd, _COPY_CHUNK):
+                    pass
+            shutil.copystat(src, dst)
+            return
+        except OSError:
+            pass  # e.g. EXDEV/ENOSYS/EINVAL - retry with a regular copy
+    shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+
 
 class AttachmentManager:
     """
@@ -41,7 +75,8 @@ class AttachmentManager:
         os.makedirs(self.thumbnails_dir, exist_ok=True)
     
     def add_attachment(self, file_path: str, description: str = "",
-                      linked_item_id: Optional[str] = None) -> Optional[Attachment]:
+                      linked_item_id: Optional[str] = None,
+                      generate_thumbnail: bool = True) -> Optional[Attachment]:
         """
         Add a new attachment.
         
@@ -49,12 +84,13 @@ class AttachmentManager:
             file_path: Path to the file to attach
             description: Optional description
             linked_item_id: Optional link to a specific cost item
+            generate_thumbnail: Whether to create a thumbnail for images
             
         Returns:
             Created Attachment or None if failed
         """
         if not os.path.exists(file_path):
-            print(f"File not found: {file_path}")
+            logger.warning("File not found: %s", file_path)
             return None
         
         try:
@@ -66,15 +102,15 @@ class AttachmentManager:
             stored_path = os.path.join(self.attachments_dir, stored_filename)
             
             # Copy file
-            shutil.copy2(file_path, stored_path)
+            _fast_copy(file_path, stored_path)
             
             # Get file info
             size_bytes = os.path.getsize(stored_path)
-            file_type = Attachment.detect_file_type(original_filename)
+            file_type = Attachment.file_type_for_ext(ext)
             
             # Generate thumbnail for images
             thumbnail_path = ""
-            if file_type == 'image' and PIL_AVAILABLE:
+            if generate_thumbnail and file_type == 'image' and PIL_AVAILABLE:
                 thumbnail_path = self._generate_thumbnail(stored_path, attachment_id)
             
             # Create attachment object
@@ -93,10 +129,46 @@ class AttachmentManager:
             
             return attachment
             
-        except Exception as e:
-            print(f"Error adding attachment: {e}")
+        except Exception:
+            logger.exception("Error adding attachment: %s", file_path)
             return None
     
+    def add_attachments_bulk(self, file_paths: List[str], description: str = "",
+                             linked_item_id: Optional[str] = None,
+                             max_workers: Optional[int] = None) -> List[Attachment]:
+        """
+        Add several attachments, generating image thumbnails in parallel.
+        
+        Files are copied one by one (they usually share a disk); thumbnails
+        are then decoded on a thread pool, since Pillow releases the GIL
+        while decoding and resizing.
+        
+        Args:
+            file_paths: Paths of the files to attach
+            description: Optional description for every attachment
+            linked_item_id: Optional link to a specific cost item
+            max_workers: Thread count for thumbnails (default: CPU count)
+            
+        Returns:
+            Created attachments, in input order (failed files are skipped)
+        """
+        attachments = []
+        for file_path in file_paths:
+            attachment = self.add_attachment(file_path, description, linked_item_id,
+                                             generate_thumbnail=False)
+            if attachment is not None:
+                attachments.append(attachment)
+        
+        images = [a for a in attachments if a.file_type == 'image']
+        if images and PIL_AVAILABLE:
+            with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+                futures = [pool.submit(self._generate_thumbnail, a.stored_path, a.id)
+                           for a in images]
+                for attachment, future in zip(images, futures):
+                    attachment.thumbnail_path = future.result()
+        
+        return attachments
+    
     def remove_attachment(self, attachment: Attachment) -> bool:
         """
         Remove an attachment and its associated files.
@@ -118,8 +190,8 @@ class AttachmentManager:
             
             return True
             
-        except Exception as e:
-            print(f"Error removing attachment: {e}")
+        except Exception:
+            logger.exception("Error removing attachment: %s", attachment.stored_path)
             return False
     
     def _generate_thumbnail(self, image_path: str, attachment_id: str,
@@ -140,6 +212,10 @@ class AttachmentManager:
         
         try:
             with Image.open(image_path) as img:
+                # Let libjpeg decode large JPEGs at 1/2-1/8 scale (never below size)
+                if img.format == 'JPEG':
+                    img.draft('RGB', size)
+                
                 # Convert to RGB if necessary (for PNG with transparency)
                 if img.mode in ('RGBA', 'LA', 'P'):
                     background = Image.new('RGB', img.size, (255, 255, 255))
@@ -154,12 +230,12 @@ class AttachmentManager:
                 # Save thumbnail
                 thumbnail_filename = f"thumb_{attachment_id}.jpg"
                 thumbnail_path = os.path.join(self.thumbnails_dir, thumbnail_filename)
-                img.save(thumbnail_path, 'JPEG', quality=85)
+                img.save(thumbnail_path, 'JPEG', quality=85, optimize=False, progressive=False)
                 
                 return thumbnail_path
                 
-        except Exception as e:
-            print(f"Error generating thumbnail: {e}")
+        except Exception:
+            logger.exception("Error generating thumbnail: %s", image_path)
             return ""
     
     def get_attachments_for_estimate(self, attachments: List[Attachment]) -> List[Attachment]:
@@ -199,11 +275,12 @@ class AttachmentManager:
         file_count = 0
         
         if os.path.exists(self.attachments_dir):
-            for filename in os.listdir(self.attachments_dir):
-                file_path = os.path.join(self.attachments_dir, filename)
-                if os.path.isfile(file_path):
-                    total_size += os.path.getsize(file_path)
-                    file_count += 1
+            # DirEntry caches the file type from readdir, so only one stat per file
+            with os.scandir(self.attachments_dir) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        total_size += entry.stat().st_size
+                        file_count += 1
         
         return {
             'total_size_bytes': total_size,
@@ -23,17 +23,68 @@ Format pozycji wejściowej (przykład):
   }
 """
 
-from typing import List, Dict, Any
-from decimal import Decimal, ROUND_HALF_UP, getcontext
+from collections import defaultdict
+import math
+from typing import List, Dict, Any, DefaultDict
+from decimal import Decimal, ROUND_HALF_UP
 
-# ustawiamy precyzję Decimal wystarczającą do finansów
-getcontext().prec = 18
+from app.services.csv_export import CSV_HEADER
+from app.utils.vectorize import np, NUMPY_AVAILABLE, VECTORIZE_MIN_ITEMS
 
 def _round(val: float, places: int = 2) -> float:
     """Zaokrąglenie finansowe (połówkowe do góry) na places miejsc dziesiętnych."""
     d = Decimal(str(val)).quantize(Decimal('1.' + '0'*places), rounding=ROUND_HALF_UP)
     return float(d)
 
+def _to_cents(val: float) -> int:
+    """
+    Kwota w groszach (int), zaokrąglona połówkowo od zera - tak samo jak _round.
+
+    Gdy wartość leży tuż przy połowie grosza, błąd reprezentacji float
+    mógłby zmienić wynik, więc wtedy rozstrzyga dokładne zaokrąglenie Decimal.
+    """
+    scaled = val * 100.0
+    frac = abs(scaled - int(scaled))
+    if abs(frac - 0.5) < 1e-6:
+        return int(Decimal(str(val)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP) * 100)
+    return int(scaled + 0.5) if scaled >= 0 else int(scaled - 0.5)
+
+def _vat_cents(net_cents: int, vat_rate: int) -> int:
+    """VAT w groszach od kwoty netto w groszach (połówkowo od zera)."""
+    vat_cents = (abs(net_cents) * vat_rate + 50) // 100
+    return -vat_cents if net_cents < 0 else vat_cents
+
+def _compute_item_sums(item: Dict[str, Any]):
+    """
+    Zwraca (qty, price_net, vat, net_c, vat_c, category) bez kopiowania pozycji.
+
+    Kwoty net_c i vat_c są w groszach.
+    """
+    get = item.get
+    qty = float(get("quantity", 0.0) or 0.0)
+    price_net = float(get("price_unit_net", 0.0) or 0.0)
+    vat = int(get("vat_rate", 23) or 0)
+
+    net_c = _to_cents(qty * price_net)
+    vat_c = _vat_cents(net_c, vat)
+    category = (get("category") or "material").lower()
+    return qty, price_net, vat, net_c, vat_c, category
+
+def _augment_item(item: Dict[str, Any], qty: float, price_net_c: int, vat: int,
+                  net_c: int, vat_c: int, category: str) -> Dict[str, Any]:
+    """Kopia pozycji uzupełniona o kwoty i znormalizowane pola."""
+    return {
+        **item,
+        "total_net": net_c / 100,
+        "vat_value": vat_c / 100,
+        "total_gross": (net_c + vat_c) / 100,
+        # normalize some fields
+        "quantity": qty,
+        "price_unit_net": price_net_c / 100,
+        "vat_rate": vat,
+        "category": category,
+    }
+
 def compute_item(item: Dict[str, Any]) -> Dict[str, Any]:
     """
     Oblicza dla pojedynczej pozycji wartości netto/vat/brutto.
@@ -49,31 +100,20 @@ def compute_item(item: Dict[str, Any]) -> Dict[str, Any]:
 
     Zwraca słownik uzupełniony o:
       - total_net (float)
-      - vat_value (float)
-      - total_gross (float)
+      - vat_value (float)  -- liczony od zaokrąglonej kwoty netto
+      - total_gross (float)  -- zawsze total_net + vat_value
     """
-    qty = float(item.get("quantity", 0.0) or 0.0)
-    price_net = float(item.get("price_unit_net", 0.0) or 0.0)
-    vat = int(item.get("vat_rate", 23) or 0)
-
-    total_net = qty * price_net
-    vat_value = total_net * vat / 100.0
-    total_gross = total_net + vat_value
-
-    item_out = dict(item)  # shallow copy
-    item_out["total_net"] = _round(total_net, 2)
-    item_out["vat_value"] = _round(vat_value, 2)
-    item_out["total_gross"] = _round(total_gross, 2)
-    # normalize some fields
-    item_out["quantity"] = qty
-    item_out["price_unit_net"] = _round(price_net, 2)
-    item_out["vat_rate"] = vat
-    item_out["category"] = (item.get("category") or "material").lower()
-    return item_out
+    qty, price_net, vat, net_c, vat_c, category = _compute_item_sums(item)
+    return _augment_item(item, qty, _to_cents(price_net), vat, net_c, vat_c, category)
+
+def _sums_to_float(sums: List[int]) -> Dict[str, float]:
+    """Zamienia [net, vat, gross] w groszach na słownik kwot."""
+    return {"net": sums[0] / 100, "vat": sums[1] / 100, "gross": sums[2] / 100}
 
 def compute_totals(items: List[Dict[str, Any]],
                    transport_percent: float = 3.0,
-                   transport_vat: int = 23) -> Dict[str, Any]:
+                   transport_vat: int = 23,
+                   include_items: bool = True) -> Dict[str, Any]:
     """
     Przetwarza listę pozycji i zwraca podsumowania.
 
@@ -81,6 +121,7 @@ def compute_totals(items: List[Dict[str, Any]],
       - items: lista pozycji (słowniki, patrz compute_item)
       - transport_percent: ile % z sumy netto doliczyć jako transport (np. 3.0)
       - transport_vat: stawka VAT dla transportu (np. 23)
+      - include_items: gdy False, "items" jest pustą listą (bez kopii pozycji)
 
     Zwraca strukturę:
       {
@@ -91,89 +132,149 @@ def compute_totals(items: List[Dict[str, Any]],
         "summary": { "net": ..., "vat": ..., "gross": ... }
       }
     """
-    augmented: List[Dict[str, Any]] = []
-    by_vat: Dict[int, Dict[str, float]] = {}
-    by_cat: Dict[str, Dict[str, float]] = {}
-    total_net = 0.0
-    total_vat = 0.0
-    total_gross = 0.0
-
-    # compute each item and aggregate
-    for it in items:
-        aug = compute_item(it)
-        augmented.append(aug)
-
-        vat_rate = int(aug.get("vat_rate", 0))
-        cat = (aug.get("category") or "material").lower()
-
-        if vat_rate not in by_vat:
-            by_vat[vat_rate] = {"net": 0.0, "vat": 0.0, "gross": 0.0}
-        by_vat[vat_rate]["net"] += aug["total_net"]
-        by_vat[vat_rate]["vat"] += aug["vat_value"]
-        by_vat[vat_rate]["gross"] += aug["total_gross"]
-
-        if cat not in by_cat:
-            by_cat[cat] = {"net": 0.0, "vat": 0.0, "gross": 0.0}
-        by_cat[cat]["net"] += aug["total_net"]
-        by_cat[cat]["vat"] += aug["vat_value"]
-        by_cat[cat]["gross"] += aug["total_gross"]
-
-        total_net += aug["total_net"]
-        total_vat += aug["vat_value"]
-        total_gross += aug["total_gross"]
+    computed = [_compute_item_sums(it) for it in items]
+    augmented: List[Dict[str, Any]] = [
+        _augment_item(it, qty, _to_cents(price_net), vat, net_c, vat_c, category)
+        for it, (qty, price_net, vat, net_c, vat_c, category) in zip(items, computed)
+    ] if include_items else []
+
+    # sumy trzymane w groszach jako [net, vat, gross]
+    by_vat: DefaultDict[int, List[int]] = defaultdict(lambda: [0, 0, 0])
+    by_cat: DefaultDict[str, List[int]] = defaultdict(lambda: [0, 0, 0])
+    total_net = 0
+    total_vat = 0
+    total_gross = 0
+
+    for _, _, vat, net_c, vat_c, category in computed:
+        gross_c = net_c + vat_c
+
+        sums = by_vat[vat]
+        sums[0] += net_c
+        sums[1] += vat_c
+        sums[2] += gross_c
+
+        sums = by_cat[category]
+        sums[0] += net_c
+        sums[1] += vat_c
+        sums[2] += gross_c
+
+        total_net += net_c
+        total_vat += vat_c
+        total_gross += gross_c
+
+    return _finish_totals(augmented, by_vat, by_cat, total_net, total_vat, total_gross,
+                          transport_percent, transport_vat)
+
+def _finish_totals(augmented: List[Dict[str, Any]],
+                   by_vat: Dict[int, List[int]],
+                   by_cat: Dict[str, List[int]],
+                   total_net: int, total_vat: int, total_gross: int,
+                   transport_percent: float, transport_vat: int) -> Dict[str, Any]:
+    """Dolicza transport do sum w groszach i buduje wynik compute_totals."""
+    tp = float(transport_percent) if transport_percent else 0.0
+    tv = int(transport_vat) if transport_vat else 0
 
     # Transport: procent od sumy netto (wybor użytkownika: procent od ceny netto)
-    transport_net = 0.0
-    transport_vat_value = 0.0
-    transport_gross = 0.0
-    try:
-        tp = float(transport_percent or 0.0)
-        if tp > 0 and total_net > 0:
-            transport_net = _round(total_net * (tp / 100.0), 2)
-            tv = int(transport_vat or 0)
-            transport_vat_value = _round(transport_net * tv / 100.0, 2) if tv else 0.0
-            transport_gross = _round(transport_net + transport_vat_value, 2)
-    except Exception:
-        transport_net = transport_vat_value = transport_gross = 0.0
-
-    # dolicz transport do sum
-    total_net = _round(total_net + transport_net, 2)
-    total_vat = _round(total_vat + transport_vat_value, 2)
-    total_gross = _round(total_gross + transport_gross, 2)
-
-    # włącz transport jako wpis do by_vat oraz by_cat (jako usługa)
+    if 0 < tp < math.inf and total_net > 0:
+        # jedno dokładne mnożenie na wywołanie - groszy nie gubi float
+        transport_net = int((Decimal(total_net) * Decimal(str(tp)) / 100)
+                            .quantize(Decimal(1), rounding=ROUND_HALF_UP))
+        transport_vat_value = _vat_cents(transport_net, tv)
+        transport_gross = transport_net + transport_vat_value
+    else:
+        transport_net = transport_vat_value = transport_gross = 0
+
+    # dolicz transport do sum i włącz go do by_vat oraz by_cat (jako usługa)
     if transport_net:
-        tv = int(transport_vat or 0)
-        if tv not in by_vat:
-            by_vat[tv] = {"net": 0.0, "vat": 0.0, "gross": 0.0}
-        by_vat[tv]["net"] += transport_net
-        by_vat[tv]["vat"] += transport_vat_value
-        by_vat[tv]["gross"] += transport_gross
-
-        svc = "service"
-        if svc not in by_cat:
-            by_cat[svc] = {"net": 0.0, "vat": 0.0, "gross": 0.0}
-        by_cat[svc]["net"] += transport_net
-        by_cat[svc]["vat"] += transport_vat_value
-        by_cat[svc]["gross"] += transport_gross
-
-    # zaokrąglenie agregatów
-    for vat_r, sums in list(by_vat.items()):
-        by_vat[vat_r] = {"net": _round(sums["net"], 2), "vat": _round(sums["vat"], 2), "gross": _round(sums["gross"], 2)}
-    for cat, sums in list(by_cat.items()):
-        by_cat[cat] = {"net": _round(sums["net"], 2), "vat": _round(sums["vat"], 2), "gross": _round(sums["gross"], 2)}
-
-    summary = {"net": _round(total_net, 2), "vat": _round(total_vat, 2), "gross": _round(total_gross, 2)}
-    transport = {"net": transport_net, "vat": transport_vat_value, "gross": transport_gross, "vat_rate": int(transport_vat or 0), "percent": float(transport_percent or 0.0)}
+        total_net += transport_net
+        total_vat += transport_vat_value
+        total_gross += transport_gross
+        for group, key in ((by_vat, tv), (by_cat, "service")):
+            sums = group.setdefault(key, [0, 0, 0])
+            sums[0] += transport_net
+            sums[1] += transport_vat_value
+            sums[2] += transport_gross
+
+    summary = {"net": total_net / 100, "vat": total_vat / 100, "gross": total_gross / 100}
+    transport = {"net": transport_net / 100, "vat": transport_vat_value / 100, "gross": transport_gross / 100, "vat_rate": tv, "percent": tp}
 
     return {
         "items": augmented,
-        "by_vat": by_vat,
-        "by_category": by_cat,
+        "by_vat": {vat_r: _sums_to_float(sums) for vat_r, sums in by_vat.items()},
+        "by_category": {cat: _sums_to_float(sums) for cat, sums in by_cat.items()},
         "transport": transport,
         "summary": summary
     }
 
+def _to_cents_array(values):
+    """Wektorowa wersja _to_cents; remisy przy połowie grosza liczy skalarnie."""
+    scaled = values * 100.0
+    cents = np.trunc(scaled + np.copysign(0.5, scaled)).astype(np.int64)
+    ties = np.flatnonzero(np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6)
+    for i in ties.tolist():
+        cents[i] = _to_cents(float(values[i]))
+    return cents
+
+def compute_totals_vectorized(items: List[Dict[str, Any]],
+                              transport_percent: float = 3.0,
+                              transport_vat: int = 23,
+                              include_items: bool = True) -> Dict[str, Any]:
+    """
+    To samo co compute_totals, ale kwoty i sumy grup liczone są tablicami NumPy.
+
+    Bez NumPy, dla krótkich list oraz dla wartości nieskończonych/ogromnych
+    wraca do compute_totals - wynik jest zawsze identyczny.
+    """
+    count = len(items)
+    if not NUMPY_AVAILABLE or count < VECTORIZE_MIN_ITEMS:
+        return compute_totals(items, transport_percent, transport_vat, include_items)
+
+    rows = np.fromiter(
+        ((float(it.get("quantity", 0.0) or 0.0),
+          float(it.get("price_unit_net", 0.0) or 0.0),
+          int(it.get("vat_rate", 23) or 0)) for it in items),
+        dtype=[("q", "f8"), ("p", "f8"), ("v", "i8")], count=count)
+    qty, price, vat = rows["q"], rows["p"], rows["v"]
+    net = qty * price
+    if not (np.isfinite(net).all() and np.isfinite(price).all()) \
+            or max(np.abs(net).max(), np.abs(price).max()) >= 1e13:
+        return compute_totals(items, transport_percent, transport_vat, include_items)
+
+    net_c = _to_cents_array(net)
+    vat_c = np.sign(net_c) * ((np.abs(net_c) * vat + 50) // 100)
+    gross_c = net_c + vat_c
+    price_c = _to_cents_array(price)
+
+    augmented: List[Dict[str, Any]] = []
+    cat_codes: Dict[str, int] = {}
+    cat_idx = np.empty(count, dtype=np.int64)
+    for i, (it, q, p, v, n, t) in enumerate(zip(
+            items, qty.tolist(), price_c.tolist(), vat.tolist(),
+            net_c.tolist(), vat_c.tolist())):
+        cat = (it.get("category") or "material").lower()
+        cat_idx[i] = cat_codes.setdefault(cat, len(cat_codes))
+        if include_items:
+            augmented.append(_augment_item(it, q, p, v, n, t, cat))
+
+    def group_sums(codes, idx):
+        # sumy groszy są dokładne w float64 (poniżej 2**53)
+        size = len(codes)
+        sums = [np.rint(np.bincount(idx, weights=w, minlength=size)).astype(np.int64).tolist()
+                for w in (net_c, vat_c, gross_c)]
+        return {code: [sums[0][k], sums[1][k], sums[2][k]] for k, code in enumerate(codes)}
+
+    # stawki VAT w kolejności pierwszego wystąpienia - jak w compute_totals
+    rates, first, vat_idx = np.unique(vat, return_index=True, return_inverse=True)
+    order = np.argsort(first, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    by_vat = group_sums(rates[order].tolist(), rank[vat_idx.ravel()])
+    by_cat = group_sums(list(cat_codes), cat_idx)
+
+    return _finish_totals(augmented, by_vat, by_cat,
+                          int(net_c.sum()), int(vat_c.sum()), int(gross_c.sum()),
+                          transport_percent, transport_vat)
+
 # -- helpery do eksportu CSV (opcjonalne) --
 def export_items_to_csv_rows(items: List[Dict[str, Any]]) -> List[List[str]]:
     """
@@ -181,20 +282,19 @@ def export_items_to_csv_rows(items: List[Dict[str, Any]]) -> List[List[str]]:
     Nagłówek:
       ["Nazwa", "Ilość", "JM", "Cena netto", "VAT %", "Netto", "VAT", "Brutto", "Kategoria", "Notatka"]
     """
-    rows = [["Nazwa", "Ilość", "JM", "Cena netto", "VAT %", "Netto", "VAT", "Brutto", "Kategoria", "Notatka"]]
-    for it in items:
-        rows.append([
-            str(it.get("name", "")),
-            f"{it.get('quantity', 0):.3f}",
-            str(it.get("unit", "")),
-            f"{it.get('price_unit_net', 0.0):.2f}",
-            str(it.get("vat_rate", 0)),
-            f"{it.get('total_net', 0.0):.2f}",
-            f"{it.get('vat_value', 0.0):.2f}",
-            f"{it.get('total_gross', 0.0):.2f}",
-            str(it.get("category", "")),
-            str(it.get("note", ""))
-        ])
+    rows = [list(CSV_HEADER)]
+    rows.extend([
+        str(it.get("name", "")),
+        f"{it.get('quantity', 0):.3f}",
+        str(it.get("unit", "")),
+        f"{it.get('price_unit_net', 0.0):.2f}",
+        str(it.get("vat_rate", 0)),
+        f"{it.get('total_net', 0.0):.2f}",
+        f"{it.get('vat_value', 0.0):.2f}",
+        f"{it.get('total_gross', 0.0):.2f}",
+        str(it.get("category", "")),
+        str(it.get("note", ""))
+    ] for it in items)
     return rows
 
 if __name__ == "__main__":
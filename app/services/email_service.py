@@ -1,19 +1,29 @@
 """
 Email service for sending cost estimates.
 """
+import importlib.util
 import smtplib
 import ssl
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.mime.application import MIMEApplication
-from typing import Optional, Dict, Any
+import threading
+import time
+from email.message import EmailMessage
+from typing import Optional, Dict, Any, List, Tuple
 from pathlib import Path
+from contextlib import contextmanager
 
-try:
-    import keyring
-    KEYRING_AVAILABLE = True
-except ImportError:
-    KEYRING_AVAILABLE = False
+# keyring loads its platform backends (D-Bus, Keychain, ...) on import, which
+# is slow, so only check that it is installed and import it on first use
+KEYRING_AVAILABLE = importlib.util.find_spec('keyring') is not None
+keyring = None
+
+
+def _keyring():
+    """Return the keyring module, importing it on first use."""
+    global keyring
+    if keyring is None:
+        import keyring as module
+        keyring = module
+    return keyring
 
 
 class EmailService:
@@ -55,12 +65,21 @@ class EmailService:
     
     KEYRING_SERVICE = "Ofertownik_Email"
     
+    # How long a password read from keyring is reused (seconds)
+    PASSWORD_CACHE_TTL = 300.0
+    
+    # Shared TLS context (loading the CA store is costly, the context is reusable)
+    _ssl_context: Optional[ssl.SSLContext] = None
+    
     def __init__(self):
         self.smtp_server: str = ""
         self.smtp_port: int = 587
         self.use_tls: bool = True
         self.sender_email: str = ""
         self.sender_name: str = ""
+        # (sender_email, password, monotonic timestamp) of the last keyring hit
+        self._pwd_cache: Optional[Tuple[str, str, float]] = None
+        self._pwd_lock = threading.Lock()
     
     def configure(self, smtp_server: str, smtp_port: int, 
                   sender_email: str, sender_name: str = "",
@@ -77,30 +96,120 @@ class EmailService:
         if not KEYRING_AVAILABLE:
             return False
         try:
-            keyring.set_password(self.KEYRING_SERVICE, self.sender_email, password)
-            return True
+            _keyring().set_password(self.KEYRING_SERVICE, self.sender_email, password)
         except Exception:
+            with self._pwd_lock:
+                self._pwd_cache = None
             return False
+        with self._pwd_lock:
+            self._pwd_cache = (self.sender_email, password, time.monotonic())
+        return True
     
     def get_password(self) -> Optional[str]:
-        """Retrieve password from keyring."""
+        """
+        Retrieve password from keyring.
+        
+        Keyring lookups can be slow (D-Bus round trip on Linux), so a found
+        password is reused for PASSWORD_CACHE_TTL seconds.
+        """
         if not KEYRING_AVAILABLE:
             return None
-        try:
-            return keyring.get_password(self.KEYRING_SERVICE, self.sender_email)
-        except Exception:
-            return None
+        with self._pwd_lock:
+            cached = self._pwd_cache
+            if (cached is not None and cached[0] == self.sender_email
+                    and time.monotonic() - cached[2] < self.PASSWORD_CACHE_TTL):
+                return cached[1]
+            try:
+                password = _keyring().get_password(self.KEYRING_SERVICE, self.sender_email)
+            except Exception:
+                return None
+            self._pwd_cache = (
+                (self.sender_email, password, time.monotonic()) if password else None
+            )
+            return password
     
     def delete_password(self) -> bool:
         """Delete stored password."""
         if not KEYRING_AVAILABLE:
             return False
+        with self._pwd_lock:
+            self._pwd_cache = None
         try:
-            keyring.delete_password(self.KEYRING_SERVICE, self.sender_email)
+            _keyring().delete_password(self.KEYRING_SERVICE, self.sender_email)
             return True
         except Exception:
             return False
     
+    @classmethod
+    def _get_ssl_context(cls) -> ssl.SSLContext:
+        """Return the TLS context shared by all SMTP sessions."""
+        if cls._ssl_context is None:
+            cls._ssl_context = ssl.create_default_context()
+        return cls._ssl_context
+    
+    def _build_message(self, to_email: str, subject: str, body: str,
+                       attachment_path: Optional[str] = None,
+                       cc: Optional[str] = None,
+                       bcc: Optional[str] = None) -> Tuple[EmailMessage, List[str]]:
+        """
+        Build a message and its envelope recipient list.
+        
+        Returns:
+            Tuple of (message, recipients)
+        """
+        msg = EmailMessage()
+        msg['From'] = f"{self.sender_name} <{self.sender_email}>"
+        msg['To'] = to_email
+        msg['Subject'] = subject
+        
+        if cc:
+            msg['Cc'] = cc
+        
+        # Add body
+        msg.set_content(body, charset='utf-8', cte='quoted-printable')
+        
+        # Add attachment if provided
+        if attachment_path and Path(attachment_path).exists():
+            with open(attachment_path, 'rb') as f:
+                msg.add_attachment(f.read(), maintype='application', subtype='pdf',
+                                   filename=Path(attachment_path).name)
+        
+        # Build recipient list
+        recipients = [to_email]
+        if cc:
+            recipients.extend([e.strip() for e in cc.split(',')])
+        if bcc:
+            recipients.extend([e.strip() for e in bcc.split(',')])
+        
+        return msg, recipients
+    
+    @contextmanager
+    def _session(self, pwd: str):
+        """
+        Context manager for a connected, logged-in SMTP session.
+        
+        Yields:
+            SMTP session, or None if the TLS connection failed
+        """
+        with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
+            if self.use_tls:
+                server.starttls(context=self._get_ssl_context())
+                # Verify the TLS connection succeeded
+                if not server.sock:
+                    yield None
+                    return
+            server.login(self.sender_email, pwd)
+            yield server
+    
+    @staticmethod
+    def _error_result(error: Exception) -> Dict[str, Any]:
+        """Map an exception raised while sending to a result dict."""
+        if isinstance(error, smtplib.SMTPAuthenticationError):
+            return {'success': False, 'message': 'Błąd autoryzacji. Sprawdź email i hasło. Dla Gmail użyj App Password.'}
+        if isinstance(error, smtplib.SMTPException):
+            return {'success': False, 'message': f'Błąd SMTP: {str(error)}'}
+        return {'success': False, 'message': f'Błąd wysyłania: {str(error)}'}
+    
     def send_email(self, to_email: str, subject: str, body: str,
                    attachment_path: Optional[str] = None,
                    password: Optional[str] = None,
@@ -121,54 +230,67 @@ class EmailService:
             return {'success': False, 'message': 'Brak hasła. Skonfiguruj ustawienia email.'}
         
         try:
-            # Create message
-            msg = MIMEMultipart()
-            msg['From'] = f"{self.sender_name} <{self.sender_email}>"
-            msg['To'] = to_email
-            msg['Subject'] = subject
-            
-            if cc:
-                msg['Cc'] = cc
-            
-            # Add body
-            msg.attach(MIMEText(body, 'plain', 'utf-8'))
+            msg, recipients = self._build_message(to_email, subject, body,
+                                                  attachment_path, cc, bcc)
             
-            # Add attachment if provided
-            if attachment_path and Path(attachment_path).exists():
-                with open(attachment_path, 'rb') as f:
-                    attachment = MIMEApplication(f.read(), _subtype='pdf')
-                    attachment.add_header('Content-Disposition', 'attachment',
-                                         filename=Path(attachment_path).name)
-                    msg.attach(attachment)
-            
-            # Build recipient list
-            recipients = [to_email]
-            if cc:
-                recipients.extend([e.strip() for e in cc.split(',')])
-            if bcc:
-                recipients.extend([e.strip() for e in bcc.split(',')])
-            
-            # Send email
-            context = ssl.create_default_context()
-            
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                if self.use_tls:
-                    # Verify TLS connection is established
-                    server.starttls(context=context)
-                    # Verify the TLS connection succeeded
-                    if not server.sock:
-                        return {'success': False, 'message': 'Błąd nawiązywania połączenia TLS'}
-                server.login(self.sender_email, pwd)
-                server.sendmail(self.sender_email, recipients, msg.as_string())
+            with self._session(pwd) as server:
+                if server is None:
+                    return {'success': False, 'message': 'Błąd nawiązywania połączenia TLS'}
+                server.send_message(msg, self.sender_email, recipients)
             
             return {'success': True, 'message': f'Email wysłany do {to_email}'}
             
-        except smtplib.SMTPAuthenticationError:
-            return {'success': False, 'message': 'Błąd autoryzacji. Sprawdź email i hasło. Dla Gmail użyj App Password.'}
-        except smtplib.SMTPException as e:
-            return {'success': False, 'message': f'Błąd SMTP: {str(e)}'}
         except Exception as e:
-            return {'success': False, 'message': f'Błąd wysyłania: {str(e)}'}
+            return self._error_result(e)
+    
+    def send_emails_batch(self, items: List[Dict[str, Any]],
+                          password: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Send several emails over a single SMTP session.
+        
+        Connecting, the TLS handshake and login happen once for the whole
+        batch instead of once per message.
+        
+        Args:
+            items: Message definitions with the keyword arguments of send_email
+                   ('to_email', 'subject', 'body' and optionally
+                   'attachment_path', 'cc', 'bcc')
+            password: SMTP password (default: stored in keyring)
+            
+        Returns:
+            One result dict ('success', 'message') per item, in order
+        """
+        if not items:
+            return []
+        if not self.smtp_server or not self.sender_email:
+            return [{'success': False, 'message': 'Email nie jest skonfigurowany'} for _ in items]
+        
+        pwd = password or self.get_password()
+        if not pwd:
+            return [{'success': False, 'message': 'Brak hasła. Skonfiguruj ustawienia email.'} for _ in items]
+        
+        results = []
+        try:
+            with self._session(pwd) as server:
+                if server is None:
+                    return [{'success': False, 'message': 'Błąd nawiązywania połączenia TLS'} for _ in items]
+                for item in items:
+                    try:
+                        msg, recipients = self._build_message(
+                            item['to_email'], item['subject'], item['body'],
+                            item.get('attachment_path'), item.get('cc'), item.get('bcc'))
+                        server.send_message(msg, self.sender_email, recipients)
+                        results.append({'success': True, 'message': f"Email wysłany do {item['to_email']}"})
+                    except smtplib.SMTPServerDisconnected:
+                        # Session is gone; handled below for the remaining messages
+                        raise
+                    except Exception as e:
+                        results.append(self._error_result(e))
+        except Exception as e:
+            # Connection/login failed or the server dropped the session
+            results.extend(self._error_result(e) for _ in range(len(items) - len(results)))
+        
+        return results
     
     def test_connection(self, password: Optional[str] = None) -> Dict[str, Any]:
         """Test SMTP connection."""
@@ -177,10 +299,9 @@ class EmailService:
             return {'success': False, 'message': 'Brak hasła'}
         
         try:
-            context = ssl.create_default_context()
             with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
                 if self.use_tls:
-                    server.starttls(context=context)
+                    server.starttls(context=self._get_ssl_context())
                 server.login(self.sender_email, pwd)
             return {'success': True, 'message': 'Połączenie OK!'}
         except Exception as e:
@@ -1,5 +1,22 @@
 # felt_calculations.py
-import math
+from functools import lru_cache
+
+_RESULT_KEYS = (
+    "total_top_felt_m2",
+    "total_underlay_felt_m2",
+    "decking_m2",
+    "osb_m2",
+    "concrete_topping_m3",
+    "primer_liters",
+    "firewall_osb_m2",
+    "firewall_felt_m2",
+)
+_ZERO_RESULT = (0.0,) * len(_RESULT_KEYS)
+
+# Współczynniki zużycia papy wg typu dachu (kopertowy, niestandardowy: domyślny)
+_FELT_WASTE = {"jednospadowy": 1.15, "dwuspadowy": 1.15}
+_DEFAULT_WASTE = 1.18
+
 
 def calculate_felt_roof(roof_surface_m2, roof_type, is_tear_off,
                        is_decking=False, is_osb_on_battens=False, is_concrete=False,
@@ -7,35 +24,38 @@ def calculate_felt_roof(roof_surface_m2, roof_type, is_tear_off,
                        firewall_length_m=0.0, firewall_height_m=0.0, firewall_thickness_m=0.0):
     """
     Oblicza potrzebne materiały dla pokrycia papowego.
+
+    Wyniki są zapamiętywane dla powtarzających się argumentów (odświeżanie UI);
+    każde wywołanie zwraca nowy słownik, więc wywołujący może go modyfikować.
     """
+    values = _calculate_felt_roof(roof_surface_m2, roof_type, is_tear_off,
+                                  is_decking, is_osb_on_battens, is_concrete,
+                                  chimney_felt_surface_m2,
+                                  firewall_length_m, firewall_height_m, firewall_thickness_m)
+    return dict(zip(_RESULT_KEYS, values))
+
+
+@lru_cache(maxsize=512, typed=True)
+def _calculate_felt_roof(roof_surface_m2, roof_type, is_tear_off,
+                         is_decking, is_osb_on_battens, is_concrete,
+                         chimney_felt_surface_m2,
+                         firewall_length_m, firewall_height_m, firewall_thickness_m):
+    """Właściwe obliczenia; zwraca krotkę wartości w kolejności _RESULT_KEYS."""
     if roof_surface_m2 < 0:
         raise ValueError("Powierzchnia dachu nie może być ujemna.")
     
     if roof_surface_m2 == 0 and chimney_felt_surface_m2 == 0 and firewall_length_m == 0:
-         return {
-            "total_top_felt_m2": 0.0,
-            "total_underlay_felt_m2": 0.0,
-            "decking_m2": 0.0,
-            "osb_m2": 0.0,
-            "concrete_topping_m3": 0.0, # Zmieniono na m3
-            "primer_liters": 0.0,
-            "firewall_osb_m2": 0.0,
-            "firewall_felt_m2": 0.0
-        }
+        return _ZERO_RESULT
 
     # 1. Współczynnik zużycia papy
-    if roof_type in ["jednospadowy", "dwuspadowy"]:
-        felt_waste_factor = 1.15
-    else: # kopertowy, niestandardowy
-        felt_waste_factor = 1.18
+    felt_waste_factor = _FELT_WASTE.get(roof_type, _DEFAULT_WASTE)
 
     # 2. Papa wierzchniego krycia
-    total_top_felt_m2 = roof_surface_m2 * felt_waste_factor
+    felted_m2 = roof_surface_m2 * felt_waste_factor
+    total_top_felt_m2 = felted_m2
 
     # 3. Papa podkładowa
-    total_underlay_felt_m2 = 0.0
-    if not is_concrete:
-        total_underlay_felt_m2 = roof_surface_m2 * felt_waste_factor
+    total_underlay_felt_m2 = 0.0 if is_concrete else felted_m2
 
     # 4. Materiały podłoża
     decking_m2 = 0.0
@@ -63,25 +83,20 @@ def calculate_felt_roof(roof_surface_m2, roof_type, is_tear_off,
     firewall_felt_m2 = 0.0
     
     if firewall_length_m > 0 and firewall_height_m > 0 and firewall_thickness_m > 0:
+        both_sides_height_m = 2 * firewall_height_m
+
         # Powierzchnia OSB (2 boki)
-        firewall_osb_m2 = firewall_length_m * firewall_height_m * 2
+        firewall_osb_m2 = firewall_length_m * both_sides_height_m
         
         # Papa (2 boki + góra + zakład na dach)
-        felt_developed_width_for_firewall = (2 * firewall_height_m) + firewall_thickness_m + 0.15
+        felt_developed_width_for_firewall = both_sides_height_m + firewall_thickness_m + 0.15
         firewall_felt_m2 = firewall_length_m * felt_developed_width_for_firewall
 
     # 6. Sumowanie papy (dach + kominy + ogniomury)
-    total_top_felt_m2 += chimney_felt_surface_m2 + firewall_felt_m2
+    extra_felt_m2 = chimney_felt_surface_m2 + firewall_felt_m2
+    total_top_felt_m2 += extra_felt_m2
     if total_underlay_felt_m2 > 0:
-        total_underlay_felt_m2 += chimney_felt_surface_m2 + firewall_felt_m2
-
-    return {
-        "total_top_felt_m2": total_top_felt_m2,
-        "total_underlay_felt_m2": total_underlay_felt_m2,
-        "decking_m2": decking_m2,
-        "osb_m2": osb_m2,
-        "concrete_topping_m3": concrete_topping_m3,
-        "primer_liters": primer_liters,
-        "firewall_osb_m2": firewall_osb_m2,
-        "firewall_felt_m2": firewall_felt_m2
-    }
\ No newline at end of file
+        total_underlay_felt_m2 += extra_felt_m2
+
+    return (total_top_felt_m2, total_underlay_felt_m2, decking_m2, osb_m2,
+            concrete_topping_m3, primer_liters, firewall_osb_m2, firewall_felt_m2)
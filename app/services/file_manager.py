@@ -7,12 +7,17 @@ import os
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
+from app.utils import jsonio
+
 
 class FileManager:
     """
     Handles loading and saving of JSON files for the application.
     """
     
+    # Absolute paths of directories already created/verified by save_json
+    _known_dirs: set = set()
+    
     @staticmethod
     def load_json(filepath: str, default: Any = None) -> Any:
         """
@@ -25,13 +30,11 @@ class FileManager:
         Returns:
             Parsed JSON data or default value
         """
-        if not os.path.exists(filepath):
-            return default if default is not None else {}
-        
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
+            return jsonio.load_file(filepath)
+        except FileNotFoundError:
+            return default if default is not None else {}
+        except (ValueError, OSError) as e:
             print(f"Error loading {filepath}: {e}")
             return default if default is not None else {}
     
@@ -48,14 +51,29 @@ class FileManager:
         Returns:
             True if successful, False otherwise
         """
+        directory = os.path.abspath(os.path.dirname(filepath) or '.')
         try:
             # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(filepath) if os.path.dirname(filepath) else '.', exist_ok=True)
+            if directory not in FileManager._known_dirs:
+                os.makedirs(directory, exist_ok=True)
+                FileManager._known_dirs.add(directory)
+            
+            if indent in (None, 0, 2):
+                payload = jsonio.dumps(data, indent=bool(indent))
+            else:
+                # orjson only supports a 2-space indent
+                payload = json.dumps(data, ensure_ascii=False, indent=indent).encode('utf-8')
             
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=indent)
+            # Crash-safe: either the old or the new content, never a partial file
+            try:
+                jsonio.write_atomic(filepath, payload)
+            except FileNotFoundError:
+                # The directory was removed after it was cached; recreate and retry once
+                os.makedirs(directory, exist_ok=True)
+                jsonio.write_atomic(filepath, payload)
             return True
-        except (IOError, TypeError) as e:
+        except (OSError, TypeError) as e:
+            FileManager._known_dirs.discard(directory)
             print(f"Error saving {filepath}: {e}")
             return False
     
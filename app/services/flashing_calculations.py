@@ -1,6 +1,43 @@
 # flashing_calculations.py
 import math
 
+from app.utils.vectorize import np, NUMPY_AVAILABLE
+
+# poniżej tej liczby obróbek pętla Pythona jest szybsza niż budowa tablic
+VECTORIZE_MIN_ITEMS = 64
+
+
+def _selected_surface(flashing_items):
+    """Suma długość × szerokość zaznaczonych obróbek (numpy dla dużych zestawień)."""
+    if not NUMPY_AVAILABLE or len(flashing_items) < VECTORIZE_MIN_ITEMS:
+        total = 0.0
+        for name, data in flashing_items.items():
+            if data["selected"]:
+                length = data["length"]
+                width = data["width"]
+
+                if length < 0 or width < 0:
+                    raise ValueError(f"Długość i szerokość obróbki '{name}' nie mogą być ujemne.")
+
+                total += length * width
+        return total
+
+    selected = [(name, data) for name, data in flashing_items.items() if data["selected"]]
+    count = len(selected)
+    lengths = np.fromiter((data["length"] for _, data in selected), dtype=np.float64, count=count)
+    widths = np.fromiter((data["width"] for _, data in selected), dtype=np.float64, count=count)
+
+    negative = (lengths < 0) | (widths < 0)
+    if negative.any():
+        name = selected[int(negative.argmax())][0]
+        raise ValueError(f"Długość i szerokość obróbki '{name}' nie mogą być ujemne.")
+
+    if not count:
+        return 0.0
+    # cumsum dodaje w kolejności pętli, więc suma (i liczba arkuszy) jest identyczna
+    return float(np.cumsum(lengths * widths)[-1])
+
+
 def calculate_flashings_total(flashing_items, standard_sheet_width=1.25, standard_sheet_length=2.50):
     """
     Oblicza całkowitą powierzchnię blachy i liczbę arkuszy potrzebnych na obróbki.
@@ -14,19 +51,9 @@ def calculate_flashings_total(flashing_items, standard_sheet_width=1.25, standar
     Returns:
         dict: Słownik z całkowitą powierzchnią blachy i liczbą potrzebnych arkuszy.
     """
-    total_flashing_surface = 0.0
+    total_flashing_surface = _selected_surface(flashing_items)
     standard_sheet_area = standard_sheet_width * standard_sheet_length
 
-    for name, data in flashing_items.items():
-        if data["selected"]: 
-            length = data["length"]
-            width = data["width"]
-            
-            if length < 0 or width < 0:
-                raise ValueError(f"Długość i szerokość obróbki '{name}' nie mogą być ujemne.")
-
-            total_flashing_surface += length * width
-    
     num_sheets = math.ceil(total_flashing_surface / standard_sheet_area) if total_flashing_surface > 0 else 0
 
     return {
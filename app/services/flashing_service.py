@@ -3,19 +3,166 @@ Service for managing flashing profiles and calculations.
 Similar to GutterSystemManager pattern.
 """
 
-import json
+import atexit
 import os
+import threading
 import uuid
-from typing import List, Optional, Dict, Any
+import weakref
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Dict, Any, Tuple
 
 from app.models.flashing_models import FlashingProfile, FlashingMaterial
+from app.utils import jsonio
+from app.utils.lazy import loaded_attribute
+from app.utils.vectorize import np, NUMPY_AVAILABLE, VECTORIZE_MIN_ITEMS
+
+
+class SheetRequirements(NamedTuple):
+    """Unrounded material requirements for one flashing."""
+    profile_name: str
+    length_m: float
+    area_m2: float
+    weight_kg: float
+    price_per_meter: float
+    total_price: float
+
+
+# Managers with possibly unsaved changes, flushed at interpreter exit
+_live_managers: "weakref.WeakSet[FlashingManager]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all() -> None:
+    for manager in list(_live_managers):
+        manager.flush()
+
+
+def _same_lists(key: tuple, indexed: tuple) -> bool:
+    """Compare (list, length, ...) index keys: same list objects with the same lengths."""
+    return len(key) == len(indexed) and all(
+        a is b if isinstance(a, list) else a == b for a, b in zip(key, indexed))
+
+
+_DEFAULT_FLASHING_CONFIG = {
+    "predefined_profiles": [
+        {
+            "id": "okap-standard",
+            "name": "Obróbka okapowa standard",
+            "description": "Standardowa obróbka okapu 250mm",
+            "development_width": 250.0,
+            "material_type": "stal",
+            "price_per_meter": 35.0,
+            "unit_conversions": {
+                "m2_per_meter": 0.25,
+                "kg_per_meter": 1.2
+            },
+            "is_custom": False
+        },
+        {
+            "id": "kalenica",
+            "name": "Kalenica prosta",
+            "description": "Obróbka kalenicy standard 500mm",
+            "development_width": 500.0,
+            "material_type": "stal",
+            "price_per_meter": 45.0,
+            "unit_conversions": {
+                "m2_per_meter": 0.5,
+                "kg_per_meter": 2.4
+            },
+            "is_custom": False
+        },
+        {
+            "id": "naroznik",
+            "name": "Narożnik zewnętrzny",
+            "description": "Obróbka narożnika zewnętrznego",
+            "development_width": 400.0,
+            "material_type": "stal",
+            "price_per_meter": 42.0,
+            "unit_conversions": {
+                "m2_per_meter": 0.4,
+                "kg_per_meter": 1.9
+            },
+            "is_custom": False
+        },
+        {
+            "id": "parapety",
+            "name": "Parapet zewnętrzny",
+            "description": "Obróbka parapetów",
+            "development_width": 300.0,
+            "material_type": "stal",
+            "price_per_meter": 38.0,
+            "unit_conversions": {
+                "m2_per_meter": 0.3,
+                "kg_per_meter": 1.4
+            },
+            "is_custom": False
+        }
+    ],
+    "custom_profiles": [],
+    "materials": [
+        {
+            "id": "stal-polyester",
+            "name": "Blacha stalowa powlekana polyester",
+            "material_type": "stal",
+            "thickness_mm": 0.5,
+            "coating": "polyester",
+            "price_per_m2": 45.0,
+            "price_per_kg": 8.5,
+            "weight_per_m2": 4.8,
+            "color": "",
+            "supplier": ""
+        },
+        {
+            "id": "aluminium",
+            "name": "Blacha aluminiowa",
+            "material_type": "aluminium",
+            "thickness_mm": 0.7,
+            "coating": "anodowana",
+            "price_per_m2": 85.0,
+            "price_per_kg": 25.0,
+            "weight_per_m2": 1.9,
+            "color": "",
+            "supplier": ""
+        },
+        {
+            "id": "miedz",
+            "name": "Blacha miedziana naturalna",
+            "material_type": "miedź",
+            "thickness_mm": 0.6,
+            "coating": "naturalna",
+            "price_per_m2": 180.0,
+            "price_per_kg": 45.0,
+            "weight_per_m2": 5.4,
+            "color": "miedź",
+            "supplier": ""
+        }
+    ]
+}
+
+
+@lru_cache(maxsize=1)
+def _default_config_bytes() -> bytes:
+    """Serialized default configuration (built on first use, then reused)."""
+    return jsonio.dumps(_DEFAULT_FLASHING_CONFIG, indent=True)
 
 
 class FlashingManager:
     """
     Manages flashing profiles, materials, and calculations.
+    
+    The config file is read on first access to the profile or material lists.
+    Mutations are written to the config file shortly after the last change
+    (FLUSH_DELAY seconds), so a burst of edits costs a single write.
+    Call flush() to write pending changes immediately.
     """
     
+    # Seconds to wait for further changes before writing the config file
+    FLUSH_DELAY = 0.25
+    
+    predefined_profiles = loaded_attribute('predefined_profiles', "Predefined FlashingProfile list.")
+    custom_profiles = loaded_attribute('custom_profiles', "User-defined FlashingProfile list.")
+    materials = loaded_attribute('materials', "FlashingMaterial list.")
+    
     def __init__(self, config_path: str = "flashing_profiles.json"):
         """
         Initialize the flashing manager.
@@ -24,143 +171,67 @@ class FlashingManager:
             config_path: Path to the flashing profiles configuration file
         """
         self.config_path = config_path
-        self.predefined_profiles: List[FlashingProfile] = []
-        self.custom_profiles: List[FlashingProfile] = []
-        self.materials: List[FlashingMaterial] = []
-        self._load_config()
+        self._predefined_profiles: List[FlashingProfile] = []
+        self._custom_profiles: List[FlashingProfile] = []
+        self._materials: List[FlashingMaterial] = []
+        self._loaded = False
+        self._load_lock = threading.Lock()
+        self._dirty = False
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_lock = threading.Lock()
+        # Lookup indices, rebuilt lazily when the lists change
+        self._profile_index: Dict[str, FlashingProfile] = {}
+        self._profile_index_key: tuple = ()
+        self._material_index: Dict[str, FlashingMaterial] = {}
+        self._material_index_key: tuple = ()
+        _live_managers.add(self)
+    
+    def _ensure_loaded(self) -> None:
+        """Read the config file once, on first access to the data lists."""
+        with self._load_lock:
+            if not self._loaded:
+                self._load_config()
+                self._loaded = True
     
     def _load_config(self) -> None:
         """Load profiles and materials from configuration file."""
-        if not os.path.exists(self.config_path):
-            self._create_default_config()
-        
         try:
-            # Check if file is empty
-            if os.path.getsize(self.config_path) == 0:
+            try:
+                data = jsonio.load_file(self.config_path)
+            except FileNotFoundError:
                 self._create_default_config()
-            
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+                data = jsonio.load_file(self.config_path)
+            except ValueError:
+                # An empty file (e.g. just created by the caller) gets the defaults
+                if os.path.getsize(self.config_path) != 0:
+                    raise
+                self._create_default_config()
+                data = jsonio.load_file(self.config_path)
             
             # Load predefined profiles
             predefined = data.get('predefined_profiles', [])
-            self.predefined_profiles = [FlashingProfile.from_dict(p) for p in predefined]
+            self._predefined_profiles = [FlashingProfile.from_dict(p) for p in predefined]
             
             # Load custom profiles
             custom = data.get('custom_profiles', [])
-            self.custom_profiles = [FlashingProfile.from_dict(p) for p in custom]
+            self._custom_profiles = [FlashingProfile.from_dict(p) for p in custom]
             
             # Load materials
             materials = data.get('materials', [])
-            self.materials = [FlashingMaterial.from_dict(m) for m in materials]
+            self._materials = [FlashingMaterial.from_dict(m) for m in materials]
             
         except Exception as e:
             print(f"Error loading flashing config: {e}")
-            self.predefined_profiles = []
-            self.custom_profiles = []
-            self.materials = []
+            self._predefined_profiles = []
+            self._custom_profiles = []
+            self._materials = []
     
     def _create_default_config(self) -> None:
         """Create a default configuration file with common profiles."""
-        default_config = {
-            "predefined_profiles": [
-                {
-                    "id": "okap-standard",
-                    "name": "Obróbka okapowa standard",
-                    "description": "Standardowa obróbka okapu 250mm",
-                    "development_width": 250.0,
-                    "material_type": "stal",
-                    "price_per_meter": 35.0,
-                    "unit_conversions": {
-                        "m2_per_meter": 0.25,
-                        "kg_per_meter": 1.2
-                    },
-                    "is_custom": False
-                },
-                {
-                    "id": "kalenica",
-                    "name": "Kalenica prosta",
-                    "description": "Obróbka kalenicy standard 500mm",
-                    "development_width": 500.0,
-                    "material_type": "stal",
-                    "price_per_meter": 45.0,
-                    "unit_conversions": {
-                        "m2_per_meter": 0.5,
-                        "kg_per_meter": 2.4
-                    },
-                    "is_custom": False
-                },
-                {
-                    "id": "naroznik",
-                    "name": "Narożnik zewnętrzny",
-                    "description": "Obróbka narożnika zewnętrznego",
-                    "development_width": 400.0,
-                    "material_type": "stal",
-                    "price_per_meter": 42.0,
-                    "unit_conversions": {
-                        "m2_per_meter": 0.4,
-                        "kg_per_meter": 1.9
-                    },
-                    "is_custom": False
-                },
-                {
-                    "id": "parapety",
-                    "name": "Parapet zewnętrzny",
-                    "description": "Obróbka parapetów",
-                    "development_width": 300.0,
-                    "material_type": "stal",
-                    "price_per_meter": 38.0,
-                    "unit_conversions": {
-                        "m2_per_meter": 0.3,
-                        "kg_per_meter": 1.4
-                    },
-                    "is_custom": False
-                }
-            ],
-            "custom_profiles": [],
-            "materials": [
-                {
-                    "id": "stal-polyester",
-                    "name": "Blacha stalowa powlekana polyester",
-                    "material_type": "stal",
-                    "thickness_mm": 0.5,
-                    "coating": "polyester",
-                    "price_per_m2": 45.0,
-                    "price_per_kg": 8.5,
-                    "weight_per_m2": 4.8,
-                    "color": "",
-                    "supplier": ""
-                },
-                {
-                    "id": "aluminium",
-                    "name": "Blacha aluminiowa",
-                    "material_type": "aluminium",
-                    "thickness_mm": 0.7,
-                    "coating": "anodowana",
-                    "price_per_m2": 85.0,
-                    "price_per_kg": 25.0,
-                    "weight_per_m2": 1.9,
-                    "color": "",
-                    "supplier": ""
-                },
-                {
-                    "id": "miedz",
-                    "name": "Blacha miedziana naturalna",
-                    "material_type": "miedź",
-                    "thickness_mm": 0.6,
-                    "coating": "naturalna",
-                    "price_per_m2": 180.0,
-                    "price_per_kg": 45.0,
-                    "weight_per_m2": 5.4,
-                    "color": "miedź",
-                    "supplier": ""
-                }
-            ]
-        }
-        
         try:
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(default_config, f, indent=2, ensure_ascii=False)
+            payload = _default_config_bytes()
+            with open(self.config_path, 'wb') as f:
+                f.write(payload)
         except Exception as e:
             print(f"Error creating default flashing config: {e}")
     
@@ -173,21 +244,65 @@ class FlashingManager:
         }
         
         try:
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
+            jsonio.write_atomic(self.config_path, jsonio.dumps(config, indent=True))
         except Exception as e:
             print(f"Error saving flashing config: {e}")
     
-    def get_all_profiles(self) -> List[FlashingProfile]:
-        """Get all profiles (predefined + custom)."""
-        return self.predefined_profiles + self.custom_profiles
+    def _mark_dirty(self) -> None:
+        """Schedule a config write, coalescing changes made within FLUSH_DELAY."""
+        with self._flush_lock:
+            self._dirty = True
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.FLUSH_DELAY, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+    
+    def flush(self) -> None:
+        """Write pending changes to the config file now."""
+        with self._flush_lock:
+            timer, self._flush_timer = self._flush_timer, None
+            if timer is not None:
+                timer.cancel()
+            if not self._dirty:
+                return
+            self._dirty = False
+            self._save_config()
+    
+    def get_all_profiles(self) -> Tuple[FlashingProfile, ...]:
+        """Get all profiles (predefined + custom) as a read-only tuple."""
+        return tuple(self.predefined_profiles) + tuple(self.custom_profiles)
+    
+    def _profiles_by_id(self, rebuild: bool = False) -> Dict[str, FlashingProfile]:
+        """Return the id -> profile index (first profile wins on duplicate ids)."""
+        key = (self.predefined_profiles, len(self.predefined_profiles),
+               self.custom_profiles, len(self.custom_profiles))
+        if rebuild or not _same_lists(key, self._profile_index_key):
+            index: Dict[str, FlashingProfile] = {}
+            for profiles in (self.predefined_profiles, self.custom_profiles):
+                for profile in profiles:
+                    index.setdefault(profile.id, profile)
+            self._profile_index = index
+            self._profile_index_key = key
+        return self._profile_index
+    
+    def _materials_by_id(self, rebuild: bool = False) -> Dict[str, FlashingMaterial]:
+        """Return the id -> material index (first material wins on duplicate ids)."""
+        key = (self.materials, len(self.materials))
+        if rebuild or not _same_lists(key, self._material_index_key):
+            index: Dict[str, FlashingMaterial] = {}
+            for material in self.materials:
+                index.setdefault(material.id, material)
+            self._material_index = index
+            self._material_index_key = key
+        return self._material_index
     
     def get_profile_by_id(self, profile_id: str) -> Optional[FlashingProfile]:
         """Get a profile by ID."""
-        for profile in self.get_all_profiles():
-            if profile.id == profile_id:
-                return profile
-        return None
+        profile = self._profiles_by_id().get(profile_id)
+        if profile is None or profile.id != profile_id:
+            # Profiles may have been replaced or re-identified in place
+            profile = self._profiles_by_id(rebuild=True).get(profile_id)
+        return profile
     
     def add_custom_profile(self, name: str, description: str, development_width: float,
                           material_type: str, price_per_meter: float,
@@ -210,7 +325,7 @@ class FlashingManager:
         )
         
         self.custom_profiles.append(profile)
-        self._save_config()
+        self._mark_dirty()
         
         return profile
     
@@ -222,7 +337,7 @@ class FlashingManager:
                 for key, value in kwargs.items():
                     if hasattr(profile, key):
                         setattr(profile, key, value)
-                self._save_config()
+                self._mark_dirty()
                 return True
         return False
     
@@ -231,16 +346,17 @@ class FlashingManager:
         for i, profile in enumerate(self.custom_profiles):
             if profile.id == profile_id:
                 del self.custom_profiles[i]
-                self._save_config()
+                self._mark_dirty()
                 return True
         return False
     
     def get_material_by_id(self, material_id: str) -> Optional[FlashingMaterial]:
         """Get a material by ID."""
-        for material in self.materials:
-            if material.id == material_id:
-                return material
-        return None
+        material = self._materials_by_id().get(material_id)
+        if material is None or material.id != material_id:
+            # Materials may have been replaced or re-identified in place
+            material = self._materials_by_id(rebuild=True).get(material_id)
+        return material
     
     def add_material(self, name: str, material_type: str, thickness_mm: float,
                     coating: str, price_per_m2: float, **kwargs) -> FlashingMaterial:
@@ -256,7 +372,7 @@ class FlashingManager:
         )
         
         self.materials.append(material)
-        self._save_config()
+        self._mark_dirty()
         
         return material
     
@@ -271,19 +387,87 @@ class FlashingManager:
         Returns:
             Dictionary with calculations
         """
-        profile = self.get_profile_by_id(profile_id)
-        if not profile:
+        requirements = self.calculate_sheet_requirements_fast(profile_id, length_m)
+        if requirements is None:
             return {'error': 'Profile not found'}
         
-        area_m2 = profile.calculate_area(length_m)
-        weight_kg = profile.calculate_weight(length_m)
-        total_price = length_m * profile.price_per_meter
-        
         return {
-            'profile_name': profile.name,
+            'profile_name': requirements.profile_name,
             'length_m': length_m,
-            'area_m2': round(area_m2, 2),
-            'weight_kg': round(weight_kg, 2),
-            'price_per_meter': profile.price_per_meter,
-            'total_price': round(total_price, 2)
+            'area_m2': round(requirements.area_m2, 2),
+            'weight_kg': round(requirements.weight_kg, 2),
+            'price_per_meter': requirements.price_per_meter,
+            'total_price': round(requirements.total_price, 2)
         }
+    
+    def calculate_sheet_requirements_fast(self, profile_id: str,
+                                          length_m: float) -> Optional[SheetRequirements]:
+        """
+        Calculate material requirements for a flashing without rounding.
+        
+        For loops that only display or sum the results; round when presenting.
+        
+        Args:
+            profile_id: Profile ID
+            length_m: Required length in meters
+            
+        Returns:
+            SheetRequirements, or None if the profile is not found
+        """
+        profile = self.get_profile_by_id(profile_id)
+        if not profile:
+            return None
+        return SheetRequirements(profile.name, length_m,
+                                 profile.calculate_area(length_m),
+                                 profile.calculate_weight(length_m),
+                                 profile.price_per_meter,
+                                 length_m * profile.price_per_meter)
+    
+    def calculate_sheet_requirements_bulk(
+            self, requests: List[Tuple[str, float]]) -> List[Dict[str, Any]]:
+        """
+        Calculate material requirements for many flashings at once.
+        
+        Args:
+            requests: (profile_id, length_m) pairs
+            
+        Returns:
+            One result per request, as returned by calculate_sheet_requirements
+        """
+        if not NUMPY_AVAILABLE or len(requests) < VECTORIZE_MIN_ITEMS:
+            return [self.calculate_sheet_requirements(profile_id, length_m)
+                    for profile_id, length_m in requests]
+        
+        profiles = [self.get_profile_by_id(profile_id) for profile_id, _ in requests]
+        found = [(profile, length_m) for profile, (_, length_m) in zip(profiles, requests) if profile]
+        count = len(found)
+        
+        lengths = np.fromiter((length_m for _, length_m in found), dtype=np.float64, count=count)
+        m2_per_meter = np.fromiter(
+            (p.unit_conversions.get('m2_per_meter', p.development_width / 1000.0) for p, _ in found),
+            dtype=np.float64, count=count)
+        kg_per_meter = np.fromiter(
+            (p.unit_conversions.get('kg_per_meter', 0.0) for p, _ in found),
+            dtype=np.float64, count=count)
+        price_per_meter = np.fromiter(
+            (p.price_per_meter for p, _ in found), dtype=np.float64, count=count)
+        
+        computed = iter(zip(found,
+                            (lengths * m2_per_meter).tolist(),
+                            (lengths * kg_per_meter).tolist(),
+                            (lengths * price_per_meter).tolist()))
+        results = []
+        for profile in profiles:
+            if not profile:
+                results.append({'error': 'Profile not found'})
+                continue
+            (_, length_m), area_m2, weight_kg, total_price = next(computed)
+            results.append({
+                'profile_name': profile.name,
+                'length_m': length_m,
+                'area_m2': round(area_m2, 2),
+                'weight_kg': round(weight_kg, 2),
+                'price_per_meter': profile.price_per_meter,
+                'total_price': round(total_price, 2)
+            })
+        return results
@@ -7,6 +7,27 @@ Provides functions for calculating guttering system components and accessories.
 from typing import Dict, Optional
 import math
 
+from app.utils.jit import njit
+
+
+@njit
+def _guttering_core(total_gutter_length_m, roof_height_m, num_downpipes):
+    """
+    Numeryczny rdzeń obliczeń orynnowania (dane już zwalidowane).
+    
+    Returns:
+        (total_downpipe_length_m, num_gutter_hooks, num_gutter_connectors,
+         num_downpipe_clamps, num_downpipe_elbows)
+    """
+    total_downpipe_length_m = num_downpipes * roof_height_m
+
+    num_gutter_hooks = math.ceil(total_gutter_length_m / 0.5) if total_gutter_length_m > 0 else 0
+    num_gutter_connectors = max(0, math.ceil(total_gutter_length_m / 3.0) - 1)
+    num_downpipe_clamps = math.ceil(total_downpipe_length_m / 2.0) if total_downpipe_length_m > 0 else 0
+    num_downpipe_elbows = num_downpipes * 2
+    return (total_downpipe_length_m, num_gutter_hooks, num_gutter_connectors,
+            num_downpipe_clamps, num_downpipe_elbows)
+
 
 def calculate_guttering(okap_length_m: float, roof_height_m: float, 
                        num_downpipes: Optional[int] = None) -> Dict[str, float]:
@@ -44,13 +65,10 @@ def calculate_guttering(okap_length_m: float, roof_height_m: float,
     if actual_num_downpipes < 0:
         raise ValueError("Liczba rur spustowych nie może być ujemna.")
 
-    total_downpipe_length_m = actual_num_downpipes * roof_height_m
-
-    num_gutter_hooks = math.ceil(total_gutter_length_m / 0.5) if total_gutter_length_m > 0 else 0
-    num_gutter_connectors = max(0, math.ceil(total_gutter_length_m / 3.0) - 1)
+    (total_downpipe_length_m, num_gutter_hooks, num_gutter_connectors,
+     num_downpipe_clamps, num_downpipe_elbows) = _guttering_core(
+        total_gutter_length_m, roof_height_m, actual_num_downpipes)
     num_downpipe_outlets = actual_num_downpipes
-    num_downpipe_clamps = math.ceil(total_downpipe_length_m / 2.0) if total_downpipe_length_m > 0 else 0
-    num_downpipe_elbows = actual_num_downpipes * 2
     num_end_caps = 2 # Uproszczenie: minimum 2 zaślepki
 
     return {
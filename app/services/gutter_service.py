@@ -2,12 +2,14 @@
 Service for managing gutter systems, templates, and configurations.
 """
 
-import json
-import os
-from typing import List, Optional, Dict, Any
+import threading
+from functools import lru_cache
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 
 from app.models.gutter_models import GutterSystem, GutterTemplate, GutterAccessory
+from app.utils import jsonio
+from app.utils.lazy import loaded_attribute
 
 try:
     from gutter_calculations import calculate_guttering
@@ -33,8 +35,72 @@ except ImportError:
         }
 
 
+# Accessory name keyword -> calculate_guttering result key (first match wins)
+_KEYWORD_FIELDS = (
+    ('rynna', 'total_gutter_length_m'),
+    ('rura spustowa', 'total_downpipe_length_m'),
+    ('hak', 'num_gutter_hooks'),
+    ('łącznik', 'num_gutter_connectors'),
+    ('wylot', 'num_downpipe_outlets'),
+    ('obejma', 'num_downpipe_clamps'),
+    ('kolano', 'num_downpipe_elbows'),
+    ('zaślepka', 'num_end_caps'),
+    ('montaż', 'total_gutter_length_m'),
+)
+
+
+# Matching is by keyword priority, not by position in the name ("Hak do rynna"
+# maps to the gutter length), and each distinct name is scanned once thanks to
+# the cache, so a plain loop over the few keywords is enough here; a multi-pattern
+# automaton would have to collect every hit and re-rank them by priority anyway.
+@lru_cache(maxsize=1024)
+def _result_key_for_accessory(name: str) -> Optional[str]:
+    """Return the calculation result key an accessory name maps to, or None."""
+    name_lower = name.lower()
+    for keyword, result_key in _KEYWORD_FIELDS:
+        if keyword in name_lower:
+            return result_key
+    return None
+
+
+_DEFAULT_GUTTER_CONFIG = {
+    "predefined_systems": [
+        {
+            "name": "System PVC półokrągły 125mm",
+            "system_type": "pvc",
+            "description": "Podstawowy system PVC",
+            "accessories": [
+                {"name": "Rynna PVC 125mm", "unit": "mb", "price_unit_net": 25.0, "quantity": 0.0, "vat_rate": 8, "category": "material", "auto_calculate": True},
+                {"name": "Rura spustowa PVC 90mm", "unit": "mb", "price_unit_net": 28.0, "quantity": 0.0, "vat_rate": 8, "category": "material", "auto_calculate": True},
+                {"name": "Hak rynnowy PVC", "unit": "szt.", "price_unit_net": 8.0, "quantity": 0.0, "vat_rate": 8, "category": "material", "auto_calculate": True},
+                {"name": "Łącznik rynny PVC", "unit": "szt.", "price_unit_net": 12.0, "quantity": 0.0, "vat_rate": 8, "category": "material", "auto_calculate": True},
+                {"name": "Wylot do rury PVC", "unit": "szt.", "price_unit_net": 15.0, "quantity": 0.0, "vat_rate": 8, "category": "material", "auto_calculate": True},
+                {"name": "Obejma rurowa PVC", "unit": "szt.", "price_unit_net": 10.0, "quantity": 0.0, "vat_rate": 8, "category": "material", "auto_calculate": True},
+                {"name": "Kolano rury 67° PVC", "unit": "szt.", "price_unit_net": 18.0, "quantity": 0.0, "vat_rate": 8, "category": "material", "auto_calculate": True},
+                {"name": "Zaślepka rynny PVC", "unit": "szt.", "price_unit_net": 6.0, "quantity": 0.0, "vat_rate": 8, "category": "material", "auto_calculate": True},
+                {"name": "Montaż systemu rynnowego", "unit": "mb", "price_unit_net": 15.0, "quantity": 0.0, "vat_rate": 8, "category": "service", "auto_calculate": True}
+            ]
+        }
+    ],
+    "user_templates": []
+}
+
+
+@lru_cache(maxsize=1)
+def _default_config_bytes() -> bytes:
+    """Serialized default configuration (built on first use, then reused)."""
+    return jsonio.dumps(_DEFAULT_GUTTER_CONFIG, indent=True)
+
+
 class GutterSystemManager:
-    """Manages gutter systems, templates, and calculations."""
+    """
+    Manages gutter systems, templates, and calculations.
+    
+    The config file is read on first access to the system or template lists.
+    """
+    
+    predefined_systems = loaded_attribute('predefined_systems', "Predefined GutterSystem list.")
+    user_templates = loaded_attribute('user_templates', "User GutterTemplate list.")
     
     def __init__(self, config_path: str = "gutter_systems.json"):
         """
@@ -44,60 +110,50 @@ class GutterSystemManager:
             config_path: Path to the gutter systems configuration file
         """
         self.config_path = config_path
-        self.predefined_systems: List[GutterSystem] = []
-        self.user_templates: List[GutterTemplate] = []
-        self._load_systems()
+        self._predefined_systems: List[GutterSystem] = []
+        self._user_templates: List[GutterTemplate] = []
+        self._loaded = False
+        self._load_lock = threading.Lock()
+        # Name index over predefined_systems, rebuilt lazily when the list changes
+        self._system_index: Dict[str, GutterSystem] = {}
+        self._system_index_key: tuple = ()
+    
+    def _ensure_loaded(self) -> None:
+        """Read the config file once, on first access to the data lists."""
+        with self._load_lock:
+            if not self._loaded:
+                self._load_systems()
+                self._loaded = True
     
     def _load_systems(self) -> None:
         """Load predefined systems and user templates from configuration file."""
-        if not os.path.exists(self.config_path):
-            # Create default config if it doesn't exist
-            self._create_default_config()
-        
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            try:
+                data = jsonio.load_file(self.config_path)
+            except FileNotFoundError:
+                # Create default config if it doesn't exist
+                self._create_default_config()
+                data = jsonio.load_file(self.config_path)
             
             # Load predefined systems
             predefined = data.get('predefined_systems', [])
-            self.predefined_systems = [GutterSystem.from_dict(sys) for sys in predefined]
+            self._predefined_systems = [GutterSystem.from_dict(sys) for sys in predefined]
             
             # Load user templates
             user_temps = data.get('user_templates', [])
-            self.user_templates = [GutterTemplate.from_dict(temp) for temp in user_temps]
+            self._user_templates = [GutterTemplate.from_dict(temp) for temp in user_temps]
             
         except Exception as e:
             print(f"Error loading gutter systems: {e}")
-            self.predefined_systems = []
-            self.user_templates = []
+            self._predefined_systems = []
+            self._user_templates = []
     
     def _create_default_config(self) -> None:
         """Create a default configuration file with basic PVC system."""
-        default_config = {
-            "predefined_systems": [
-                {
-                    "name": "System PVC półokrągły 125mm",
-                    "system_type": "pvc",
-                    "description": "Podstawowy system PVC",
-                    "accessories": [
-                        {"name": "Rynna PVC 125mm", "unit": "mb", "price_unit_net": 25.0, "quantity": 0.0, "vat_rate": 8, "category": "material", "auto_calculate": True},
-                        {"name": "Rura spustowa PVC 90mm", "unit": "mb", "price_unit_net": 28.0, "quantity": 0.0, "vat_rate": 8, "category": "material", "auto_calculate": True},
-                        {"name": "Hak rynnowy PVC", "unit": "szt.", "price_unit_net": 8.0, "quantity": 0.0, "vat_rate": 8, "category": "material", "auto_calculate": True},
-                        {"name": "Łącznik rynny PVC", "unit": "szt.", "price_unit_net": 12.0, "quantity": 0.0, "vat_rate": 8, "category": "material", "auto_calculate": True},
-                        {"name": "Wylot do rury PVC", "unit": "szt.", "price_unit_net": 15.0, "quantity": 0.0, "vat_rate": 8, "category": "material", "auto_calculate": True},
-                        {"name": "Obejma rurowa PVC", "unit": "szt.", "price_unit_net": 10.0, "quantity": 0.0, "vat_rate": 8, "category": "material", "auto_calculate": True},
-                        {"name": "Kolano rury 67° PVC", "unit": "szt.", "price_unit_net": 18.0, "quantity": 0.0, "vat_rate": 8, "category": "material", "auto_calculate": True},
-                        {"name": "Zaślepka rynny PVC", "unit": "szt.", "price_unit_net": 6.0, "quantity": 0.0, "vat_rate": 8, "category": "material", "auto_calculate": True},
-                        {"name": "Montaż systemu rynnowego", "unit": "mb", "price_unit_net": 15.0, "quantity": 0.0, "vat_rate": 8, "category": "service", "auto_calculate": True}
-                    ]
-                }
-            ],
-            "user_templates": []
-        }
-        
         try:
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(default_config, f, indent=2, ensure_ascii=False)
+            payload = _default_config_bytes()
+            with open(self.config_path, 'wb') as f:
+                f.write(payload)
         except Exception as e:
             print(f"Error creating default config: {e}")
     
@@ -114,17 +170,16 @@ class GutterSystemManager:
                 'user_templates': [temp.to_dict() for temp in self.user_templates]
             }
             
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            jsonio.write_atomic(self.config_path, jsonio.dumps(data, indent=True))
             
             return True
         except Exception as e:
             print(f"Error saving gutter systems: {e}")
             return False
     
-    def get_all_systems(self) -> List[GutterSystem]:
-        """Get all predefined systems."""
-        return self.predefined_systems.copy()
+    def get_all_systems(self) -> Tuple[GutterSystem, ...]:
+        """Get all predefined systems as a read-only tuple."""
+        return tuple(self.predefined_systems)
     
     def get_system_by_name(self, name: str) -> Optional[GutterSystem]:
         """
@@ -136,15 +191,31 @@ class GutterSystemManager:
         Returns:
             GutterSystem if found, None otherwise
         """
-        for system in self.predefined_systems:
-            if system.name == name:
-                # Return a deep copy to avoid modifying the original
-                return GutterSystem.from_dict(system.to_dict())
-        return None
+        system = self._systems_by_name().get(name)
+        if system is None or system.name != name:
+            # Systems may have been replaced or renamed in place
+            system = self._systems_by_name(rebuild=True).get(name)
+        if system is None:
+            return None
+        # Return a copy to avoid modifying the original
+        return system.clone()
+    
+    def _systems_by_name(self, rebuild: bool = False) -> Dict[str, GutterSystem]:
+        """Return the name -> system index (first system wins on duplicate names)."""
+        systems = self.predefined_systems
+        indexed = self._system_index_key
+        if (rebuild or not indexed or indexed[0] is not systems
+                or indexed[1] != len(systems)):
+            index: Dict[str, GutterSystem] = {}
+            for system in systems:
+                index.setdefault(system.name, system)
+            self._system_index = index
+            self._system_index_key = (systems, len(systems))
+        return self._system_index
     
-    def get_all_templates(self) -> List[GutterTemplate]:
-        """Get all user templates."""
-        return self.user_templates.copy()
+    def get_all_templates(self) -> Tuple[GutterTemplate, ...]:
+        """Get all user templates as a read-only tuple."""
+        return tuple(self.user_templates)
     
     def save_user_template(self, template: GutterTemplate) -> bool:
         """
@@ -201,36 +272,19 @@ class GutterSystemManager:
         # Use existing calculation function
         calc_results = calculate_guttering(okap_length_m, roof_height_m, num_downpipes)
         
-        # Create a mapping of accessory types to calculated quantities
-        quantity_map = {
-            'rynna': calc_results['total_gutter_length_m'],
-            'rura spustowa': calc_results['total_downpipe_length_m'],
-            'hak': calc_results['num_gutter_hooks'],
-            'łącznik': calc_results['num_gutter_connectors'],
-            'wylot': calc_results['num_downpipe_outlets'],
-            'obejma': calc_results['num_downpipe_clamps'],
-            'kolano': calc_results['num_downpipe_elbows'],
-            'zaślepka': calc_results['num_end_caps'],
-            'montaż': calc_results['total_gutter_length_m']
-        }
-        
         # Update quantities for accessories that have auto_calculate=True
         for accessory in system.accessories:
             if accessory.auto_calculate:
-                name_lower = accessory.name.lower()
-                
-                # Match accessory name to quantity
-                for key, quantity in quantity_map.items():
-                    if key in name_lower:
-                        accessory.quantity = quantity
-                        break
+                result_key = _result_key_for_accessory(accessory.name)
+                if result_key is not None:
+                    accessory.quantity = calc_results[result_key]
         
         return system
     
-    def get_system_names(self) -> List[str]:
-        """Get list of all system names."""
-        return [sys.name for sys in self.predefined_systems]
+    def get_system_names(self) -> Tuple[str, ...]:
+        """Get all system names as a read-only tuple."""
+        return tuple(sys.name for sys in self.predefined_systems)
     
-    def get_template_names(self) -> List[str]:
-        """Get list of all user template names."""
-        return [temp.name for temp in self.user_templates]
+    def get_template_names(self) -> Tuple[str, ...]:
+        """Get all user template names as a read-only tuple."""
+        return tuple(temp.name for temp in self.user_templates)
@@ -3,11 +3,111 @@ Margin calculator service for cost estimate items.
 Calculates selling prices based on purchase prices and margin percentages.
 """
 
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from dataclasses import dataclass, field
 
+from app.utils.vectorize import np, NUMPY_AVAILABLE, VECTORIZE_MIN_ITEMS
 
-@dataclass
+
+# Prices on the 0.01 grid with margins on the 0.01% grid are priced in integer
+# grosze; the bounds keep products well inside int64 for the numpy path
+_GRID_EPS = 1e-6
+_MAX_CENTS = 1e12
+_MAX_MARGIN_BP = 1e6
+
+
+def _round_half_up(numerator: int, denominator: int) -> int:
+    """Integer division rounded half away from zero (denominator > 0)."""
+    q = (2 * abs(numerator) + denominator) // (2 * denominator)
+    return q if numerator >= 0 else -q
+
+
+def _to_grid(price: float, margin: float):
+    """
+    Return (cents, basis_points) when price and margin sit on the grosz / 0.01% grid.
+    
+    Returns:
+        Tuple of ints, or None when either value needs float arithmetic
+    """
+    scaled_price = price * 100
+    scaled_margin = margin * 100
+    if not (abs(scaled_price) < _MAX_CENTS and abs(scaled_margin) < _MAX_MARGIN_BP):
+        return None
+    cents = round(scaled_price)
+    bp = round(scaled_margin)
+    if (abs(scaled_price - cents) >= _GRID_EPS or abs(scaled_margin - bp) >= _GRID_EPS
+            or bp <= -10000):
+        return None
+    return cents, bp
+
+
+def _price_with_margin(purchase_price: float, margin: float) -> float:
+    """Selling price for a margin percentage, rounded to grosze."""
+    grid = _to_grid(purchase_price, margin)
+    if grid is None:
+        return round(purchase_price * (1 + margin / 100.0), 2)
+    cents, bp = grid
+    return _round_half_up(cents * (10000 + bp), 10000) / 100
+
+
+def _price_without_margin(selling_price: float, margin: float) -> float:
+    """Purchase price behind a selling price and margin percentage, rounded to grosze."""
+    grid = _to_grid(selling_price, margin)
+    if grid is None:
+        return round(selling_price / (1 + margin / 100.0), 2)
+    cents, bp = grid
+    return _round_half_up(cents * 10000, 10000 + bp) / 100
+
+
+def _round_prices(values) -> List[float]:
+    """
+    Round an array of prices to 2 decimals, matching Python's round(x, 2).
+    
+    np.round scales by 100 and rounds half to even, which can disagree with
+    round() only when the scaled value sits on (or next to) a .5 boundary;
+    those few elements are rounded with round() instead.
+    """
+    scaled = values * 100
+    result = (np.rint(scaled) / 100).tolist()
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for k in np.flatnonzero(near_tie).tolist():
+        result[k] = round(float(values[k]), 2)
+    return result
+
+
+def _prices_with_margins(prices, margins) -> List[float]:
+    """
+    Vectorized _price_with_margin over float64 arrays.
+    
+    On-grid elements use int64 grosze arithmetic, the rest go through _round_prices.
+    """
+    scaled_prices = prices * 100
+    scaled_margins = margins * 100
+    cents = np.rint(scaled_prices)
+    bp = np.rint(scaled_margins)
+    with np.errstate(invalid='ignore'):
+        on_grid = ((np.abs(scaled_prices) < _MAX_CENTS)
+                   & (np.abs(scaled_margins) < _MAX_MARGIN_BP)
+                   & (np.abs(scaled_prices - cents) < _GRID_EPS)
+                   & (np.abs(scaled_margins - bp) < _GRID_EPS)
+                   & (bp > -10000))
+    
+    result = [0.0] * len(prices)
+    grid_idx = np.flatnonzero(on_grid)
+    if len(grid_idx):
+        numerator = cents[grid_idx].astype(np.int64) * (10000 + bp[grid_idx].astype(np.int64))
+        q = (2 * np.abs(numerator) + 10000) // 20000
+        for k, value in zip(grid_idx.tolist(), (np.where(numerator >= 0, q, -q) / 100).tolist()):
+            result[k] = value
+    float_idx = np.flatnonzero(~on_grid)
+    if len(float_idx):
+        rounded = _round_prices(prices[float_idx] * (1 + margins[float_idx] / 100.0))
+        for k, value in zip(float_idx.tolist(), rounded):
+            result[k] = value
+    return result
+
+
+@dataclass(slots=True)
 class MarginSettings:
     """
     Settings for margin calculations.
@@ -44,7 +144,7 @@ class MarginSettings:
             margin = self.global_margin_percent
         
         # Calculate selling price
-        return round(purchase_price * (1 + margin / 100.0), 2)
+        return _price_with_margin(purchase_price, margin)
     
     def calculate_purchase_price(self, selling_price: float,
                                 group: Optional[str] = None,
@@ -71,7 +171,7 @@ class MarginSettings:
             margin = self.global_margin_percent
         
         # Calculate purchase price
-        return round(selling_price / (1 + margin / 100.0), 2)
+        return _price_without_margin(selling_price, margin)
     
     def get_margin_for_item(self, group: Optional[str] = None,
                            item_margin_override: Optional[float] = None) -> float:
@@ -155,19 +255,45 @@ class MarginCalculator:
         Returns:
             Updated list of items
         """
+        priced = [item for item in items if item.purchase_price is not None]
+        
+        # Resolve margins the way get_margin_for_item does, with the
+        # group lookup table built once per call
+        settings = self.settings
+        global_margin = settings.global_margin_percent
+        margin_by_group = {group: margin
+                           for group, margin in settings.group_margins.items() if group}
+        
+        margins = []
+        for item in priced:
+            override = getattr(item, 'margin_percent', None)
+            if override is not None:
+                margins.append(override)
+            else:
+                margins.append(margin_by_group.get(getattr(item, 'group', None), global_margin))
+        
+        if NUMPY_AVAILABLE and len(priced) >= VECTORIZE_MIN_ITEMS:
+            prices = np.fromiter((item.purchase_price for item in priced),
+                                 dtype=np.float64, count=len(priced))
+            selling = _prices_with_margins(prices, np.array(margins, dtype=np.float64))
+            for item, price in zip(priced, selling):
+                item.price_unit_net = price
+        else:
+            # Calculate selling price from purchase price
+            for item, margin in zip(priced, margins):
+                item.price_unit_net = _price_with_margin(item.purchase_price, margin)
+        # If purchase_price is None, price_unit_net is already the selling price
+        
+        # Recalculate totals; calculate_totals is resolved once per item type
+        totals_by_type = {}
         for item in items:
-            if item.purchase_price is not None:
-                # Calculate selling price from purchase price
-                item.price_unit_net = self.settings.calculate_selling_price(
-                    item.purchase_price,
-                    group=item.group if hasattr(item, 'group') else None,
-                    item_margin_override=item.margin_percent if hasattr(item, 'margin_percent') else None
-                )
-            # If purchase_price is None, price_unit_net is already the selling price
-            
-            # Recalculate totals
-            if hasattr(item, 'calculate_totals'):
-                item.calculate_totals()
+            cls = type(item)
+            try:
+                calculate_totals = totals_by_type[cls]
+            except KeyError:
+                calculate_totals = totals_by_type[cls] = getattr(cls, 'calculate_totals', None)
+            if calculate_totals is not None:
+                calculate_totals(item)
         
         return items
     
@@ -186,9 +312,10 @@ class MarginCalculator:
         items_with_margin = 0
         
         for item in items:
-            if hasattr(item, 'purchase_price') and item.purchase_price is not None:
+            purchase_price = getattr(item, 'purchase_price', None)
+            if purchase_price is not None:
                 items_with_margin += 1
-                total_purchase += item.purchase_price * item.quantity
+                total_purchase += purchase_price * item.quantity
                 total_selling += item.price_unit_net * item.quantity
         
         overall_margin_percent = 0.0
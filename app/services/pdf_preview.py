@@ -5,11 +5,54 @@ Provides functionality to preview generated PDFs in the default system applicati
 before saving them to a permanent location.
 """
 
+import atexit
 import tempfile
 import os
 import platform
+import shutil
 import subprocess
-from typing import Callable, Optional
+import threading
+from functools import lru_cache
+from typing import Callable, Optional, Set
+
+# Pliki podglądu, które nie zostały jeszcze usunięte (np. zablokowane przez
+# przeglądarkę PDF); usuwane przy zamknięciu aplikacji
+_outstanding_previews: Set[str] = set()
+_outstanding_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _viewer_executable(name: str) -> Optional[str]:
+    """Pełna ścieżka programu otwierającego pliki (szukana w PATH raz)."""
+    return shutil.which(name)
+
+
+def _spawn_viewer(name: str, path: str) -> None:
+    """
+    Uruchamia program otwierający plik, bez czekania na jego zakończenie.
+    
+    Przy pełnej ścieżce programu i close_fds=False CPython tworzy proces przez
+    posix_spawn zamiast fork+exec, więc duża pamięć aplikacji GUI nie spowalnia
+    startu. Deskryptory aplikacji i tak nie są dziedziczone (PEP 446).
+    """
+    env = os.environ.copy()
+    env["NO_AT_BRIDGE"] = "1"
+    subprocess.Popen(
+        [name, path],
+        executable=_viewer_executable(name),
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        close_fds=False
+    )
+
+
+@atexit.register
+def _remove_outstanding_previews() -> None:
+    with _outstanding_lock:
+        paths = list(_outstanding_previews)
+    for path in paths:
+        PDFPreview.cleanup_temp_file(path)
 
 
 class PDFPreview:
@@ -28,43 +71,31 @@ class PDFPreview:
         Returns:
             Optional[str]: Ścieżka do pliku tymczasowego lub None w przypadku błędu
         """
+        temp_path = None
         try:
-            # Tworzenie pliku tymczasowego z rozszerzeniem .pdf
-            # delete=False zapewnia, że plik nie zostanie usunięty automatycznie
-            with tempfile.NamedTemporaryFile(
-                mode='wb',
-                suffix='.pdf',
-                prefix='ofertownik_preview_',
-                delete=False
-            ) as temp_file:
-                temp_path = temp_file.name
+            # Tworzenie pliku tymczasowego z rozszerzeniem .pdf (mkstemp tylko
+            # rezerwuje nazwę, bez obiektu pliku Pythona)
+            fd, temp_path = tempfile.mkstemp(suffix='.pdf', prefix='ofertownik_preview_')
+            os.close(fd)
+            with _outstanding_lock:
+                _outstanding_previews.add(temp_path)
             
             # Wywołanie generatora PDF z ścieżką do pliku tymczasowego
             generator_result = pdf_content_generator(temp_path, *args, **kwargs)
-            file_exists = os.path.exists(temp_path)
-            if generator_result is False or not file_exists:
-                if file_exists:
-                    try:
-                        os.unlink(temp_path)
-                    except OSError:
-                        # Ignore cleanup errors
-                        pass
+            if generator_result is False or not os.path.exists(temp_path):
+                PDFPreview.cleanup_temp_file(temp_path)
                 return None
             
             # Otworzenie pliku w domyślnej aplikacji
             if PDFPreview.open_file(temp_path):
                 return temp_path
-            else:
-                # Jeśli nie udało się otworzyć, usuń plik tymczasowy
-                try:
-                    os.unlink(temp_path)
-                except OSError:
-                    # Ignore cleanup errors
-                    pass
-                return None
+            # Jeśli nie udało się otworzyć, usuń plik tymczasowy
+            PDFPreview.cleanup_temp_file(temp_path)
+            return None
                 
         except Exception:
-            # W przypadku błędu zwróć None
+            # W przypadku błędu usuń plik tymczasowy i zwróć None
+            PDFPreview.cleanup_temp_file(temp_path)
             return None
     
     @staticmethod
@@ -91,26 +122,12 @@ class PDFPreview:
                 
             elif system == "Darwin":
                 # macOS: użyj 'open'
-                env = os.environ.copy()
-                env["NO_AT_BRIDGE"] = "1"
-                subprocess.Popen(
-                    ["open", path],
-                    env=env,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL
-                )
+                _spawn_viewer("open", path)
                 return True
                 
             else:
                 # Linux: użyj 'xdg-open'
-                env = os.environ.copy()
-                env["NO_AT_BRIDGE"] = "1"
-                subprocess.Popen(
-                    ["xdg-open", path],
-                    env=env,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL
-                )
+                _spawn_viewer("xdg-open", path)
                 return True
                 
         except Exception:
@@ -127,11 +144,18 @@ class PDFPreview:
         Returns:
             bool: True jeśli usunięcie się powiodło, False w przeciwnym razie
         """
-        if not path or not os.path.exists(path):
+        if not path:
             return False
         
         try:
             os.unlink(path)
-            return True
+        except FileNotFoundError:
+            removed = False
         except Exception:
+            # Np. plik nadal otwarty w przeglądarce (Windows); spróbujemy przy wyjściu
             return False
+        else:
+            removed = True
+        with _outstanding_lock:
+            _outstanding_previews.discard(path)
+        return removed
@@ -4,9 +4,15 @@ Roof geometry calculations module.
 Provides functions for calculating roof dimensions, areas, and material lengths.
 """
 
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Sequence
 import math
 
+from app.utils.jit import njit
+from app.utils.vectorize import np, NUMPY_AVAILABLE, VECTORIZE_MIN_ITEMS
+
+# sqrt((s/2)² + (s/2)²) = s·√½ (rzut poziomy naroża dachu kopertowego)
+_SQRT_HALF = math.sqrt(0.5)
+
 
 def degrees_to_radians(degrees: float) -> float:
     """
@@ -21,6 +27,90 @@ def degrees_to_radians(degrees: float) -> float:
     return math.radians(degrees)
 
 
+@njit
+def _cos_angle_core(angle_degrees):
+    """Cosinus kąta nachylenia; 0.0 dla połaci pionowej (90°)."""
+    if angle_degrees == 90:
+        return 0.0
+    return math.cos(math.radians(angle_degrees))
+
+
+@njit
+def _slant_from_cos(horizontal_length, cos_angle):
+    """Długość skośna dla policzonego wcześniej cosinusa kąta."""
+    if cos_angle == 0:
+        return math.inf
+    return horizontal_length / cos_angle
+
+
+@njit
+def _slant_length_core(horizontal_length, angle_degrees):
+    """Numeryczny rdzeń calculate_slant_length (kąt zawsze podany)."""
+    if angle_degrees == 0:
+        return horizontal_length
+    return _slant_from_cos(horizontal_length, _cos_angle_core(angle_degrees))
+
+
+@njit
+def _gable_roof_core(dl, szer, angle_degrees):
+    """
+    Numeryczny rdzeń dachu dwuspadowego dla wymiarów poziomych.
+    
+    Returns:
+        (dlugosc_okapu, dlugosc_gasiorow, dlugosc_wiatrownic, powierzchnia_dachu, slant_rafter_length)
+    """
+    slant_krokiew_len = _slant_length_core(szer / 2, angle_degrees)
+    return (2 * dl, dl, 4 * slant_krokiew_len, 2 * dl * slant_krokiew_len, slant_krokiew_len)
+
+
+@njit
+def _hip_roof_core(horizontal_dl, horizontal_szer, angle_degrees):
+    """
+    Numeryczny rdzeń dachu kopertowego (wymiary podstawy).
+    
+    Returns:
+        (dlugosc_okapu, dlugosc_gasiorow, powierzchnia_dachu, slant_rafter_length)
+    """
+    dlugosc_okapu = 2 * (horizontal_dl + horizontal_szer)
+    # Wszystkie długości skośne liczone są dla tego samego kąta
+    cos_angle = _cos_angle_core(angle_degrees)
+
+    # Długość rzutu poziomego grzbietu
+    if horizontal_dl >= horizontal_szer:
+        kalenica_pozioma_dl_horizontal = horizontal_dl - horizontal_szer
+    else:
+        # Przypadek, gdy szerokość jest większa niż długość
+        kalenica_pozioma_dl_horizontal = horizontal_szer - horizontal_dl
+        # Zamień dl i szer miejscami dla spójności obliczeń powierzchni
+        horizontal_dl, horizontal_szer = horizontal_szer, horizontal_dl
+
+    # Długość grzbietu (naroża) - rzut poziomy grzbietu jest po przekątnej kwadratu o boku 'grzbiet_horizontal_proj'
+    # UWAGA: To jest błąd w poprzedniej logice. Rzut poziomy grzbietu to przekątna.
+    # Uproszczenie: Długość rzutu poziomego grzbietu (naroża) jest taka sama jak rzut połaci trójkątnej (połowy szerokości)
+    # Rzut poziomy naroża (grzbietu)
+    hip_rafter_horizontal_proj = horizontal_szer * _SQRT_HALF
+    
+    # Długość skośna grzbietu (naroża)
+    # Kąt nachylenia połaci narożnej jest inny niż połaci głównej!
+    # Ale dla uproszczenia kalkulacji długości, możemy użyć kąta głównego
+    slant_grzbiet_len = _slant_from_cos(hip_rafter_horizontal_proj, cos_angle)
+    
+    # Długość skośna kalenicy poziomej (jest płaska, więc nie zależy od kąta)
+    dlugosc_gasiorow = (4 * slant_grzbiet_len) + kalenica_pozioma_dl_horizontal
+    
+    # Powierzchnia dachu kopertowego; krokiew połaci trapezowej i trójkątnej
+    # ma ten sam rzut (połowa szerokości), więc i tę samą długość
+    slant_krokiew_len = _slant_from_cos(horizontal_szer / 2, cos_angle)
+
+    # Powierzchnia dwóch trójkątów (na krótszych bokach)
+    area_side_triangles = 2 * (0.5 * horizontal_szer * slant_krokiew_len)
+    # Powierzchnia dwóch trapezów (na dłuższych bokach)
+    area_front_trapezoids = 2 * (0.5 * (kalenica_pozioma_dl_horizontal + horizontal_dl) * slant_krokiew_len)
+    
+    return (dlugosc_okapu, dlugosc_gasiorow, area_side_triangles + area_front_trapezoids,
+            slant_krokiew_len)
+
+
 def calculate_slant_length(horizontal_length: float, angle_degrees: float) -> float:
     """
     Oblicza długość skośną (np. krokwi) na podstawie długości poziomej
@@ -33,16 +123,9 @@ def calculate_slant_length(horizontal_length: float, angle_degrees: float) -> fl
     Returns:
         Długość skośna w metrach
     """
-    if angle_degrees == 90:
-        return float('inf') 
-    if angle_degrees == 0 or angle_degrees is None:
-        return horizontal_length 
-    
-    angle_radians = degrees_to_radians(angle_degrees)
-    if math.cos(angle_radians) == 0:
-        return float('inf') 
-        
-    return horizontal_length / math.cos(angle_radians)
+    if angle_degrees is None:
+        return horizontal_length
+    return _slant_length_core(horizontal_length, angle_degrees)
 
 
 def calculate_horizontal_length(slant_length: float, angle_degrees: float) -> float:
@@ -146,14 +229,11 @@ def calculate_gable_roof(dl: float, szer: float, angle_degrees: Optional[float]
         if angle_degrees is None:
             raise ValueError("Kąt nachylenia jest wymagany dla wymiarów poziomych.")
         
-        real_dl = dl
-        half_szer_horizontal = szer / 2
-        slant_krokiew_len = calculate_slant_length(half_szer_horizontal, angle_degrees)
-        
-        results["dlugosc_okapu"] = 2 * real_dl
-        results["dlugosc_gasiorow"] = real_dl
-        results["dlugosc_wiatrownic"] = 4 * slant_krokiew_len
-        results["powierzchnia_dachu"] = 2 * real_dl * slant_krokiew_len
+        okap, gasiory, wiatrownice, powierzchnia, slant_krokiew_len = _gable_roof_core(dl, szer, angle_degrees)
+        results["dlugosc_okapu"] = okap
+        results["dlugosc_gasiorow"] = gasiory
+        results["dlugosc_wiatrownic"] = wiatrownice
+        results["powierzchnia_dachu"] = powierzchnia
         results["slant_rafter_length"] = slant_krokiew_len
         results["roof_angle_deg"] = angle_degrees
 
@@ -203,47 +283,125 @@ def calculate_hip_roof(dl: float, szer: float, angle_degrees: Optional[float] =
         raise ValueError("Kąt nachylenia jest wymagany dla obliczeń dachu kopertowego.")
         
     results["roof_angle_deg"] = angle_degrees
-    results["dlugosc_okapu"] = 2 * (horizontal_dl + horizontal_szer)
     results["dlugosc_wiatrownic"] = 0.0 
 
-    # Długość rzutu poziomego grzbietu
-    if horizontal_dl >= horizontal_szer:
-        kalenica_pozioma_dl_horizontal = horizontal_dl - horizontal_szer
-        grzbiet_horizontal_proj = horizontal_szer / 2
-    else:
-        # Przypadek, gdy szerokość jest większa niż długość
-        kalenica_pozioma_dl_horizontal = horizontal_szer - horizontal_dl
-        grzbiet_horizontal_proj = horizontal_dl / 2
-        # Zamień dl i szer miejscami dla spójności obliczeń powierzchni
-        horizontal_dl, horizontal_szer = horizontal_szer, horizontal_dl
+    okap, gasiory, powierzchnia, slant_krokiew_len = _hip_roof_core(horizontal_dl, horizontal_szer, angle_degrees)
+    results["dlugosc_okapu"] = okap
+    results["dlugosc_gasiorow"] = gasiory
+    results["powierzchnia_dachu"] = powierzchnia
+    results["slant_rafter_length"] = slant_krokiew_len
 
-    # Długość grzbietu (naroża) - rzut poziomy grzbietu jest po przekątnej kwadratu o boku 'grzbiet_horizontal_proj'
-    # UWAGA: To jest błąd w poprzedniej logice. Rzut poziomy grzbietu to przekątna.
-    # Uproszczenie: Długość rzutu poziomego grzbietu (naroża) jest taka sama jak rzut połaci trójkątnej (połowy szerokości)
-    # Rzut poziomy naroża (grzbietu)
-    hip_rafter_horizontal_proj = math.sqrt((horizontal_szer/2)**2 + (horizontal_szer/2)**2)
+    return results
+
+
+def _batch_arrays(dl, szer, angle_degrees):
+    """Tablice wymiarów oraz cosinusów kątów (math.cos raz na każdy różny kąt)."""
+    dl_arr = np.asarray(dl, dtype=np.float64)
+    szer_arr = np.asarray(szer, dtype=np.float64)
+    angles = np.asarray(angle_degrees, dtype=np.float64)
+    # cos z biblioteki math, nie np.cos, żeby wyniki były identyczne z wersją skalarną
+    unique_angles, inverse = np.unique(angles, return_inverse=True)
+    cos_unique = np.array([_cos_angle_core(a) for a in unique_angles.tolist()], dtype=np.float64)
+    return dl_arr, szer_arr, cos_unique[inverse]
+
+
+def _slant_from_cos_array(horizontal, cos_angle):
+    """Wektorowa wersja _slant_from_cos (inf dla połaci pionowej)."""
+    return np.where(cos_angle == 0, np.inf, horizontal / cos_angle)
+
+
+def _batch_results(columns: Dict[str, "np.ndarray"], angles: List[float],
+                   count: int) -> List[Dict[str, float]]:
+    """Składa słowniki wyników (jak w wersjach skalarnych) z kolumn tablic."""
+    values = {key: column.tolist() for key, column in columns.items()}
+    return [
+        {
+            "dlugosc_okapu": values["dlugosc_okapu"][i],
+            "dlugosc_gasiorow": values["dlugosc_gasiorow"][i],
+            "dlugosc_wiatrownic": values["dlugosc_wiatrownic"][i],
+            "powierzchnia_dachu": values["powierzchnia_dachu"][i],
+            "dlugosc_koszy": 0.0,
+            "slant_rafter_length": values["slant_rafter_length"][i],
+            "roof_angle_deg": angles[i]
+        }
+        for i in range(count)
+    ]
+
+
+def calculate_gable_roof_batch(dl: Sequence[float], szer: Sequence[float],
+                               angle_degrees: Sequence[float]) -> List[Dict[str, float]]:
+    """
+    Oblicza wiele wariantów dachu dwuspadowego (wymiary poziome) naraz.
     
-    # Długość skośna grzbietu (naroża)
-    # Kąt nachylenia połaci narożnej jest inny niż połaci głównej!
-    # Ale dla uproszczenia kalkulacji długości, możemy użyć kąta głównego
-    # Lepsze uproszczenie: Długość skośna grzbietu (naroża)
-    slant_grzbiet_len = calculate_slant_length(hip_rafter_horizontal_proj, angle_degrees)
+    Args:
+        dl: Długości dachu w metrach
+        szer: Szerokości dachu w metrach
+        angle_degrees: Kąty nachylenia w stopniach
+        
+    Returns:
+        Lista słowników jak z calculate_gable_roof, po jednym na wariant
+    """
+    angles = list(angle_degrees)
+    if None in angles:
+        raise ValueError("Kąt nachylenia jest wymagany dla wymiarów poziomych.")
+    count = len(angles)
+    if not NUMPY_AVAILABLE or count < VECTORIZE_MIN_ITEMS:
+        return [calculate_gable_roof(d, s, a) for d, s, a in zip(dl, szer, angles)]
     
-    # Długość skośna kalenicy poziomej (jest płaska, więc nie zależy od kąta)
-    slant_kalenica_pozioma_len = kalenica_pozioma_dl_horizontal
+    dl_arr, szer_arr, cos_angle = _batch_arrays(dl, szer, angles)
+    # inf i nan (0 × inf) jak w wersji skalarnej, bez ostrzeżeń numpy
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slant = _slant_from_cos_array(szer_arr / 2, cos_angle)
+        columns = {
+            "dlugosc_okapu": 2 * dl_arr,
+            "dlugosc_gasiorow": dl_arr,
+            "dlugosc_wiatrownic": 4 * slant,
+            "powierzchnia_dachu": 2 * dl_arr * slant,
+            "slant_rafter_length": slant,
+        }
+    return _batch_results(columns, angles, count)
 
-    results["dlugosc_gasiorow"] = (4 * slant_grzbiet_len) + slant_kalenica_pozioma_len
-    
-    # Powierzchnia dachu kopertowego
-    slant_krokiew_dluga_polac = calculate_slant_length(horizontal_szer / 2, angle_degrees) # Połać trapezowa
-    slant_krokiew_krotka_polac = calculate_slant_length(horizontal_szer / 2, angle_degrees) # Połać trójkątna
 
-    # Powierzchnia dwóch trójkątów (na krótszych bokach)
-    area_side_triangles = 2 * (0.5 * horizontal_szer * slant_krokiew_krotka_polac)
-    # Powierzchnia dwóch trapezów (na dłuższych bokach)
-    area_front_trapezoids = 2 * (0.5 * (kalenica_pozioma_dl_horizontal + horizontal_dl) * slant_krokiew_dluga_polac)
+def calculate_hip_roof_batch(dl: Sequence[float], szer: Sequence[float],
+                             angle_degrees: Sequence[float]) -> List[Dict[str, float]]:
+    """
+    Oblicza wiele wariantów dachu kopertowego (wymiary podstawy) naraz.
     
-    results["powierzchnia_dachu"] = area_side_triangles + area_front_trapezoids
-    results["slant_rafter_length"] = slant_krokiew_dluga_polac # Używamy dłuższej jako referencyjnej
-
-    return results
\ No newline at end of file
+    Args:
+        dl: Długości podstawy dachu w metrach
+        szer: Szerokości podstawy dachu w metrach
+        angle_degrees: Kąty nachylenia w stopniach
+        
+    Returns:
+        Lista słowników jak z calculate_hip_roof, po jednym na wariant
+    """
+    angles = list(angle_degrees)
+    if None in angles:
+        raise ValueError("Kąt nachylenia jest wymagany dla obliczeń dachu kopertowego.")
+    count = len(angles)
+    if not NUMPY_AVAILABLE or count < VECTORIZE_MIN_ITEMS:
+        return [calculate_hip_roof(d, s, a) for d, s, a in zip(dl, szer, angles)]
+    
+    dl_arr, szer_arr, cos_angle = _batch_arrays(dl, szer, angles)
+    # Tak jak w _hip_roof_core: dłuższy bok jako długość, krótszy jako szerokość
+    longer = np.maximum(dl_arr, szer_arr)
+    shorter = np.minimum(dl_arr, szer_arr)
+    kalenica = longer - shorter
+    
+    half = shorter / 2
+    hip_rafter_horizontal_proj = shorter * _SQRT_HALF
+    # inf i nan (0 × inf) jak w wersji skalarnej, bez ostrzeżeń numpy
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slant_grzbiet = _slant_from_cos_array(hip_rafter_horizontal_proj, cos_angle)
+        slant_krokiew = _slant_from_cos_array(half, cos_angle)
+        
+        area_side_triangles = 2 * (0.5 * shorter * slant_krokiew)
+        area_front_trapezoids = 2 * (0.5 * (kalenica + longer) * slant_krokiew)
+        columns = {
+            "dlugosc_okapu": 2 * (dl_arr + szer_arr),
+            "dlugosc_gasiorow": (4 * slant_grzbiet) + kalenica,
+            "dlugosc_wiatrownic": np.zeros(count),
+            "powierzchnia_dachu": area_side_triangles + area_front_trapezoids,
+            "slant_rafter_length": slant_krokiew,
+        }
+    return _batch_results(columns, angles, count)
@@ -2,13 +2,14 @@
 Service for managing cost estimate templates.
 """
 
-import json
 import os
 import uuid
-from typing import List, Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 
 from app.models.template_models import CostEstimateTemplate
+from app.utils import jsonio
 
 
 class TemplateManager:
@@ -16,6 +17,9 @@ class TemplateManager:
     Manages cost estimate templates - saving, loading, and organizing templates.
     """
     
+    # Threads used to read template files concurrently in list_templates
+    LOAD_WORKERS = 8
+    
     def __init__(self, templates_dir: str = "templates"):
         """
         Initialize the template manager.
@@ -24,12 +28,13 @@ class TemplateManager:
             templates_dir: Directory path for storing templates
         """
         self.templates_dir = templates_dir
+        # template_id -> ((mtime_ns, size), parsed template); callers get copies
+        self._cache: Dict[str, Tuple[Tuple[int, int], CostEstimateTemplate]] = {}
         self._ensure_templates_dir()
     
     def _ensure_templates_dir(self) -> None:
         """Create templates directory if it doesn't exist."""
-        if not os.path.exists(self.templates_dir):
-            os.makedirs(self.templates_dir)
+        os.makedirs(self.templates_dir, exist_ok=True)
     
     def _get_template_path(self, template_id: str) -> str:
         """Get file path for a template."""
@@ -77,8 +82,8 @@ class TemplateManager:
         
         # Save to file
         file_path = self._get_template_path(template_id)
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(template.to_dict(), f, indent=2, ensure_ascii=False)
+        self._cache.pop(template_id, None)
+        jsonio.write_atomic(file_path, jsonio.dumps(template.to_dict()))
         
         return template
     
@@ -86,6 +91,9 @@ class TemplateManager:
         """
         Load a template by ID.
         
+        Parsed templates are cached and reused while the file's modification
+        time and size are unchanged.
+        
         Args:
             template_id: Template ID
             
@@ -93,36 +101,72 @@ class TemplateManager:
             CostEstimateTemplate or None if not found
         """
         file_path = self._get_template_path(template_id)
-        
-        if not os.path.exists(file_path):
-            return None
-        
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            return CostEstimateTemplate.from_dict(data)
-        except Exception as e:
-            print(f"Error loading template {template_id}: {e}")
+            st = os.stat(file_path)
+        except OSError:
             return None
+        template = self._load_cached(template_id, file_path, (st.st_mtime_ns, st.st_size))
+        return template.clone() if template else None
+    
+    def _load_cached(self, template_id: str, file_path: str,
+                     stat_key: Tuple[int, int]) -> Optional[CostEstimateTemplate]:
+        """Return the cached template (shared, not to be modified), reading the file if it changed."""
+        cached = self._cache.get(template_id)
+        if cached is None or cached[0] != stat_key:
+            try:
+                data = jsonio.load_file(file_path)
+                template = CostEstimateTemplate.from_dict(data)
+            except Exception as e:
+                print(f"Error loading template {template_id}: {e}")
+                return None
+            cached = self._cache[template_id] = (stat_key, template)
+        return cached[1]
     
     def list_templates(self) -> List[CostEstimateTemplate]:
         """
         List all available templates.
         
+        Unchanged files (same mtime and size) come from the parse cache, so
+        a repeated listing costs one stat per file. Changed files are read on
+        a thread pool (file reads release the GIL), so loading N of them costs
+        roughly the slowest read rather than the sum on slow or network disks.
+        
         Returns:
             List of CostEstimateTemplate objects
         """
-        templates = []
+        return [template.clone() for template in self._scan_templates()]
+    
+    def _scan_templates(self) -> List[CostEstimateTemplate]:
+        """Refresh the cache from the directory; return cached templates, most recent first."""
+        try:
+            with os.scandir(self.templates_dir) as entries:
+                # is_file() uses the type readdir already returned; no extra stat
+                files = [entry for entry in entries
+                         if entry.name.endswith('.json') and entry.is_file()]
+        except FileNotFoundError:
+            return []
         
-        if not os.path.exists(self.templates_dir):
-            return templates
+        jobs = []
+        for entry in files:
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            # Remove .json extension
+            jobs.append((entry.name[:-5], entry.path, (st.st_mtime_ns, st.st_size)))
         
-        for filename in os.listdir(self.templates_dir):
-            if filename.endswith('.json'):
-                template_id = filename[:-5]  # Remove .json extension
-                template = self.load_template(template_id)
-                if template:
-                    templates.append(template)
+        # Forget templates whose files are gone
+        for template_id in self._cache.keys() - {job[0] for job in jobs}:
+            del self._cache[template_id]
+        
+        misses = sum(1 for template_id, _, stat_key in jobs
+                     if self._cache.get(template_id, (None,))[0] != stat_key)
+        if misses > 1:
+            with ThreadPoolExecutor(max_workers=min(self.LOAD_WORKERS, misses)) as pool:
+                loaded = list(pool.map(lambda job: self._load_cached(*job), jobs))
+        else:
+            loaded = [self._load_cached(*job) for job in jobs]
+        templates = [template for template in loaded if template]
         
         # Sort by updated date (most recent first)
         templates.sort(key=lambda t: t.updated_at, reverse=True)
@@ -141,12 +185,12 @@ class TemplateManager:
         """
         file_path = self._get_template_path(template_id)
         
-        if not os.path.exists(file_path):
-            return False
-        
+        self._cache.pop(template_id, None)
         try:
             os.remove(file_path)
             return True
+        except FileNotFoundError:
+            return False
         except Exception as e:
             print(f"Error deleting template {template_id}: {e}")
             return False
@@ -167,8 +211,7 @@ class TemplateManager:
             return False
         
         try:
-            with open(export_path, 'w', encoding='utf-8') as f:
-                json.dump(template.to_dict(), f, indent=2, ensure_ascii=False)
+            jsonio.write_atomic(export_path, jsonio.dumps(template.to_dict(), indent=True))
             return True
         except Exception as e:
             print(f"Error exporting template: {e}")
@@ -185,8 +228,7 @@ class TemplateManager:
             Imported CostEstimateTemplate or None if import failed
         """
         try:
-            with open(import_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = jsonio.load_file(import_path)
             
             # Generate new ID for imported template to avoid conflicts
             old_id = data.get('id', '')
@@ -202,8 +244,7 @@ class TemplateManager:
             
             # Save imported template
             file_path = self._get_template_path(template.id)
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(template.to_dict(), f, indent=2, ensure_ascii=False)
+            jsonio.write_atomic(file_path, jsonio.dumps(template.to_dict()))
             
             return template
             
@@ -221,11 +262,11 @@ class TemplateManager:
         Returns:
             List of matching CostEstimateTemplate objects
         """
-        all_templates = self.list_templates()
         query_lower = query.lower()
         
+        # Filter the cached templates and copy only the matches
         matching = [
-            t for t in all_templates
+            t.clone() for t in self._scan_templates()
             if query_lower in t.name.lower() or query_lower in t.description.lower()
         ]
         
@@ -1,5 +1,27 @@
 # timber_calculations.py
 import math
+from typing import List, Sequence
+
+from app.utils.jit import njit, NUMBA_AVAILABLE
+from app.utils.vectorize import np, NUMPY_AVAILABLE, VECTORIZE_MIN_ITEMS
+
+_NEGATIVE_VALUES_ERROR = "Wartości dla ilości, długości i wymiarów przekroju nie mogą być ujemne."
+
+
+@njit
+def _timber_volume_core(quantity, length_m, width_cm, height_cm):
+    """Numeryczny rdzeń obliczenia objętości (bez walidacji)."""
+    width_m = width_cm / 100.0
+    height_m = height_cm / 100.0
+    return quantity * length_m * width_m * height_m
+
+
+@njit
+def _timber_volumes_core(quantity, length_m, width_cm, height_cm, out):
+    """Rdzeń objętości dla tablic; z numba jedna skompilowana pętla."""
+    for i in range(out.shape[0]):
+        out[i] = _timber_volume_core(quantity[i], length_m[i], width_cm[i], height_cm[i])
+
 
 def calculate_timber_volume(quantity, length_m, width_cm, height_cm):
     """
@@ -15,9 +37,42 @@ def calculate_timber_volume(quantity, length_m, width_cm, height_cm):
         float: Objętość drewna w metrach sześciennych (m3).
     """
     if quantity < 0 or length_m < 0 or width_cm < 0 or height_cm < 0:
-        raise ValueError("Wartości dla ilości, długości i wymiarów przekroju nie mogą być ujemne.")
+        raise ValueError(_NEGATIVE_VALUES_ERROR)
     
-    width_m = width_cm / 100.0
-    height_m = height_cm / 100.0
+    return _timber_volume_core(quantity, length_m, width_cm, height_cm)
+
+
+def calculate_timber_volumes(quantities: Sequence[float], lengths_m: Sequence[float],
+                             widths_cm: Sequence[float], heights_cm: Sequence[float]) -> List[float]:
+    """
+    Oblicza objętości drewna dla wielu elementów naraz.
+
+    Wartości są sprawdzane raz dla całych tablic; z numba objętości liczy
+    skompilowana pętla, bez niej wyrażenie numpy o tej samej kolejności działań.
+
+    Args:
+        quantities: Liczby elementów.
+        lengths_m: Długości pojedynczych elementów w metrach.
+        widths_cm: Szerokości przekroju w centymetrach.
+        heights_cm: Wysokości przekroju w centymetrach.
+
+    Returns:
+        List[float]: Objętości w m3, tak jak z calculate_timber_volume dla każdego elementu.
+    """
+    count = len(quantities)
+    if not NUMPY_AVAILABLE or count < VECTORIZE_MIN_ITEMS:
+        return [calculate_timber_volume(q, l, w, h)
+                for q, l, w, h in zip(quantities, lengths_m, widths_cm, heights_cm)]
+    
+    columns = [np.asarray(values, dtype=np.float64)
+               for values in (quantities, lengths_m, widths_cm, heights_cm)]
+    if any((column < 0).any() for column in columns):
+        raise ValueError(_NEGATIVE_VALUES_ERROR)
     
-    return quantity * length_m * width_m * height_m
\ No newline at end of file
+    quantity, length_m, width_cm, height_cm = columns
+    if NUMBA_AVAILABLE:
+        out = np.empty(count, dtype=np.float64)
+        _timber_volumes_core(quantity, length_m, width_cm, height_cm, out)
+    else:
+        out = quantity * length_m * (width_cm / 100.0) * (height_cm / 100.0)
+    return out.tolist()
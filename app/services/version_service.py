@@ -250,9 +250,10 @@ class VersionManager:
         if len(history.versions) <= keep_count:
             return 0
         
-        # Sort by version number and keep the most recent
-        history.versions.sort(key=lambda v: v.version_number, reverse=True)
-        to_remove = history.versions[keep_count:]
-        history.versions = history.versions[:keep_count]
+        # Sort by version number and keep the most recent (history stays ascending)
+        ordered = sorted(history.versions, key=lambda v: v.version_number)
+        split = len(ordered) - keep_count
+        to_remove = ordered[:split]
+        history.versions = ordered[split:]
         
         return len(to_remove)
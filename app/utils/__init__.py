@@ -1,6 +1,13 @@
 """Utility functions and helpers"""
 
-from .formatting import fmt_money, fmt_money_plain, is_valid_float_text, safe_filename
+from .formatting import (
+    fmt_money,
+    fmt_money_plain,
+    is_valid_float_text,
+    safe_filename,
+    intern_label,
+    parse_iso_datetime
+)
 from .validation import (
     validate_cost_item,
     validate_client,
@@ -14,6 +21,8 @@ __all__ = [
     'fmt_money_plain',
     'is_valid_float_text',
     'safe_filename',
+    'intern_label',
+    'parse_iso_datetime',
     'validate_cost_item',
     'validate_client',
     'validate_nip',
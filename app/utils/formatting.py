@@ -3,8 +3,11 @@ Formatting utilities for the Ofertownik application.
 Provides functions for formatting monetary values and other display strings.
 """
 
-from typing import Union
+from typing import Any, Union
+from datetime import datetime
+from functools import lru_cache
 import re
+import sys
 
 
 def fmt_money_plain(value: float) -> str:
@@ -69,3 +72,40 @@ def safe_filename(s: str, maxlen: int = 140) -> str:
     s = s.replace(" ", "_")
     s = re.sub(r'[^\w\-\._]', '', s)
     return s[:maxlen]
+
+
+def intern_label(value: Any) -> Any:
+    """
+    Intern a short, frequently repeated label such as a unit or category.
+    
+    Items loaded from files share a handful of these values, so interning
+    stores each distinct label once and makes equality checks an identity
+    comparison.
+    
+    Args:
+        value: Label to intern
+        
+    Returns:
+        Interned string, or the value unchanged if it is not a str
+    """
+    return sys.intern(value) if type(value) is str else value
+
+
+@lru_cache(maxsize=4096)
+def parse_iso_datetime(value: str) -> datetime:
+    """
+    Parse an ISO 8601 timestamp, memoizing repeated strings.
+    
+    Histories and templates loaded from disk often repeat the same
+    timestamps; datetime objects are immutable, so sharing them is safe.
+    A trailing 'Z' is accepted as UTC.
+    
+    Args:
+        value: ISO formatted date/time string
+        
+    Returns:
+        Parsed datetime
+    """
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    return datetime.fromisoformat(value)
@@ -0,0 +1,37 @@
+"""
+Optional numba JIT support for numeric calculation cores.
+
+Calculation modules decorate their pure-float helpers with ``njit``. When
+numba is installed the helpers are compiled with ``numba.njit(cache=True)``
+(compiled code is cached on disk between runs); otherwise, or when the
+``OFERTOWNIK_NO_NUMBA=1`` environment variable is set, they stay plain
+Python functions with identical behaviour.
+"""
+
+import os
+
+NUMBA_DISABLED = os.environ.get('OFERTOWNIK_NO_NUMBA') == '1'
+
+# Optional numba for JIT compilation
+try:
+    if NUMBA_DISABLED:
+        raise ImportError("numba disabled by OFERTOWNIK_NO_NUMBA")
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def njit(func):
+    """
+    Compile a numeric function with numba when available.
+    
+    Args:
+        func: Function using only floats/ints and the math module
+        
+    Returns:
+        Compiled dispatcher, or the original function without numba
+    """
+    if NUMBA_AVAILABLE:
+        return numba.njit(cache=True)(func)
+    return func
@@ -0,0 +1,117 @@
+"""
+JSON encoding helpers with optional orjson acceleration.
+
+``dumps`` always returns UTF-8 bytes and ``loads`` accepts bytes or str, so
+callers can read and write files in binary mode regardless of which
+backend is used. Without orjson the stdlib ``json`` module is used with
+``ensure_ascii=False``, matching the rest of the application's JSON files.
+"""
+
+import json
+import mmap
+import os
+import threading
+from typing import Any, Union
+
+# Optional orjson for faster (de)serialization
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Files at least this large are parsed from a memory map (orjson only)
+MMAP_MIN_SIZE = 1 << 20
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize an object to UTF-8 encoded JSON.
+    
+    Args:
+        obj: JSON-compatible object (dict keys may also be ints)
+        indent: Pretty-print with a 2-space indent
+        
+    Returns:
+        Encoded JSON document
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Parse a JSON document.
+    
+    Args:
+        data: Encoded JSON (bytes) or text
+        
+    Returns:
+        Parsed object
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_file(path: Union[str, os.PathLike]) -> Any:
+    """
+    Parse a JSON file.
+    
+    With orjson, files of MMAP_MIN_SIZE bytes or more are parsed straight
+    from a read-only memory map, without first copying them into a bytes
+    object; smaller files (and the stdlib fallback) use a single read().
+    
+    Args:
+        path: Path to the JSON file
+        
+    Returns:
+        Parsed object
+        
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the content is not valid JSON
+    """
+    with open(path, 'rb') as f:
+        if ORJSON_AVAILABLE and os.fstat(f.fileno()).st_size >= MMAP_MIN_SIZE:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    return orjson.loads(view)
+        return loads(f.read())
+
+
+def write_atomic(path: Union[str, os.PathLike], payload: bytes) -> None:
+    """
+    Replace a file's contents atomically and durably.
+    
+    The payload is written to a sibling temp file, synced to disk and
+    renamed over the target, so a crash leaves either the old or the new
+    content, never a partial file. The temp name is unique per process and
+    thread, so concurrent writers of the same path never share it.
+    
+    Args:
+        path: Target file path
+        payload: Complete new file content
+        
+    Raises:
+        OSError: If writing or renaming fails (the temp file is removed)
+    """
+    tmp_path = f"{os.fspath(path)}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,37 @@
+"""
+Deferred loading of manager configuration.
+
+Managers backed by a config file expose their data lists through
+``loaded_attribute`` properties. The file is read by the owner's
+``_ensure_loaded()`` on first access instead of in ``__init__``, so
+creating a manager at startup costs no I/O.
+"""
+
+
+def loaded_attribute(name: str, doc: str = "") -> property:
+    """
+    Create a property that loads the owner's config before returning ``_<name>``.
+
+    Assigning the property also loads first, so an assignment made before any
+    read is not overwritten by the deferred load.
+
+    Args:
+        name: Public attribute name; the value lives in ``_<name>``
+        doc: Docstring for the property
+
+    Returns:
+        property object to assign in the class body
+    """
+    storage = '_' + name
+
+    def getter(self):
+        if not self._loaded:
+            self._ensure_loaded()
+        return getattr(self, storage)
+
+    def setter(self, value):
+        if not self._loaded:
+            self._ensure_loaded()
+        setattr(self, storage, value)
+
+    return property(getter, setter, doc=doc)
@@ -0,0 +1,18 @@
+"""
+Optional NumPy support for bulk calculations.
+
+Modules with a vectorized path for large lists import ``np`` and
+``NUMPY_AVAILABLE`` from here and fall back to a plain Python loop when
+NumPy is missing or the input is shorter than ``VECTORIZE_MIN_ITEMS``.
+"""
+
+# Optional numpy for array arithmetic
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Below this many items the per-item loop is faster than building arrays
+VECTORIZE_MIN_ITEMS = 32
@@ -8,7 +8,7 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from cost_calculations import compute_item, compute_totals
+from cost_calculations import compute_item, compute_totals, compute_totals_vectorized
 
 
 class TestCostCalculations:
@@ -196,6 +196,68 @@ class TestCostCalculations:
         assert len(str(result['vat_value']).split('.')[-1]) <= 2
         assert len(str(result['total_gross']).split('.')[-1]) <= 2
 
+    
+    def test_rounding_half_up_on_ties(self):
+        """Test that half-cent values round up despite float representation."""
+        assert compute_item({"quantity": 1, "price_unit_net": 2.675, "vat_rate": 0})['total_net'] == 2.68
+        assert compute_item({"quantity": 1, "price_unit_net": 1.005, "vat_rate": 0})['total_net'] == 1.01
+        assert compute_item({"quantity": -1, "price_unit_net": 2.675, "vat_rate": 0})['total_net'] == -2.68
+    
+    def test_gross_equals_net_plus_vat(self):
+        """Test that gross is always the sum of rounded net and VAT."""
+        item = {"quantity": 35.546, "price_unit_net": 1.115, "vat_rate": 5}
+        
+        result = compute_item(item)
+        
+        assert result['total_net'] == 39.63
+        assert result['vat_value'] == 1.98
+        assert result['total_gross'] == 41.61
+    
+    def test_transport_rounds_exact_half_cent_up(self):
+        """Test that transport percent is applied without float drift."""
+        items = [{"quantity": 1, "price_unit_net": 2776.60, "vat_rate": 0}]
+        
+        result = compute_totals(items, transport_percent=2.5, transport_vat=0)
+        
+        # 2776.60 * 2.5% = 69.415
+        assert result['transport']['net'] == 69.42
+        assert result['summary']['net'] == 2846.02
+    
+    def test_compute_totals_vectorized_matches_scalar(self):
+        """Test that the vectorized path returns exactly the scalar result."""
+        items = [
+            {
+                "name": f"Item {i}",
+                "quantity": [1, 2.5, 0.333, None][i % 4],
+                "price_unit_net": [2.675, 35.0, 1.005, 0.015][i % 4],
+                "vat_rate": [23, 8, 0, None][i % 4],
+                "category": ["material", "Service", None][i % 3]
+            }
+            for i in range(40)
+        ]
+        
+        expected = compute_totals(items, transport_percent=2.5, transport_vat=8)
+        result = compute_totals_vectorized(items, transport_percent=2.5, transport_vat=8)
+        
+        assert result == expected
+        assert list(result['by_vat']) == list(expected['by_vat'])
+        assert list(result['by_category']) == list(expected['by_category'])
+    
+    def test_compute_totals_without_items(self):
+        """Test that include_items=False skips the per-item copies only."""
+        items = [
+            {"name": "A", "quantity": 2.0, "price_unit_net": 10.0, "vat_rate": 23},
+            {"name": "B", "quantity": 1.0, "price_unit_net": 5.0, "vat_rate": 8, "category": "Service"}
+        ]
+        
+        full = compute_totals(items, transport_percent=3.0, transport_vat=23)
+        light = compute_totals(items, transport_percent=3.0, transport_vat=23, include_items=False)
+        
+        assert light['items'] == []
+        assert len(full['items']) == 2
+        for key in ('by_vat', 'by_category', 'transport', 'summary'):
+            assert light[key] == full[key]
+        assert "total_net" not in items[0]
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -0,0 +1,42 @@
+"""
+Tests for the CostItem model.
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.cost_item import CostItem, calculate_totals_bulk, VECTORIZE_MIN_ITEMS
+
+
+class TestCalculateTotalsBulk:
+    """Tests for bulk CostItem totals calculation."""
+    
+    def test_matches_per_item_calculation(self):
+        """Bulk totals should match CostItem.calculate_totals for every item."""
+        count = VECTORIZE_MIN_ITEMS * 2
+        bulk = [CostItem(name=f"Item {i}", quantity=1.5 + i, unit="m2",
+                         price_unit_net=12.34 + i, vat_rate=(8 if i % 2 else 23))
+                for i in range(count)]
+        expected = [CostItem(name=i.name, quantity=i.quantity, unit=i.unit,
+                             price_unit_net=i.price_unit_net, vat_rate=i.vat_rate)
+                    for i in bulk]
+        for item in expected:
+            item.calculate_totals()
+        
+        calculate_totals_bulk(bulk)
+        
+        for got, exp in zip(bulk, expected):
+            assert got.total_net == pytest.approx(exp.total_net)
+            assert got.vat_value == pytest.approx(exp.vat_value)
+            assert got.total_gross == pytest.approx(exp.total_gross)
+    
+    def test_empty_list(self):
+        """Empty input should be a no-op."""
+        calculate_totals_bulk([])
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
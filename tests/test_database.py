@@ -0,0 +1,214 @@
+"""
+Tests for the SQLite database service.
+"""
+
+import pytest
+import sys
+import os
+import tempfile
+import shutil
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.database import Database
+
+
+class TestDatabase:
+    """Tests for Database class."""
+    
+    @pytest.fixture
+    def db(self):
+        """Create a database in a temporary directory."""
+        temp_dir = tempfile.mkdtemp()
+        db = Database(os.path.join(temp_dir, "test.db"))
+        yield db
+        db.close()
+        shutil.rmtree(temp_dir)
+    
+    def test_client_crud(self, db):
+        """Test creating, updating and deleting a client."""
+        client_id = db.create_client("Jan Kowalski", address="Kraków", tax_id="1234567890")
+        
+        assert db.get_client(client_id)['name'] == "Jan Kowalski"
+        assert db.update_client(client_id, phone="555 123 456") is True
+        client = db.get_client(client_id)
+        assert client['phone'] == "555 123 456"
+        assert client['address'] == "Kraków"
+        
+        assert db.update_client(9999, name="Nobody") is False
+        assert db.delete_client(client_id) is True
+        assert db.get_client(client_id) is None
+    
+    def test_material_update_keeps_other_fields(self, db):
+        """Test that a partial material update leaves other columns intact."""
+        material_id = db.create_material("Papa", unit="m2", price_net=35.0, vat_rate=8)
+        
+        assert db.update_material(material_id, price_net=40.0) is True
+        material = db.get_material(material_id)
+        assert material['price_net'] == 40.0
+        assert material['unit'] == "m2"
+        assert material['vat_rate'] == 8
+        assert db.update_material(9999, price_net=1.0) is False
+    
+    def test_material_update_explicit_none_clears_field(self, db):
+        """Test that passing None explicitly clears a nullable material column."""
+        material_id = db.create_material("Papa", unit="m2", price_net=35.0, description="Wierzchniego krycia")
+        
+        assert db.update_material(material_id, description=None, unit=None) is True
+        material = db.get_material(material_id)
+        assert material['description'] is None
+        assert material['unit'] is None
+        assert material['name'] == "Papa"
+        assert db.update_material(material_id) is True
+    
+    def test_bulk_inserts(self, db):
+        """Test inserting clients and materials in bulk."""
+        materials = [(f"Blacha {i}", "m2", 40.0 + i, 23, "material", "") for i in range(50)]
+        clients = [("Firma A", "Kraków", "", "", ""), ("Firma B", "Tarnów", "", "", "")]
+        
+        assert db.create_materials_bulk(materials) == 50
+        assert db.create_clients_bulk(clients) == 2
+        assert db.create_materials_bulk([]) == 0
+        
+        listed = db.list_materials("material")
+        assert len(listed) == 50
+        assert listed[0]['name'] == "Blacha 0"
+        assert set(listed[0].keys()) == {'id', 'name', 'unit', 'price_net', 'vat_rate', 'category'}
+        assert [c['name'] for c in db.list_clients()] == ["Firma A", "Firma B"]
+    
+    def test_list_clients_search(self, db):
+        """Test that client search matches substrings and follows updates/deletes."""
+        first = db.create_client("Dachy Nowak", address="Kraków", tax_id="6771234567")
+        db.create_client("Blacharz Wiśniewski", address="Tarnów")
+        
+        assert [c['name'] for c in db.list_clients("owak")] == ["Dachy Nowak"]
+        assert [c['name'] for c in db.list_clients("677123")] == ["Dachy Nowak"]
+        assert [c['name'] for c in db.list_clients("rnó")] == ["Blacharz Wiśniewski"]
+        assert len(db.list_clients("a")) == 2
+        
+        db.update_client(first, address="Tarnów")
+        assert len(db.list_clients("Tarnów")) == 2
+        db.delete_client(first)
+        assert [c['name'] for c in db.list_clients("Tarnów")] == ["Blacharz Wiśniewski"]
+    
+    def test_estimate_item_count_column(self, db):
+        """Test the generated item_count column on cost estimates."""
+        with db._get_writer() as conn:
+            for number, items_json in (("K/1", '[{"name": "a"}, {"name": "b"}]'),
+                                       ("K/2", '{"items": [{"name": "a"}]}'),
+                                       ("K/3", 'not json')):
+                conn.execute("""
+                    INSERT INTO cost_estimates (estimate_number, date, items_json, created_at, updated_at)
+                    VALUES (?, '2024-01-01', ?, '', '')
+                """, (number, items_json))
+        
+        with db._get_reader() as conn:
+            rows = conn.execute(
+                "SELECT estimate_number, item_count FROM cost_estimates ORDER BY estimate_number"
+            ).fetchall()
+        assert [tuple(row) for row in rows] == [("K/1", 2), ("K/2", 1), ("K/3", None)]
+    
+    def test_transaction_groups_operations(self, db):
+        """Test that operations inside transaction() commit or roll back together."""
+        with db.transaction():
+            for i in range(10):
+                db.create_material(f"Gąsior {i}", unit="szt", price_net=12.0, vat_rate=23)
+        assert len(db.list_materials()) == 10
+        
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                db.create_material("Rynna", unit="mb", price_net=30.0, vat_rate=23)
+                db.create_client("Klient")
+                raise RuntimeError("import failed")
+        assert len(db.list_materials()) == 10
+        assert db.list_clients() == []
+    
+    def test_settings_round_trip(self, db):
+        """Test storing JSON and plain string settings."""
+        db.set_setting("margin", {"percent": 15})
+        db.set_setting("company", "Dachy Sp. z o.o.")
+        
+        assert db.get_setting("margin") == {"percent": 15}
+        assert db.get_setting("company") == "Dachy Sp. z o.o."
+        assert db.get_setting("missing", 42) == 42
+    
+    def test_failed_transaction_rolls_back(self, db):
+        """Test that an exception inside a transaction discards its writes."""
+        with pytest.raises(RuntimeError):
+            with db._get_writer() as conn:
+                conn.execute("INSERT INTO settings (key, value, updated_at) VALUES ('x', '1', 'now')")
+                raise RuntimeError("boom")
+        
+        assert db.get_setting("x") is None
+    
+    def test_concurrent_writes(self, db):
+        """Test that the shared connection can be used from several threads."""
+        def worker():
+            for i in range(25):
+                db.create_material(f"Material {i}")
+        
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert len(db.list_materials()) == 100
+    
+    def test_reads_inside_write_transaction_see_pending_changes(self, db):
+        """Test that reads on the writing thread use the write connection."""
+        with db._get_writer():
+            client_id = db.create_client("Pending")
+            assert db.get_client(client_id)['name'] == "Pending"
+    
+    def test_concurrent_readers(self, db):
+        """Test parallel reads through the read-only connection pool."""
+        db.create_client("Reader Client")
+        results = []
+        
+        def worker():
+            for _ in range(20):
+                results.append(len(db.list_clients()))
+        
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert results == [1] * 80
+        assert len(db._pool._all_readers) <= db._pool.max_readers
+    
+    def test_in_memory_database(self):
+        """Test that an in-memory database works without reader connections."""
+        db = Database(":memory:")
+        try:
+            client_id = db.create_client("Memory Client")
+            assert db.get_client(client_id)['name'] == "Memory Client"
+        finally:
+            db.close()
+    
+    def test_backup(self, db, tmp_path):
+        """Test creating a database backup."""
+        client_id = db.create_client("Backup Client")
+        
+        db.create_materials_bulk([(f"Materiał {i}", "szt", 1.0, 23, "material", "x" * 200)
+                                  for i in range(500)])
+        steps = []
+        
+        backup_path = db.create_backup(str(tmp_path / "backup.db"),
+                                       progress=lambda status, remaining, total: steps.append(remaining),
+                                       pages=4)
+        backup = Database(backup_path)
+        try:
+            assert backup.get_client(client_id)['name'] == "Backup Client"
+            assert len(backup.list_materials()) == 500
+        finally:
+            backup.close()
+        assert len(steps) > 1
+        assert steps[-1] == 0
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -90,6 +90,32 @@ class TestEmailService:
             "test@example.com"
         )
     
+    @patch('app.services.email_service.KEYRING_AVAILABLE', True)
+    @patch('app.services.email_service.keyring', create=True)
+    def test_get_password_is_cached(self, mock_keyring):
+        """Test that keyring is queried once until the cache expires or is cleared."""
+        mock_keyring.get_password.return_value = "test_password"
+        
+        service = EmailService()
+        service.sender_email = "test@example.com"
+        
+        assert service.get_password() == "test_password"
+        assert service.get_password() == "test_password"
+        assert mock_keyring.get_password.call_count == 1
+        
+        service.sender_email = "other@example.com"
+        service.get_password()
+        assert mock_keyring.get_password.call_count == 2
+        
+        service.delete_password()
+        service.get_password()
+        assert mock_keyring.get_password.call_count == 3
+        
+        with patch('app.services.email_service.time.monotonic',
+                   return_value=1e12):
+            service.get_password()
+        assert mock_keyring.get_password.call_count == 4
+    
     @patch('app.services.email_service.KEYRING_AVAILABLE', False)
     def test_save_password_without_keyring(self):
         """Test that save_password returns False when keyring is not available."""
@@ -167,7 +193,7 @@ class TestEmailService:
         assert 'wysłany' in result['message']
         mock_server.starttls.assert_called_once()
         mock_server.login.assert_called_once_with("test@example.com", "test_password")
-        mock_server.sendmail.assert_called_once()
+        mock_server.send_message.assert_called_once()
     
     @patch('app.services.email_service.smtplib.SMTP')
     @patch('app.services.email_service.ssl.create_default_context')
@@ -215,6 +241,58 @@ class TestEmailService:
         mock_server.starttls.assert_called_once()
         mock_server.login.assert_called_once_with("test@example.com", "test_password")
     
+    @patch('app.services.email_service.smtplib.SMTP')
+    @patch('app.services.email_service.ssl.create_default_context')
+    def test_send_emails_batch_uses_one_session(self, mock_ssl_context, mock_smtp):
+        """Test that a batch logs in once and reports a result per message."""
+        import smtplib
+        mock_server = MagicMock()
+        mock_server.send_message.side_effect = [None, smtplib.SMTPRecipientsRefused({}), None]
+        mock_smtp.return_value.__enter__.return_value = mock_server
+        
+        service = EmailService()
+        service.configure(
+            smtp_server="smtp.gmail.com",
+            smtp_port=587,
+            sender_email="test@example.com"
+        )
+        
+        items = [
+            {'to_email': "a@example.com", 'subject': "Oferta 1", 'body': "..."},
+            {'to_email': "bad@example.com", 'subject': "Oferta 2", 'body': "..."},
+            {'to_email': "c@example.com", 'subject': "Oferta 3", 'body': "...", 'cc': "d@example.com"},
+        ]
+        results = service.send_emails_batch(items, password="pw")
+        
+        assert [r['success'] for r in results] == [True, False, True]
+        mock_smtp.assert_called_once_with("smtp.gmail.com", 587)
+        mock_server.login.assert_called_once_with("test@example.com", "pw")
+        assert mock_server.send_message.call_count == 3
+        assert mock_server.send_message.call_args[0][2] == ["c@example.com", "d@example.com"]
+    
+    @patch('app.services.email_service.smtplib.SMTP')
+    @patch('app.services.email_service.ssl.create_default_context')
+    def test_send_emails_batch_login_failure(self, mock_ssl_context, mock_smtp):
+        """Test that a failed login fails every message in the batch."""
+        import smtplib
+        mock_server = MagicMock()
+        mock_server.login.side_effect = smtplib.SMTPAuthenticationError(535, b"bad")
+        mock_smtp.return_value.__enter__.return_value = mock_server
+        
+        service = EmailService()
+        service.configure(
+            smtp_server="smtp.gmail.com",
+            smtp_port=587,
+            sender_email="test@example.com"
+        )
+        
+        items = [{'to_email': f"{i}@example.com", 'subject': "x", 'body': "x"} for i in range(2)]
+        results = service.send_emails_batch(items, password="pw")
+        
+        assert len(results) == 2
+        assert all('autoryzacji' in r['message'] for r in results)
+        mock_server.send_message.assert_not_called()
+    
     def test_test_connection_without_password(self):
         """Test that test_connection fails when password is not available."""
         service = EmailService()
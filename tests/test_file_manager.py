@@ -0,0 +1,63 @@
+"""
+Tests for FileManager JSON persistence.
+"""
+
+import pytest
+import sys
+import os
+import shutil
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.file_manager import FileManager
+
+
+class TestFileManager:
+    """Tests for FileManager.save_json / load_json."""
+    
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory."""
+        path = tempfile.mkdtemp()
+        yield path
+        shutil.rmtree(path, ignore_errors=True)
+    
+    def test_save_and_load_roundtrip(self, temp_dir):
+        """Saved data loads back unchanged."""
+        path = os.path.join(temp_dir, "data", "settings.json")
+        data = {"nazwa": "Dach", "ilość": [1, 2.5]}
+        
+        assert FileManager.save_json(path, data) is True
+        assert FileManager.load_json(path) == data
+    
+    def test_save_recreates_removed_directory(self, temp_dir):
+        """A directory removed after an earlier save is created again."""
+        directory = os.path.join(temp_dir, "data")
+        path = os.path.join(directory, "settings.json")
+        assert FileManager.save_json(path, {"a": 1}) is True
+        
+        shutil.rmtree(directory)
+        
+        assert FileManager.save_json(path, {"a": 2}) is True
+        assert FileManager.load_json(path) == {"a": 2}
+    
+    def test_relative_paths_follow_working_directory(self, temp_dir, monkeypatch):
+        """The same relative path saved from two working directories creates both."""
+        first = os.path.join(temp_dir, "one")
+        second = os.path.join(temp_dir, "two")
+        os.makedirs(first)
+        os.makedirs(second)
+        relative = os.path.join("cache", "data.json")
+        
+        monkeypatch.chdir(first)
+        assert FileManager.save_json(relative, {"n": 1}) is True
+        monkeypatch.chdir(second)
+        assert FileManager.save_json(relative, {"n": 2}) is True
+        
+        assert FileManager.load_json(os.path.join(first, relative)) == {"n": 1}
+        assert FileManager.load_json(os.path.join(second, relative)) == {"n": 2}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,53 @@
+"""
+Tests for flashing calculation functions.
+"""
+
+import pytest
+import random
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import flashing_calculations
+from app.services.flashing_calculations import calculate_flashings_total, VECTORIZE_MIN_ITEMS
+
+
+class TestCalculateFlashingsTotal:
+    """Tests for calculate_flashings_total."""
+    
+    def test_small_and_large_inputs(self, monkeypatch):
+        """Test totals below and above the vectorization threshold."""
+        items = {"Pas nadrynnowy": {"selected": True, "length": 10.0, "width": 0.25},
+                 "Wiatrownica": {"selected": False, "length": 8.0, "width": 0.3}}
+        result = calculate_flashings_total(items)
+        assert result["total_surface_m2"] == 2.5
+        assert result["num_sheets"] == 1
+        
+        rng = random.Random(7)
+        inputs = [
+            {f"Obróbka {i}": {"selected": rng.random() < 0.8,
+                              "length": rng.randint(1, 600) / 100,
+                              "width": rng.randint(1, 80) / 100}
+             for i in range(VECTORIZE_MIN_ITEMS + rng.randint(0, 40))}
+            for _ in range(300)
+        ]
+        inputs.append({f"Obróbka {i}": {"selected": False, "length": 1.0, "width": 0.5}
+                       for i in range(VECTORIZE_MIN_ITEMS)})
+        results = [calculate_flashings_total(many) for many in inputs]
+        
+        # Bulk path must match the plain loop exactly, including the sheet count
+        monkeypatch.setattr(flashing_calculations, "NUMPY_AVAILABLE", False)
+        assert results == [calculate_flashings_total(many) for many in inputs]
+    
+    def test_negative_dimensions(self):
+        """Test that the first negative selected item is reported."""
+        many = {f"Obróbka {i}": {"selected": True, "length": 1.0, "width": 0.5}
+                for i in range(100)}
+        many["Obróbka 70"]["width"] = -0.5
+        with pytest.raises(ValueError, match="Obróbka 70"):
+            calculate_flashings_total(many)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
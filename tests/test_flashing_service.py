@@ -29,7 +29,9 @@ class TestFlashingService:
     @pytest.fixture
     def manager(self, temp_config):
         """Create a FlashingManager with temporary config."""
-        return FlashingManager(config_path=temp_config)
+        manager = FlashingManager(config_path=temp_config)
+        yield manager
+        manager.flush()
     
     def test_creates_default_config(self, manager):
         """Test that default config is created."""
@@ -37,6 +39,15 @@ class TestFlashingService:
         assert len(manager.predefined_profiles) > 0
         assert len(manager.materials) > 0
     
+    def test_config_read_on_first_access(self, temp_config):
+        """Constructing the manager does not touch the config file."""
+        os.remove(temp_config)
+        manager = FlashingManager(config_path=temp_config)
+        assert not os.path.exists(temp_config)
+        
+        assert manager.get_profile_by_id("okap-standard") is not None
+        assert os.path.exists(temp_config)
+    
     def test_get_all_profiles(self, manager):
         """Test getting all profiles."""
         profiles = manager.get_all_profiles()
@@ -118,6 +129,27 @@ class TestFlashingService:
         deleted = manager.get_profile_by_id(profile.id)
         assert deleted is None
     
+    def test_changes_are_written_in_one_batch(self, manager, monkeypatch):
+        """Test that a burst of changes is saved once and survives a reload."""
+        writes = []
+        save_config = manager._save_config
+        monkeypatch.setattr(manager, '_save_config', lambda: (writes.append(1), save_config()))
+        
+        for i in range(5):
+            manager.add_custom_profile(
+                name=f"Profil {i}",
+                description="",
+                development_width=250.0,
+                material_type="stal",
+                price_per_meter=30.0
+            )
+        manager.flush()
+        manager.flush()
+        
+        assert len(writes) == 1
+        reloaded = FlashingManager(config_path=manager.config_path)
+        assert len(reloaded.custom_profiles) == 5
+    
     def test_get_material_by_id(self, manager):
         """Test getting a material by ID."""
         material = manager.get_material_by_id("stal-polyester")
@@ -126,6 +158,56 @@ class TestFlashingService:
         assert material.name == "Blacha stalowa powlekana polyester"
         assert material.material_type == "stal"
     
+    def test_lookups_follow_direct_list_changes(self, manager):
+        """Test that ID lookups see profiles/materials changed outside the manager."""
+        assert manager.get_material_by_id("stal-polyester") is not None
+        
+        material = manager.materials[0]
+        manager.materials = [m for m in manager.materials if m is not material]
+        assert manager.get_material_by_id(material.id) is None
+        
+        profile = manager.get_profile_by_id("okap-standard")
+        profile.id = "okap-renamed"
+        assert manager.get_profile_by_id("okap-renamed") is profile
+        assert manager.get_profile_by_id("okap-standard") is None
+    
+    def test_sheet_requirements_fast_is_unrounded(self, manager):
+        """The tuple result keeps full precision; the dict result rounds it."""
+        fast = manager.calculate_sheet_requirements_fast("okap-standard", 3.333)
+        result = manager.calculate_sheet_requirements("okap-standard", 3.333)
+        
+        assert fast.profile_name == result['profile_name']
+        assert round(fast.area_m2, 2) == result['area_m2']
+        assert round(fast.total_price, 2) == result['total_price']
+        assert fast.total_price == 3.333 * fast.price_per_meter
+        assert manager.calculate_sheet_requirements_fast("missing", 1.0) is None
+    
+    def test_in_place_edit_of_predefined_profile_is_saved(self, manager):
+        """Changing a predefined profile in place must reach the file on the next save."""
+        manager.add_custom_profile("A", "", 100.0, "stal", 10.0)
+        manager.flush()
+        
+        manager.get_profile_by_id("kalenica").price_per_meter = 99.0
+        manager.add_custom_profile("B", "", 100.0, "stal", 10.0)
+        manager.flush()
+        
+        reloaded = FlashingManager(config_path=manager.config_path)
+        assert reloaded.get_profile_by_id("kalenica").price_per_meter == 99.0
+    
+    def test_lookups_follow_replaced_profiles(self, manager):
+        """Replacing a profile in place is visible to lookups and get_all_profiles."""
+        manager.get_all_profiles()
+        manager.get_profile_by_id("kalenica")
+        original = manager.predefined_profiles[0]
+        replacement = FlashingProfile(id="zzz", name="Nowa", description="",
+                                      development_width=100.0, material_type="stal",
+                                      price_per_meter=1.0, unit_conversions={})
+        manager.predefined_profiles[0] = replacement
+        
+        assert manager.get_profile_by_id("zzz") is replacement
+        assert manager.get_all_profiles()[0] is replacement
+        assert original not in manager.get_all_profiles()
+    
     def test_add_material(self, manager):
         """Test adding a new material."""
         material = manager.add_material(
@@ -144,6 +226,17 @@ class TestFlashingService:
         loaded = manager.get_material_by_id(material.id)
         assert loaded is not None
     
+    def test_calculate_sheet_requirements_bulk(self, manager):
+        """Test that bulk results match per-request calculations."""
+        ids = [p.id for p in manager.get_all_profiles()] + ["missing"]
+        requests = [(ids[i % len(ids)], 0.5 + i * 0.37) for i in range(100)]
+        
+        results = manager.calculate_sheet_requirements_bulk(requests)
+        
+        assert results == [manager.calculate_sheet_requirements(pid, length)
+                           for pid, length in requests]
+        assert {'error': 'Profile not found'} in results
+    
     def test_calculate_sheet_requirements(self, manager):
         """Test calculating sheet requirements."""
         result = manager.calculate_sheet_requirements("okap-standard", 10.0)
@@ -124,6 +124,38 @@ class TestGutterSystem:
         not_found = system.get_accessory("Nonexistent")
         assert not_found is None
     
+    def test_get_accessory_after_list_changes(self):
+        """Test lookup stays correct when accessories are added, renamed or replaced."""
+        acc1 = GutterAccessory(name="Rynna", unit="mb", price_unit_net=25.0)
+        system = GutterSystem(name="Test", system_type="pvc", accessories=[acc1])
+        assert system.get_accessory("Rynna") is acc1
+        
+        acc2 = GutterAccessory(name="Hak", unit="szt.", price_unit_net=8.0)
+        system.accessories.append(acc2)
+        assert system.get_accessory("Hak") is acc2
+        
+        acc1.name = "Rynna 125"
+        assert system.get_accessory("Rynna") is None
+        assert system.get_accessory("Rynna 125") is acc1
+        
+        acc3 = GutterAccessory(name="Hak", unit="szt.", price_unit_net=9.0)
+        system.accessories = [acc3]
+        assert system.get_accessory("Hak") is acc3
+    
+    def test_system_deepcopy_and_pickle(self):
+        """Test copies made via clone() and __getstate__/__setstate__ are independent and equal."""
+        import copy
+        import pickle
+        
+        acc = GutterAccessory(name="Rynna", unit="mb", price_unit_net=25.0, quantity=3.0)
+        system = GutterSystem(name="Test", system_type="pvc", description="d", accessories=[acc])
+        
+        for clone in (copy.deepcopy(system), pickle.loads(pickle.dumps(system)), system.clone()):
+            assert clone == system
+            assert clone.accessories[0] is not acc
+            clone.update_accessory_quantity("Rynna", 10.0)
+            assert acc.quantity == 3.0
+    
     def test_update_accessory_quantity(self):
         """Test updating accessory quantity."""
         acc = GutterAccessory(name="Rynna", unit="mb", price_unit_net=25.0, quantity=0.0)
@@ -242,6 +274,8 @@ class TestGutterSystemManager:
         system = manager.get_system_by_name("Test PVC System")
         assert system is not None
         assert system.name == "Test PVC System"
+        assert system is not manager.predefined_systems[0]
+        assert system.accessories[0] is not manager.predefined_systems[0].accessories[0]
         
         not_found = manager.get_system_by_name("Nonexistent")
         assert not_found is None
@@ -311,6 +345,35 @@ class TestGutterSystemManager:
         names = manager.get_template_names()
         assert len(names) == 1
         assert "Template1" in names
+    
+    def test_in_place_edit_of_predefined_system_is_saved(self, temp_config_file):
+        """Changing a predefined system in place must reach the file on the next save."""
+        manager = GutterSystemManager(temp_config_file)
+        assert manager.save_systems()
+        
+        manager.predefined_systems[0].description = "CHANGED"
+        assert manager.save_systems()
+        
+        reloaded = GutterSystemManager(temp_config_file)
+        assert reloaded.predefined_systems[0].description == "CHANGED"
+    
+    def test_getters_follow_element_replacement(self, temp_config_file):
+        """Getters reflect entries replaced in place and templates overwritten by name."""
+        manager = GutterSystemManager(temp_config_file)
+        manager.get_all_systems()
+        replacement = GutterSystem(name="Replaced", system_type="steel")
+        manager.predefined_systems[0] = replacement
+        assert manager.get_all_systems()[0] is replacement
+        assert manager.get_system_names() == ("Replaced",)
+        
+        system = GutterSystem(name="Custom", system_type="steel")
+        manager.save_user_template(GutterTemplate(name="T1", system=system))
+        template = GutterTemplate(name="T1", system=system.clone())
+        manager.save_user_template(template)
+        assert manager.get_all_templates()[0] is template
+        
+        manager.delete_user_template("T1")
+        assert manager.get_template_names() == ()
 
 
 if __name__ == '__main__':
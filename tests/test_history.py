@@ -122,6 +122,37 @@ class TestCostEstimateHistory:
         assert entry.metadata['client'] == 'Test'
         assert entry.metadata['details']['note'] == 'initial'
         
+    def test_snapshot_preserves_mixed_item_fields(self):
+        """Test snapshot keeps every key of items with different field sets."""
+        history = CostEstimateHistory()
+        items = [
+            {'name': 'Item 1', 'unit': 'm2', 'total_gross': 100.0},
+            {'name': 'Item 2', 'unit': 'szt', 'total_gross': 50.0, 'group': 'Dach'},
+        ]
+
+        entry = history.add_entry("Snapshot", items)
+
+        assert len(entry.items_snapshot) == 2
+        assert entry.items_snapshot == items
+        assert entry.items_snapshot[1]['group'] == 'Dach'
+
+        restored = entry.items_snapshot.copy()
+        restored[0]['name'] = 'Changed'
+        assert entry.items_snapshot[0]['name'] == 'Item 1'
+
+    def test_add_entry_copies_model_objects_in_metadata(self):
+        """Test non-JSON objects in metadata are copied, not shared."""
+        from app.models.gutter_models import GutterAccessory, GutterSystem
+
+        history = CostEstimateHistory()
+        system = GutterSystem(name="PVC", system_type="pvc",
+                              accessories=[GutterAccessory(name="Rynna", unit="mb", price_unit_net=25.0)])
+
+        entry = history.add_entry("Snapshot", [], {'gutter_system': system})
+        system.update_accessory_quantity("Rynna", 12.0)
+
+        assert entry.metadata['gutter_system'].get_accessory("Rynna").quantity == 0.0
+
     def test_get_entry(self):
         """Test getting specific entry by version."""
         history = CostEstimateHistory()
@@ -160,6 +191,15 @@ class TestCostEstimateHistory:
         latest = history.get_latest()
         assert latest.description == f"Version {max_entries + 9}"
         
+        # Versions keep increasing instead of being renumbered
+        assert latest.version == max_entries + 10
+        assert history.get_entry(1) is None
+        assert history.get_all_entries()[0].version == 11
+        
+        restored = CostEstimateHistory.from_dict(history.to_dict())
+        assert len(restored.get_all_entries()) == max_entries
+        assert restored.add_entry("Next", []).version == max_entries + 11
+        
     def test_calculate_checksum(self):
         """Test checksum calculation."""
         items1 = [{'name': 'Item 1', 'quantity': 10}]
@@ -176,6 +216,18 @@ class TestCostEstimateHistory:
         # Different items should have different checksum
         assert checksum1 != checksum3
         
+    def test_checksum_distinguishes_types_and_separators(self):
+        """Test that values differing only in type or embedded bytes hash differently."""
+        checksum = CostEstimateHistory.calculate_checksum
+        
+        assert checksum([{'q': 1}]) != checksum([{'q': '1'}])
+        assert checksum([{'q': 1}]) != checksum([{'q': 1.0}])
+        assert checksum([{'q': 1}]) != checksum([{'q': True}])
+        assert checksum([{'q': None}]) != checksum([{'q': 'None'}])
+        assert checksum([{'a': 'x\x01b\x00y'}]) != checksum([{'a': 'x', 'b': 'y'}])
+        assert checksum([{'a': 'x'}, {'b': 'y'}]) != checksum([{'a': 'x', 'b': 'y'}])
+        assert checksum([{'q': 1}]) == checksum([{'q': 1}])
+        
     def test_compare_versions(self):
         """Test comparing two versions."""
         history = CostEstimateHistory()
@@ -209,6 +261,27 @@ class TestCostEstimateHistory:
         assert comparison['changed'][0]['old']['name'] == 'Item A'
         assert comparison['changed'][0]['new']['quantity'] == 15
         
+    def test_compare_versions_with_missing_fields(self):
+        """Items lacking compared fields still diff like plain dicts."""
+        history = CostEstimateHistory()
+        history.add_entry("Version 1", [
+            {'name': 'Item A', 'quantity': 1},
+            {'name': 'Item B', 'unit': 'm', 'quantity': 2, 'category': 'x'},
+        ])
+        history.add_entry("Version 2", [
+            {'name': 'Item A', 'quantity': 1, 'category': None},
+            {'name': 'Item B', 'unit': 'm', 'quantity': 2},
+        ])
+        
+        comparison = history.compare_versions(1, 2)
+        
+        assert comparison['added'] == []
+        assert comparison['removed'] == []
+        assert len(comparison['changed']) == 1
+        assert comparison['changed'][0]['old'] == {
+            'name': 'Item B', 'unit': 'm', 'quantity': 2, 'category': 'x'
+        }
+        
     def test_to_dict_and_from_dict(self):
         """Test serialization and deserialization."""
         history = CostEstimateHistory()
@@ -273,6 +273,42 @@ class TestMarginCalculator:
         assert summary['items_with_margin'] == 0
         assert summary['total_items'] == 1
 
+    def test_apply_margin_bulk_matches_per_item(self):
+        """Bulk repricing must give exactly the per-item calculate_selling_price results."""
+        from app.services.margin_calculator import VECTORIZE_MIN_ITEMS
+        
+        settings = MarginSettings(global_margin_percent=23.0, group_margins={"Dach": 15.0})
+        calculator = MarginCalculator(settings)
+        count = VECTORIZE_MIN_ITEMS * 4
+        items = [CostItem(name=f"Item {i}", quantity=2.0, unit="szt",
+                          price_unit_net=0.0, vat_rate=23,
+                          group="Dach" if i % 3 == 0 else "",
+                          margin_percent=12.5 if i % 5 == 0 else None,
+                          purchase_price=(1.005 + i * 0.125) if i % 7 else None)
+                 for i in range(count)]
+        expected = [
+            settings.calculate_selling_price(i.purchase_price, i.group, i.margin_percent)
+            if i.purchase_price is not None else 0.0
+            for i in items
+        ]
+        
+        calculator.apply_margin_to_items(items)
+        
+        assert [i.price_unit_net for i in items] == expected
+        assert items[1].total_net == round(expected[1] * 2.0, 2)
+
+    def test_half_grosz_ties_round_up(self):
+        """Exact half-grosz results round half up regardless of float representation."""
+        settings = MarginSettings(global_margin_percent=10.0)
+        
+        # 1.375, 0.165 and 2.035 are not exact in binary floating point
+        assert settings.calculate_selling_price(1.25) == 1.38
+        assert settings.calculate_selling_price(0.15) == 0.17
+        assert settings.calculate_selling_price(1.85) == 2.04
+        assert settings.calculate_selling_price(-1.25) == -1.38
+        # Off-grid inputs keep plain round(x, 2)
+        assert settings.calculate_selling_price(1.2345) == round(1.2345 * 1.1, 2)
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -95,6 +95,33 @@ class TestPDFPreview:
             
             assert temp_path is None
 
+    def test_preview_pdf_removes_file_on_generator_error(self):
+        """A generator exception must not leave the temp file behind."""
+        created = []
+        
+        def failing_generator(path):
+            created.append(path)
+            raise Exception("Generator failed")
+        
+        assert PDFPreview.preview_pdf(failing_generator) is None
+        assert created and not os.path.exists(created[0])
+    
+    def test_unremoved_previews_are_removed_at_exit(self):
+        """Previews that were never cleaned up are removed by the atexit hook."""
+        from app.services import pdf_preview
+        
+        def mock_generator(path):
+            with open(path, 'wb') as f:
+                f.write(b'%PDF-1.4')
+        
+        with patch.object(PDFPreview, 'open_file', return_value=True):
+            temp_path = PDFPreview.preview_pdf(mock_generator)
+        
+        assert temp_path in pdf_preview._outstanding_previews
+        pdf_preview._remove_outstanding_previews()
+        assert not os.path.exists(temp_path)
+        assert temp_path not in pdf_preview._outstanding_previews
+    
     def test_preview_pdf_returns_none_on_generator_false(self):
         """Test that preview_pdf returns None if generator signals failure."""
         def failing_generator(path):
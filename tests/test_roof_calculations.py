@@ -14,7 +14,10 @@ from roof_calculations import (
     calculate_gable_roof,
     calculate_hip_roof,
     calculate_slant_length,
-    degrees_to_radians
+    degrees_to_radians,
+    calculate_gable_roof_batch,
+    calculate_hip_roof_batch,
+    VECTORIZE_MIN_ITEMS
 )
 
 
@@ -110,6 +113,24 @@ class TestRoofCalculations:
         assert result['slant_rafter_length'] == 8.0  # No slope
         assert result['powierzchnia_dachu'] == 80.0
 
+    
+    def test_batch_matches_scalar(self):
+        """Wersje wsadowe dają dokładnie wyniki funkcji skalarnych."""
+        count = VECTORIZE_MIN_ITEMS * 3
+        dl = [4.0 + (i % 7) * 1.37 for i in range(count)]
+        szer = [3.0 + (i % 5) * 2.11 for i in range(count)]
+        angles = [(0.0, 22.5, 30.0, 37.0, 45.0, 90.0)[i % 6] for i in range(count)]
+        
+        for scalar, batch in ((calculate_gable_roof, calculate_gable_roof_batch),
+                              (calculate_hip_roof, calculate_hip_roof_batch)):
+            expected = [scalar(d, s, a) for d, s, a in zip(dl, szer, angles)]
+            assert batch(dl, szer, angles) == expected
+    
+    def test_batch_requires_angles(self):
+        """Brak kąta w wariancie wsadowym zgłasza ten sam błąd co wersja skalarna."""
+        with pytest.raises(ValueError):
+            calculate_gable_roof_batch([5.0], [4.0], [None])
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
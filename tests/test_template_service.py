@@ -91,6 +91,60 @@ class TestTemplateService:
         # Should be sorted by updated date (most recent first)
         assert templates[0].name == "Template 3"
     
+    def test_list_templates_skips_unreadable_files(self, manager):
+        """A corrupt template file does not stop the others from loading."""
+        for i in range(5):
+            manager.save_template(f"Template {i}", "", [])
+        with open(os.path.join(manager.templates_dir, "broken.json"), 'w') as f:
+            f.write("{not json")
+        
+        templates = manager.list_templates()
+        
+        assert sorted(t.name for t in templates) == [f"Template {i}" for i in range(5)]
+    
+    def test_list_templates_reuses_unchanged_files(self, manager, monkeypatch):
+        """Only templates whose files changed are parsed again."""
+        import app.services.template_service as template_service
+        
+        first = manager.save_template("First", "", [{"name": "a"}])
+        manager.save_template("Second", "", [])
+        manager.list_templates()
+        
+        parsed = []
+        real_load = template_service.jsonio.load_file
+        monkeypatch.setattr(template_service.jsonio, 'load_file',
+                            lambda path: parsed.append(path) or real_load(path))
+        
+        listed = manager.list_templates()
+        assert parsed == []
+        # Callers get copies, so editing one does not leak into the cache
+        next(t for t in listed if t.name == "First").items.append({"name": "b"})
+        assert manager.load_template(first.id).items == [{"name": "a"}]
+        
+        manager.save_template("First renamed", "", [], template_id=first.id)
+        names = sorted(t.name for t in manager.list_templates())
+        assert names == ["First renamed", "Second"]
+        assert len(parsed) == 1
+    
+    def test_concurrent_saves_leave_valid_file(self, manager):
+        """Parallel saves of one template never leave a torn or temp file behind."""
+        import threading
+        
+        template = manager.save_template("Shared", "", [])
+        items = [{"name": f"item {i}", "quantity": i} for i in range(200)]
+        threads = [threading.Thread(target=manager.save_template,
+                                    args=(f"Shared {n}", "", items),
+                                    kwargs={'template_id': template.id})
+                   for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        loaded = manager.load_template(template.id)
+        assert loaded is not None and loaded.items == items
+        assert os.listdir(manager.templates_dir) == [f"{template.id}.json"]
+    
     def test_update_template(self, manager):
         """Test updating an existing template."""
         # Create initial template
@@ -173,6 +227,18 @@ class TestTemplateService:
         # No matches
         results = manager.search_templates("nonexistent")
         assert len(results) == 0
+    
+    def test_search_results_are_independent_copies(self, manager):
+        """Editing a search result does not change later results."""
+        manager.save_template("Roof", "", [{"name": "Dachówka"}], groups=["Dach"])
+        
+        found = manager.search_templates("roof")[0]
+        found.items.clear()
+        found.groups.append("Inne")
+        
+        again = manager.search_templates("roof")[0]
+        assert again.items == [{"name": "Dachówka"}]
+        assert again.groups == ["Dach"]
 
 
 if __name__ == '__main__':
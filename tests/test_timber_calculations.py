@@ -0,0 +1,55 @@
+"""
+Unit tests for timber calculation functions.
+"""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timber_calculations import (
+    calculate_timber_volume,
+    calculate_timber_volumes,
+    VECTORIZE_MIN_ITEMS
+)
+
+
+class TestTimberCalculations:
+    """Test suite for timber volume calculations."""
+    
+    def test_single_volume(self):
+        """Test volume of a single timber position."""
+        # 10 szt. × 4 m × 0.16 m × 0.08 m
+        assert calculate_timber_volume(10, 4.0, 16, 8) == pytest.approx(0.512)
+    
+    def test_negative_values_rejected(self):
+        """Test that negative dimensions raise ValueError."""
+        with pytest.raises(ValueError):
+            calculate_timber_volume(1, -4.0, 16, 8)
+    
+    def test_bulk_matches_single(self):
+        """Bulk volumes must equal the per-item results exactly."""
+        count = VECTORIZE_MIN_ITEMS * 3
+        quantities = [1 + i % 12 for i in range(count)]
+        lengths = [2.5 + (i % 9) * 0.35 for i in range(count)]
+        widths = [(5, 8, 12, 14, 16, 20)[i % 6] for i in range(count)]
+        heights = [(2.5, 5, 8, 10, 12.5)[i % 5] for i in range(count)]
+        
+        expected = [calculate_timber_volume(q, l, w, h)
+                    for q, l, w, h in zip(quantities, lengths, widths, heights)]
+        
+        assert calculate_timber_volumes(quantities, lengths, widths, heights) == expected
+    
+    def test_bulk_negative_values_rejected(self):
+        """Test that a negative value anywhere in the batch raises ValueError."""
+        count = VECTORIZE_MIN_ITEMS * 2
+        widths = [16.0] * count
+        widths[-1] = -1.0
+        with pytest.raises(ValueError):
+            calculate_timber_volumes([1] * count, [4.0] * count, widths, [8.0] * count)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -5,6 +5,7 @@ Tests for version service.
 import pytest
 import sys
 import os
+from datetime import datetime, timezone
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -188,6 +189,80 @@ class TestVersionService:
         history = manager.get_history("estimate-1")
         assert len(history.versions) == 10
 
+    
+    def test_version_from_dict_parses_timestamps(self):
+        """Test that ISO timestamps (including a 'Z' suffix) are parsed."""
+        v1 = Version.from_dict({'id': 'a', 'created_at': '2024-05-01T10:00:00'})
+        v2 = Version.from_dict({'id': 'b', 'created_at': '2024-05-01T10:00:00'})
+        v3 = Version.from_dict({'id': 'c', 'created_at': '2024-05-01T10:00:00Z'})
+        
+        assert v1.created_at == datetime(2024, 5, 1, 10, 0, 0)
+        assert v1.created_at == v2.created_at
+        assert v3.created_at == datetime(2024, 5, 1, 10, 0, 0, tzinfo=timezone.utc)
+    
+    def test_history_lookups_after_unordered_load_and_delete(self, manager):
+        """Test version lookups stay correct across loads and list edits."""
+        history = VersionHistory.from_dict({
+            'estimate_id': 'estimate-1',
+            'versions': [
+                {'id': 'b', 'version_number': 3},
+                {'id': 'a', 'version_number': 1},
+                {'id': 'c', 'version_number': 2},
+            ]
+        })
+        
+        assert [v.version_number for v in history.versions] == [1, 2, 3]
+        assert history.get_version(2).id == 'c'
+        assert history.get_latest_version().id == 'b'
+        assert history.get_next_version_number() == 4
+        
+        manager.histories['estimate-1'] = history
+        assert manager.delete_version('estimate-1', 2) is True
+        assert history.get_version(2) is None
+        
+        manager.create_version('estimate-1', {'items': []})
+        assert history.get_latest_version().version_number == 4
+        
+        manager.prune_old_versions('estimate-1', keep_count=2)
+        assert [v.version_number for v in history.versions] == [3, 4]
+        assert history.get_version(1) is None
+        assert history.get_next_version_number() == 5
+    
+    def test_history_lookups_follow_replaced_versions(self, manager):
+        """Test that replacing or renumbering a version in place is visible to lookups."""
+        manager.create_version('estimate-1', {'items': []})
+        manager.create_version('estimate-1', {'items': []})
+        history = manager.get_history('estimate-1')
+        assert history.get_version(2) is history.versions[-1]
+        
+        original = history.versions[-1]
+        replacement = Version(id='r', version_number=5, created_at=datetime.now(),
+                              author='Test', description='', snapshot={})
+        history.versions[-1] = replacement
+        
+        assert history.get_version(5) is replacement
+        assert history.get_version(2) is None
+        assert history.get_latest_version() is replacement
+        assert history.get_next_version_number() == 6
+        
+        replacement.version_number = 7
+        assert history.get_version(7) is replacement
+        assert history.get_version(5) is None
+        assert history.get_next_version_number() == 8
+        
+        history.versions[-1] = original
+        assert history.get_version(2) is original
+        assert history.get_latest_version() is original
+    
+    def test_history_bytes_round_trip(self, manager):
+        """Test serializing a history to JSON bytes and back."""
+        manager.create_version("estimate-1", {'items': [{'name': 'Łata', 'quantity': 2.5}]})
+        manager.create_version("estimate-1", {'items': []})
+        history = manager.get_history("estimate-1")
+        
+        restored = VersionHistory.from_bytes(history.to_bytes())
+        
+        assert restored == history
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])